@@ -2,8 +2,10 @@
 @echo off
 echo Starting test run with Allure reporting...
 
-REM Run pytest with Allure results
-pytest tests -s -v --alluredir=allure-results
+REM Run pytest with Allure results; set IMPACT_BASE=<git ref> to run only the tests affected since that ref
+set IMPACT_ARGS=
+if defined IMPACT_BASE set IMPACT_ARGS=--impacted-since %IMPACT_BASE%
+pytest tests -s -v --alluredir=allure-results %IMPACT_ARGS%
 if %ERRORLEVEL% NEQ 0 (
     echo Pytest failed. Check the output above.
     pause
@@ -2,8 +2,8 @@
 
 echo "Starting test run with Allure reporting..."
 
-# Run pytest with Allure results
-pytest tests -s -v --alluredir=allure-results
+# Run pytest with Allure results; set IMPACT_BASE=<git ref> to run only the tests affected since that ref
+pytest tests -s -v --alluredir=allure-results ${IMPACT_BASE:+--impacted-since "$IMPACT_BASE"}
 if [ $? -ne 0 ]; then
     echo "Pytest failed. Check the output above."
     exit 1
@@ -0,0 +1,306 @@
+# AppiumFramework/benchmarks/bench_framework.py
+"""Framework overhead per action, measured against the in-process fake Appium server.
+
+Run from the repository root:
+    python -m benchmarks.bench_framework                  # compare against benchmarks/baseline.json
+    python -m benchmarks.bench_framework --save-baseline  # record a new baseline
+    python -m benchmarks.bench_framework --latency-ms 5   # add simulated device latency per command
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+
+from benchmarks.fake_appium import FakeAppiumServer
+from src.drivers.appium_server_pool import AppiumServerPool
+from src.drivers.async_driver import AsyncW3CClient
+from src.drivers.driver_class import Driver
+from src.pages.async_login_page import AsyncLoginPage
+from src.pages.base_page import BasePage
+from src.pages.contact_us_form_page import ContactForm
+from src.pages.login_page import LoginPage
+from src.utilities.custom_logger import CustomLogger
+from src.utilities.timing import percentile
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+MIN_P99_ITERATIONS = 100  # With fewer samples p99 is the slowest one or two calls, i.e. noise
+KEYCODE_BACK = 4
+
+
+@contextlib.contextmanager
+def quiet_logging():
+    """Send framework logs to a temporary directory and keep the console clean."""
+    with tempfile.TemporaryDirectory() as log_dir, open(Path(log_dir) / "console.log", "w") as console, \
+            contextlib.redirect_stderr(console):
+        original_dir, original_file = CustomLogger.LOG_DIR, CustomLogger.DEFAULT_LOG_FILE
+        CustomLogger.LOG_DIR = Path(log_dir)
+        CustomLogger.DEFAULT_LOG_FILE = CustomLogger.LOG_DIR / "bench.log"
+        # Loggers created at import time still hold the real stderr
+        console_handlers = [handler for logger in list(CustomLogger._managed_loggers)
+                            for handler in logger.handlers
+                            if type(handler) is logging.StreamHandler]
+        original_streams = [handler.setStream(console) for handler in console_handlers]
+        try:
+            yield
+        finally:
+            for handler, stream in zip(console_handlers, original_streams):
+                handler.setStream(stream)
+            CustomLogger.LOG_DIR, CustomLogger.DEFAULT_LOG_FILE = original_dir, original_file
+
+
+def new_session(server: FakeAppiumServer):
+    options = UiAutomator2Options()
+    options.load_capabilities({"platformName": "Android", "automationName": "UiAutomator2"})
+    return webdriver.Remote(server.url, options=options)
+
+
+def measure(operation: Callable[[], None], iterations: int, warmup: int = 5,
+            allocation_iterations: Optional[int] = None) -> Dict[str, float]:
+    """Time each call of operation; a second, shorter pass under tracemalloc measures allocations."""
+    for _ in range(warmup):
+        operation()
+    samples: List[float] = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    samples.sort()
+
+    allocation_iterations = allocation_iterations or max(1, iterations // 5)
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(allocation_iterations):
+            operation()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "iterations": iterations,
+        "ops_per_s": round(iterations / elapsed, 1),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "peak_kib": round((peak - before) / 1024, 1),
+        "retained_bytes_per_op": round((after - before) / allocation_iterations),
+    }
+
+
+def _scenarios(server: FakeAppiumServer, driver) -> Dict[str, Callable[[], None]]:
+    def back_to_main():
+        driver.press_keycode(KEYCODE_BACK)
+
+    def base_page_click():
+        BasePage(driver).click_element("Btn1", "accessibility_id")
+
+    def base_page_cached_text():
+        cached_page.get_element_text("com.code2lead.kwad:id/Tv1", "id")
+
+    def base_page_is_displayed():
+        BasePage(driver).is_displayed("com.code2lead.kwad:id/Tv1", "id")
+
+    def base_page_is_present():
+        snapshot_page.is_present("Btn6", "accessibility_id")
+
+    def login_flow():
+        page = LoginPage(driver)
+        page.click_login_button()
+        page.enter_email("admin@gmail.com")
+        page.enter_password("admin123")
+        page.click_login_submit()
+        page.verify_admin_screen_displayed()
+        back_to_main()
+
+    def contact_form_fill():
+        form = ContactForm(driver)
+        form.click_contact_from_button()
+        form.verify_contact_page()
+        form.enter_name("Code2Lead")
+        form.enter_email("user@example.com")
+        form.enter_address("1 Main Street")
+        form.enter_mobile_number("5551234567")
+        form.click_submit_button()
+        back_to_main()
+
+    def contact_form_fill_form():
+        form = ContactForm(driver)
+        form.click_contact_from_button()
+        form.verify_contact_page()
+        form.fill_contact_form("Code2Lead", "user@example.com", "1 Main Street", "5551234567")
+        form.click_submit_button()
+        back_to_main()
+
+    cached_page = BasePage(driver)
+    snapshot_page = BasePage(driver)
+    return {
+        "base_page.click": base_page_click,
+        "base_page.get_text_cached": base_page_cached_text,
+        "base_page.is_displayed": base_page_is_displayed,
+        "base_page.is_present_snapshot": base_page_is_present,
+        "login_page.flow": login_flow,
+        "contact_form.fill": contact_form_fill,
+        "contact_form.fill_form": contact_form_fill_form,
+    }
+
+
+def _driver_scenario(latency: float) -> Callable[[], None]:
+    """Driver.get_driver + stop on a pre-warmed pool of fake servers: session setup cost."""
+    pool = AppiumServerPool(size=1, base_port=4823,
+                            launcher=lambda host, port: FakeAppiumServer(host, port, latency=latency).start())
+
+    def driver_session():
+        driver = Driver(server_pool=pool)
+        driver.get_driver()
+        driver.stop()
+
+    driver_session.pool = pool
+    return driver_session
+
+
+def _async_sweep_scenario(server: FakeAppiumServer, devices: int = 10) -> Callable[[], None]:
+    """The login flow on `devices` sessions at once from one event loop (asyncio client, pooled connections)."""
+    loop = asyncio.new_event_loop()
+    client = loop.run_until_complete(AsyncW3CClient(pool_size=devices).open())
+    drivers = loop.run_until_complete(client.new_sessions(
+        [(server.url, {"platformName": "Android", "automationName": "UiAutomator2"})] * devices))
+
+    async def flow(page):
+        await page.login("admin@gmail.com", "admin123")
+        await page.keyCode(KEYCODE_BACK)
+
+    async def sweep():
+        await asyncio.gather(*(flow(AsyncLoginPage(driver)) for driver in drivers))
+
+    async def quit_all():
+        await asyncio.gather(*(driver.quit() for driver in drivers))
+        await client.close()
+
+    def async_login_sweep():
+        loop.run_until_complete(sweep())
+
+    def close():
+        loop.run_until_complete(quit_all())
+        loop.close()
+
+    async_login_sweep.close = close
+    return async_login_sweep
+
+
+def run(iterations: int = 200, latency: float = 0.0, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Return {scenario: stats} for every scenario (or the ones named in `only`)."""
+    results: Dict[str, Dict[str, float]] = {}
+    with quiet_logging(), FakeAppiumServer(latency=latency) as server:
+        driver = new_session(server)
+        try:
+            for name, operation in _scenarios(server, driver).items():
+                if not only or name in only:
+                    results[name] = measure(operation, iterations)
+        finally:
+            driver.quit()
+        if not only or "driver.session" in only:
+            operation = _driver_scenario(latency)
+            try:
+                results["driver.session"] = measure(operation, max(1, iterations // 4))
+            finally:
+                operation.pool.shutdown()
+        if not only or "async_login.10_devices" in only:
+            operation = _async_sweep_scenario(server)
+            try:
+                results["async_login.10_devices"] = measure(operation, max(1, iterations // 4))
+            finally:
+                operation.close()
+        if not only or "custom_logger.info" in only:
+            logger = CustomLogger.get_logger("bench.framework")
+            results["custom_logger.info"] = measure(
+                lambda: logger.info("Element found with %s: %s", "id", "com.code2lead.kwad:id/Et4"), iterations * 10)
+            for handler in logging.getLogger("bench.framework").handlers:
+                handler.close()
+    for stats in results.values():
+        stats["latency_ms"] = round(latency * 1000, 3)
+    return results
+
+
+def comparable(stats: Dict[str, float], reference: Optional[Dict[str, float]]) -> bool:
+    """Only runs at the same simulated latency can be compared; baselines without one were recorded at 0 ms."""
+    return bool(reference) and reference.get("latency_ms", 0.0) == stats.get("latency_ms", 0.0)
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float = 0.25) -> List[str]:
+    """Return one line per scenario whose p50 or p99 is more than `tolerance` slower than the baseline.
+
+    Scenarios recorded at another latency are skipped, and p99 is only
+    compared when both runs have at least MIN_P99_ITERATIONS samples.
+    """
+    regressions = []
+    for name, stats in results.items():
+        reference = baseline.get(name)
+        if not comparable(stats, reference):
+            continue
+        metrics = ["p50_ms"]
+        if min(stats["iterations"], reference["iterations"]) >= MIN_P99_ITERATIONS:
+            metrics.append("p99_ms")
+        for metric in metrics:
+            if reference[metric] and stats[metric] > reference[metric] * (1 + tolerance):
+                regressions.append(f"{name} {metric}: {stats[metric]} ms vs baseline {reference[metric]} ms")
+    return regressions
+
+
+def _format(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> str:
+    lines = [f"{'scenario':<30}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>10}{'B/op kept':>11}"
+             f"{'p50 vs base':>13}"]
+    for name, stats in results.items():
+        reference = baseline.get(name, {}).get("p50_ms") if comparable(stats, baseline.get(name)) else None
+        delta = f"{(stats['p50_ms'] / reference - 1) * 100:+.1f}%" if reference else "-"
+        lines.append(f"{name:<30}{stats['ops_per_s']:>10}{stats['p50_ms']:>10}{stats['p99_ms']:>10}"
+                     f"{stats['peak_kib']:>10}{stats['retained_bytes_per_op']:>11}{delta:>13}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated latency of every Appium command")
+    parser.add_argument("--only", nargs="*", help="Run only these scenarios")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE))
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a regression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run(args.iterations, args.latency_ms / 1000, args.only)
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    print(_format(results, baseline))
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump(results, baseline_file, indent=1, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    other_latency = [name for name, stats in results.items()
+                     if name in baseline and not comparable(stats, baseline[name])]
+    if other_latency:
+        print(f"Not compared, baseline recorded at another --latency-ms: {', '.join(other_latency)}")
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+# AppiumFramework/benchmarks/bench_logging.py
+"""Micro-benchmark: per-call cost of a BasePage-style log line, direct vs. async handlers.
+
+Run from the repository root:  python -m benchmarks.bench_logging
+"""
+import argparse
+import contextlib
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from src.utilities.custom_logger import CustomLogger
+
+
+def _measure(logger, iterations):
+    locator_type, locator_value = "id", "com.code2lead.kwad:id/Et4"
+    started = time.perf_counter()
+    for i in range(iterations):
+        logger.info("Sent text '%s' to element with %s: %s", i, locator_type, locator_value)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run(iterations=20000):
+    """Return {mode: microseconds per log call} for the direct and async pipelines."""
+    results = {}
+    with tempfile.TemporaryDirectory() as log_dir, open(Path(log_dir) / "console.log", "w") as console, \
+            contextlib.redirect_stderr(console):
+        original_dir, original_file = CustomLogger.LOG_DIR, CustomLogger.DEFAULT_LOG_FILE
+        CustomLogger.LOG_DIR = Path(log_dir)
+        CustomLogger.DEFAULT_LOG_FILE = CustomLogger.LOG_DIR / "bench.log"
+        try:
+            direct = CustomLogger.get_logger("bench.direct")
+            results["direct"] = _measure(direct, iterations)
+            CustomLogger.enable_async(max_queue_size=iterations * 2)
+            results["async"] = _measure(direct, iterations)
+            flush_started = time.perf_counter()
+            CustomLogger.flush()
+            results["async_flush_ms"] = (time.perf_counter() - flush_started) * 1e3
+        finally:
+            CustomLogger.disable_async()
+            for handler in logging.getLogger("bench.direct").handlers:
+                handler.close()
+            CustomLogger.LOG_DIR, CustomLogger.DEFAULT_LOG_FILE = original_dir, original_file
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    results = run(args.iterations)
+    print(f"direct handlers: {results['direct']:.2f} us/call")
+    print(f"async queue:     {results['async']:.2f} us/call (drain {results['async_flush_ms']:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
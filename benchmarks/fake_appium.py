@@ -0,0 +1,361 @@
+# AppiumFramework/benchmarks/fake_appium.py
+"""In-process fake of the Appium W3C HTTP API, backed by a scripted UI tree.
+
+Implements the commands the framework sends (session, find, click, clear,
+value, text, attribute, displayed, source, screenshot, keycodes, app
+management) with a configurable per-command latency, so pages and drivers can
+be exercised on a machine without Android.
+"""
+import base64
+import copy
+import json
+import re
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from src.pages.page_snapshot import PageSnapshot
+
+PACKAGE = "com.code2lead.kwad"
+
+# screen -> widgets as (class, text, content-desc, resource-id suffix, screen a click navigates to)
+SCREENS: Dict[str, List[Tuple[str, str, str, str, Optional[str]]]] = {
+    "main": [
+        ("android.widget.TextView", "KWAD", "", "Tv1", None),
+        ("android.widget.Button", "ENTER SOME VALUE", "Btn1", "EnterValue", None),
+        ("android.widget.Button", "CONTACT US FORM", "Btn2", "ContactUs", "contact"),
+        ("android.widget.Button", "SCROLLVIEW", "Btn3", "ScrollView", None),
+        ("android.widget.Button", "TAB ACTIVITY", "Btn4", "TabView", None),
+        ("android.widget.Button", "LOGIN", "Btn6", "Login", "login"),
+    ],
+    "contact": [
+        ("android.widget.TextView", "Contact Us form", "", "Tv_contact", None),
+        ("android.widget.EditText", "Enter Name", "", "Et2", None),
+        ("android.widget.EditText", "Enter Email", "", "Et3", None),
+        ("android.widget.EditText", "Enter Address", "", "Et6", None),
+        ("android.widget.EditText", "Enter Mobile No", "", "Et7", None),
+        ("android.widget.Button", "SUBMIT", "", "Btn_submit", None),
+    ],
+    "login": [
+        ("android.widget.EditText", "Enter Email", "", "Et4", None),
+        ("android.widget.EditText", "Enter Password", "", "Et5", None),
+        ("android.widget.Button", "LOGIN", "", "Btn3", "admin"),
+    ],
+    "admin": [
+        ("android.widget.TextView", "Enter Admin", "", "Tv_admin", None),
+        ("android.widget.EditText", "", "", "Edt_admin", None),
+        ("android.widget.Button", "SUBMIT", "", "Btn_admin_submit", None),
+    ],
+}
+
+# W3C locator strategy -> BasePage locator type understood by PageSnapshot
+STRATEGIES = {
+    "accessibility id": "accessibility_id",
+    "id": "id",
+    "xpath": "xpath",
+    "class name": "class_name",
+    "-android uiautomator": "android_uiautomator",
+}
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"  # W3C web element identifier
+
+# 1x1 transparent PNG returned by the screenshot endpoint
+PNG_1PX = base64.b64encode(bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082")).decode("ascii")
+
+
+def render_screen(name: str, widgets=None) -> ET.Element:
+    """Build an Appium-style hierarchy for one scripted screen; every node gets a stable eid."""
+    root = ET.Element("hierarchy", {"index": "0", "class": "hierarchy", "rotation": "0"})
+    frame = ET.SubElement(root, "android.widget.FrameLayout",
+                          {"index": "0", "package": PACKAGE, "class": "android.widget.FrameLayout", "text": "",
+                           "displayed": "true", "eid": f"{name}-frame"})
+    for index, (widget_class, text, desc, resource_id, goto) in enumerate(widgets or SCREENS[name]):
+        attributes = {"index": str(index), "package": PACKAGE, "class": widget_class, "text": text,
+                      "resource-id": f"{PACKAGE}:id/{resource_id}", "enabled": "true", "displayed": "true",
+                      "eid": f"{name}-{index}"}
+        if desc:
+            attributes["content-desc"] = desc
+        if goto:
+            attributes["goto"] = goto
+        ET.SubElement(frame, widget_class, attributes)
+    return root
+
+
+class FakeSession:
+    """UI state of one session: the current screen and the text typed into it."""
+
+    def __init__(self, screens: Dict[str, ET.Element], start: str = "main"):
+        self.templates = screens
+        self.screens = {name: copy.deepcopy(root) for name, root in screens.items()}
+        self.current = start
+        self._snapshot: Optional[PageSnapshot] = None
+        self._elements: Dict[str, ET.Element] = {}
+        self.index_screen()
+
+    def index_screen(self):
+        self._elements = {element.get("eid"): element for element in self.screens[self.current].iter()
+                          if element.get("eid")}
+        self._snapshot = None
+
+    def navigate(self, screen: str):
+        """Show a screen; like a freshly started activity it comes back without earlier input."""
+        self.screens[screen] = copy.deepcopy(self.templates[screen])
+        self.current = screen
+        self.index_screen()
+
+    def source(self) -> str:
+        return ET.tostring(self.screens[self.current], encoding="unicode")
+
+    def find(self, using: str, value: str) -> List[str]:
+        if using not in STRATEGIES:
+            raise KeyError(using)
+        if self._snapshot is None:
+            self._snapshot = PageSnapshot(self.source())
+        return [element.get("eid") for element in self._snapshot.find_all(value, STRATEGIES[using])]
+
+    def element(self, eid: str) -> Optional[ET.Element]:
+        return self._elements.get(eid)
+
+    def set_text(self, eid: str, text: str):
+        self._elements[eid].set("text", text)
+        self._snapshot = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body are separate writes; don't wait for delayed ACKs
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        status, value = self.server.fake.handle(method, self.path, body)
+        payload = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeAppiumServer"
+
+
+def _error(status: int, error: str, message: str):
+    return status, {"error": error, "message": message, "stacktrace": ""}
+
+
+class FakeAppiumServer:
+    """Fake Appium server on a local port.
+
+    `latency` is slept before every command; `command_latency` overrides it per
+    command name (e.g. {"find": 0.05}). `commands` counts handled commands.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 command_latency: Optional[Dict[str, float]] = None, screens: Optional[Dict[str, list]] = None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.command_latency = command_latency or {}
+        self.screens = {name: render_screen(name, widgets) for name, widgets in (screens or SCREENS).items()}
+        self.sessions: Dict[str, FakeSession] = {}
+        self.commands: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes = [
+            ("GET", r"/status", self._status),
+            ("POST", r"/session", self._new_session),
+            ("DELETE", r"/session/(?P<sid>[^/]+)", self._delete_session),
+            ("POST", r"/session/(?P<sid>[^/]+)/element", self._find_element),
+            ("POST", r"/session/(?P<sid>[^/]+)/elements", self._find_elements),
+            ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/click", self._click),
+            ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/clear", self._clear),
+            ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/value", self._value),
+            ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/text", self._text),
+            ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/attribute/(?P<name>[^/]+)", self._attribute),
+            ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/displayed", self._displayed),
+            ("GET", r"/session/(?P<sid>[^/]+)/source", self._source),
+            ("GET", r"/session/(?P<sid>[^/]+)/screenshot", self._screenshot),
+            ("POST", r"/session/(?P<sid>[^/]+)/appium/device/press_keycode", self._press_keycode),
+            ("GET", r"/session/(?P<sid>[^/]+)/appium/device/current_package", self._current_package),
+            ("POST", r"/session/(?P<sid>[^/]+)/appium/device/(?:terminate_app|activate_app)", self._restart_app),
+            ("POST", r"/session/(?P<sid>[^/]+)/execute/sync", self._execute),
+        ]
+        self._compiled = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in self._routes]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "FakeAppiumServer":
+        self._httpd = _Server((self.host, self.port), _Handler)
+        self._httpd.fake = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=f"fake-appium-{self.port}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._httpd is not None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def handle(self, method: str, path: str, body: dict):
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        for route_method, pattern, handler in self._compiled:
+            match = pattern.match(path)
+            if route_method == method and match:
+                name = handler.__name__.lstrip("_")
+                with self._lock:
+                    self.commands[name] = self.commands.get(name, 0) + 1
+                delay = self.command_latency.get(name, self.latency)
+                if delay:
+                    time.sleep(delay)
+                params = match.groupdict()
+                session = None
+                if "sid" in params:
+                    session = self.sessions.get(params.pop("sid"))
+                    if session is None:
+                        return _error(404, "invalid session id", "No such session")
+                return handler(session, body, **params) if session is not None else handler(body)
+        return _error(404, "unknown command", f"{method} {path}")
+
+    def _status(self, body):
+        return 200, {"ready": True, "message": "fake appium ready", "build": {"version": "fake"}}
+
+    def _new_session(self, body):
+        session_id = uuid.uuid4().hex
+        self.sessions[session_id] = FakeSession(self.screens)
+        capabilities = dict(body.get("capabilities", {}).get("alwaysMatch", {}))
+        capabilities.setdefault("platformName", "Android")
+        return 200, {"sessionId": session_id, "capabilities": capabilities}
+
+    def _delete_session(self, session, body):
+        self.sessions = {sid: value for sid, value in self.sessions.items() if value is not session}
+        return 200, None
+
+    def _find_element(self, session, body):
+        status, found = self._find_elements(session, body)
+        if status != 200:
+            return status, found
+        if not found:
+            return _error(404, "no such element", f"No element for {body.get('using')}: {body.get('value')}")
+        return 200, found[0]
+
+    def _find_elements(self, session, body):
+        try:
+            eids = session.find(body.get("using"), body.get("value"))
+        except (KeyError, ValueError) as e:
+            return _error(400, "invalid selector", str(e))
+        return 200, [{ELEMENT_KEY: eid, "ELEMENT": eid} for eid in eids]
+
+    def _with_element(self, session, eid):
+        element = session.element(eid)
+        if element is None:
+            return None, _error(404, "stale element reference", f"Element {eid} is no longer on screen")
+        return element, None
+
+    def _click(self, session, body, eid):
+        element, error = self._with_element(session, eid)
+        if error:
+            return error
+        if element.get("goto"):
+            session.navigate(element.get("goto"))
+        return 200, None
+
+    def _clear(self, session, body, eid):
+        element, error = self._with_element(session, eid)
+        if error:
+            return error
+        session.set_text(eid, "")
+        return 200, None
+
+    def _value(self, session, body, eid):
+        element, error = self._with_element(session, eid)
+        if error:
+            return error
+        session.set_text(eid, element.get("text", "") + body.get("text", "".join(body.get("value", []))))
+        return 200, None
+
+    def _text(self, session, body, eid):
+        element, error = self._with_element(session, eid)
+        return error or (200, element.get("text", ""))
+
+    def _attribute(self, session, body, eid, name):
+        element, error = self._with_element(session, eid)
+        return error or (200, element.get({"contentDescription": "content-desc", "resourceId": "resource-id",
+                                           "className": "class"}.get(name, name)))
+
+    def _displayed(self, session, body, eid):
+        element, error = self._with_element(session, eid)
+        return error or (200, element.get("displayed", "true") == "true")
+
+    def _source(self, session, body):
+        return 200, session.source()
+
+    def _screenshot(self, session, body):
+        return 200, PNG_1PX
+
+    def _press_keycode(self, session, body):
+        if body.get("keycode") == 4 and session.current != "main":  # KEYCODE_BACK
+            session.navigate("main")
+        return 200, None
+
+    def _current_package(self, session, body):
+        return 200, PACKAGE
+
+    def _restart_app(self, session, body):
+        session.navigate("main")
+        return 200, None
+
+    def _execute(self, session, body):
+        script = body.get("script", "")
+        args = (body.get("args") or [{}])[0]
+        if script == "mobile: pressKey":
+            return self._press_keycode(session, args)
+        if script == "mobile: getCurrentPackage":
+            return self._current_package(session, args)
+        if script in ("mobile: terminateApp", "mobile: activateApp"):
+            return self._restart_app(session, args)
+        if script == "mobile: clearApp":
+            session.navigate("main")
+            return 200, None
+        if script == "mobile: replaceElementValue":
+            element, error = self._with_element(session, args.get("elementId"))
+            if error:
+                return error
+            session.set_text(args["elementId"], args.get("text", ""))
+            return 200, None
+        return _error(404, "unknown method", f"Unsupported script: {script}")
@@ -11,4 +11,18 @@ APPIUM_HOST = os.getenv("APPIUM_HOST", "127.0.0.1")  # Use localhost
 APPIUM_PORT = os.getenv("APPIUM_PORT", "4723")
 APK_PATH = os.getenv("APK_PATH", os.path.join(TEST_RESOURCES_DIR, "Android_Demo_App.apk"))
 APP_PACKAGE = "com.code2lead.kwad"
-APP_ACTIVITY = "com.code2lead.kwad.MainActivity"
\ No newline at end of file
+APP_ACTIVITY = "com.code2lead.kwad.MainActivity"
+# Wait settings
+DEFAULT_TIMEOUT = float(os.getenv("DEFAULT_TIMEOUT", "10"))
+LOCATOR_HISTORY_FILE = os.getenv("LOCATOR_HISTORY_FILE", os.path.join(LOG_DIR, "locator_latencies.json"))
+# Screenshot retention (0 disables the limit); off by default, screenshots/ holds tracked files
+SCREENSHOT_KEEP = int(os.getenv("SCREENSHOT_KEEP", "0"))
+SCREENSHOT_MAX_AGE_DAYS = float(os.getenv("SCREENSHOT_MAX_AGE_DAYS", "0"))
+# Timing report written at session end
+TIMING_REPORT_DIR = os.getenv("TIMING_REPORT_DIR", os.path.join(LOG_DIR, "timing"))
+# Visual regression: baselines per device/resolution/test, per-pixel YIQ threshold (0..1), allowed changed-pixel ratio
+VISUAL_BASELINE_DIR = os.getenv("VISUAL_BASELINE_DIR", os.path.join("tests", "visual_baselines"))
+VISUAL_THRESHOLD = float(os.getenv("VISUAL_THRESHOLD", "0.1"))
+VISUAL_TOLERANCE = float(os.getenv("VISUAL_TOLERANCE", "0.001"))
+# Structured JSONL event log (one file per worker and run) and the Chrome trace built from it
+EVENT_LOG_DIR = os.getenv("EVENT_LOG_DIR", os.path.join(LOG_DIR, "events"))
@@ -0,0 +1,187 @@
+# AppiumFramework/src/drivers/appium_server_pool.py
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from appium.webdriver.appium_service import AppiumService
+
+from src.utilities.custom_logger import CustomLogger
+from src.utilities.port_allocator import PortAllocator, get_port_allocator
+from src.utilities.readiness import AppiumStatusClient, ReadinessError, get_status_client, wait_for_server
+
+logger = CustomLogger.get_logger(__name__)
+
+
+def _launch_appium_service(host: str, port: int) -> AppiumService:
+    """Default launcher: boot a local Appium server through AppiumService."""
+    service = AppiumService()
+    service.start(args=['-p', str(port), '-a', host])
+    return service
+
+
+def current_worker_id() -> str:
+    """Return the pytest-xdist worker id of this process, or 'master'."""
+    return os.environ.get('PYTEST_XDIST_WORKER', 'master')
+
+
+class AppiumServer:
+    """A single Appium server process owned by an AppiumServerPool."""
+
+    def __init__(self, host: str, port: int, handle, status_client: Optional[AppiumStatusClient] = None):
+        self.host = host
+        self.port = port
+        self.handle = handle
+        self.status_client = status_client or get_status_client()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def is_healthy(self) -> bool:
+        """Return True if the server answers /status as ready."""
+        return self.status_client.is_ready(self.url)
+
+    def stop(self):
+        """Stop the underlying server process if it is still running."""
+        if self.handle is not None and getattr(self.handle, "is_running", True):
+            self.handle.stop()
+            logger.info(f"Appium server on port {self.port} stopped")
+
+
+class ServerLease:
+    """A server handed out to one worker, with the time it took to acquire."""
+
+    def __init__(self, server: AppiumServer, worker_id: str, acquire_seconds: float):
+        self.server = server
+        self.worker_id = worker_id
+        self.acquire_seconds = acquire_seconds
+
+    @property
+    def url(self) -> str:
+        return self.server.url
+
+    @property
+    def port(self) -> int:
+        return self.server.port
+
+
+class AppiumServerPool:
+    """Process-wide pool of pre-warmed Appium servers handed out as leases.
+
+    Servers are booted once by start(), leased per worker id, health-checked
+    before every lease and only stopped by shutdown() at session end. Each
+    xdist worker is a separate process with its own pool, so the test session
+    starts one server per worker.
+    """
+
+    def __init__(self, size: int = 1, host: Optional[str] = None, base_port: int = 4723,
+                 launcher: Optional[Callable] = None, start_timeout: float = 60,
+                 health_timeout: float = 2.0, ports: Optional[PortAllocator] = None):
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1, got {size}")
+        self.size = size
+        self.host = host or os.getenv("APPIUM_HOST", "127.0.0.1")
+        self.base_port = base_port
+        self.launcher = launcher or _launch_appium_service
+        self.ports = ports or get_port_allocator()
+        self.start_timeout = start_timeout
+        self.status_client = AppiumStatusClient(read_timeout=health_timeout, pool_size=max(size, 10))
+        self.lease_times: List[float] = []
+        self._idle: List[AppiumServer] = []
+        self._leases: Dict[str, ServerLease] = {}
+        self._servers: List[AppiumServer] = []
+        self._started = False
+        self._condition = threading.Condition()
+
+    def start(self):
+        """Boot every server in the pool and wait until all of them are ready."""
+        with self._condition:
+            if self._started:
+                return
+            self._started = True
+        port = self.base_port
+        booting = []
+        for _ in range(self.size):
+            port = self.ports.allocate("appium", port, owner=f"appium-pool-{current_worker_id()}")
+            booting.append(self._launch(port))
+            port += 1
+        for server in booting:
+            self._wait_until_healthy(server)
+        with self._condition:
+            self._idle.extend(booting)
+            self._condition.notify_all()
+        logger.info(f"Appium server pool ready with {self.size} server(s) on ports "
+                    f"{[server.port for server in booting]}")
+
+    def acquire(self, worker_id: Optional[str] = None, timeout: float = 60) -> ServerLease:
+        """Lease a healthy server to a worker; the same worker gets the same lease back."""
+        worker_id = worker_id or current_worker_id()
+        started_at = time.perf_counter()
+        if not self._started:
+            self.start()
+        with self._condition:
+            if worker_id in self._leases:
+                return self._leases[worker_id]
+            if not self._condition.wait_for(lambda: self._idle, timeout=timeout):
+                raise RuntimeError(f"No Appium server became available for {worker_id} within {timeout} seconds")
+            server = self._idle.pop(0)
+        if not server.is_healthy():
+            logger.warning(f"Appium server on port {server.port} failed its health check, restarting it")
+            server = self._replace(server)
+        lease = ServerLease(server, worker_id, time.perf_counter() - started_at)
+        with self._condition:
+            self._leases[worker_id] = lease
+            self.lease_times.append(lease.acquire_seconds)
+        logger.info(f"Worker {worker_id} leased Appium server {lease.url} in {lease.acquire_seconds:.3f}s")
+        return lease
+
+    def release(self, lease: ServerLease):
+        """Return a leased server to the pool without stopping it."""
+        with self._condition:
+            if self._leases.get(lease.worker_id) is not lease:
+                return
+            del self._leases[lease.worker_id]
+            self._idle.append(lease.server)
+            self._condition.notify()
+        logger.info(f"Worker {lease.worker_id} released Appium server {lease.url}")
+
+    def shutdown(self):
+        """Stop every server in the pool; called once at session end."""
+        with self._condition:
+            servers, self._servers = self._servers, []
+            self._idle.clear()
+            self._leases.clear()
+            self._started = False
+        for server in servers:
+            try:
+                server.stop()
+            except Exception as e:
+                logger.error(f"Failed to stop Appium server on port {server.port}: {str(e)}")
+            self.ports.release(server.port)
+
+    def _launch(self, port: int) -> AppiumServer:
+        server = AppiumServer(self.host, port, self.launcher(self.host, port), self.status_client)
+        with self._condition:
+            self._servers.append(server)
+        logger.info(f"Launched Appium server on {self.host}:{port}")
+        return server
+
+    def _replace(self, server: AppiumServer) -> AppiumServer:
+        with self._condition:
+            if server in self._servers:
+                self._servers.remove(server)
+        try:
+            server.stop()
+        except Exception as e:
+            logger.warning(f"Failed to stop unhealthy Appium server on port {server.port}: {str(e)}")
+        replacement = self._launch(server.port)
+        self._wait_until_healthy(replacement)
+        return replacement
+
+    def _wait_until_healthy(self, server: AppiumServer):
+        try:
+            wait_for_server(server.url, timeout=self.start_timeout, client=self.status_client)
+        except ReadinessError:
+            raise RuntimeError(f"Appium server on port {server.port} did not start within {self.start_timeout} seconds")
@@ -0,0 +1,178 @@
+# AppiumFramework/src/drivers/async_driver.py
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+from selenium.common.exceptions import (InvalidSelectorException, InvalidSessionIdException, NoSuchElementException,
+                                        StaleElementReferenceException, TimeoutException, UnknownMethodException,
+                                        WebDriverException)
+
+from src.utilities.custom_logger import CustomLogger
+
+logger = CustomLogger.get_logger(__name__)
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"  # W3C web element identifier
+# Capabilities defined by W3C WebDriver; every other one needs a vendor prefix
+_W3C_CAPABILITIES = {"browserName", "browserVersion", "platformName", "acceptInsecureCerts", "pageLoadStrategy",
+                     "proxy", "setWindowRect", "timeouts", "strictFileInteractability", "unhandledPromptBehavior",
+                     "webSocketUrl"}
+# W3C error codes -> the Selenium exceptions BasePage code already handles
+_ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "invalid session id": InvalidSessionIdException,
+    "invalid selector": InvalidSelectorException,
+    "unknown command": UnknownMethodException,
+    "unknown method": UnknownMethodException,
+    "timeout": TimeoutException,
+}
+
+
+def w3c_capabilities(capabilities: Dict[str, Any]) -> Dict[str, Any]:
+    """Prefix Appium capabilities with "appium:", as UiAutomator2Options does for the sync driver."""
+    return {name if name in _W3C_CAPABILITIES or ":" in name else f"appium:{name}": value
+            for name, value in capabilities.items() if value is not None}
+
+
+class AsyncW3CClient:
+    """asyncio client of the Appium (W3C WebDriver) HTTP API with one pooled aiohttp connector.
+
+    Every session opened through the client shares its keep-alive connections,
+    so one event loop can drive many devices without a process or thread per
+    device:
+
+        async with AsyncW3CClient() as client:
+            drivers = await client.new_sessions([(url, caps) for caps in device_capabilities])
+    """
+
+    def __init__(self, pool_size: int = 100, connect_timeout: float = 5.0, command_timeout: float = 120.0):
+        self.pool_size = pool_size
+        self.timeout = aiohttp.ClientTimeout(total=command_timeout, connect=connect_timeout)
+        self._http: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncW3CClient":
+        return await self.open()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def open(self) -> "AsyncW3CClient":
+        if self._http is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size)
+            self._http = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    async def request(self, method: str, url: str, body: Optional[dict] = None) -> Any:
+        """Send one command and return its "value"; W3C errors raise the matching Selenium exception."""
+        if self._http is None:
+            raise RuntimeError("AsyncW3CClient is not open; use 'async with AsyncW3CClient()' or await open()")
+        async with self._http.request(method, url, json=body if method == "POST" else None) as response:
+            try:
+                payload = await response.json(content_type=None)
+            except ValueError:
+                payload = {"value": {"error": "unknown error", "message": await response.text()}}
+        value = payload.get("value") if isinstance(payload, dict) else None
+        if response.status >= 400 or (isinstance(value, dict) and "error" in value):
+            error = value if isinstance(value, dict) else {}
+            exception = _ERRORS.get(error.get("error"), WebDriverException)
+            raise exception(error.get("message") or f"{method} {url} failed with HTTP {response.status}")
+        return value
+
+    async def new_session(self, server_url: str, capabilities: Dict[str, Any]) -> "AsyncDriver":
+        server_url = server_url.rstrip("/")
+        value = await self.request("POST", f"{server_url}/session",
+                                   {"capabilities": {"alwaysMatch": w3c_capabilities(capabilities),
+                                                     "firstMatch": [{}]}})
+        driver = AsyncDriver(self, server_url, value["sessionId"], value.get("capabilities", {}))
+        logger.info(f"Async session {driver.session_id} started on {server_url}")
+        return driver
+
+    async def new_sessions(self, targets: Iterable[Tuple[str, Dict[str, Any]]]) -> List["AsyncDriver"]:
+        """Open a session per (server_url, capabilities) concurrently; if one fails, the others are quit."""
+        results = await asyncio.gather(*(self.new_session(url, capabilities) for url, capabilities in targets),
+                                       return_exceptions=True)
+        failures = [result for result in results if isinstance(result, BaseException)]
+        if failures:
+            await asyncio.gather(*(result.quit() for result in results if isinstance(result, AsyncDriver)),
+                                 return_exceptions=True)
+            raise failures[0]
+        return list(results)
+
+
+class AsyncDriver:
+    """One Appium session; the async counterpart of the WebDriver commands BasePage uses."""
+
+    def __init__(self, client: AsyncW3CClient, server_url: str, session_id: str, capabilities: Dict[str, Any]):
+        self.client = client
+        self.server_url = server_url
+        self.session_id = session_id
+        self.capabilities = capabilities
+
+    async def execute(self, method: str, path: str, body: Optional[dict] = None) -> Any:
+        return await self.client.request(method, f"{self.server_url}/session/{self.session_id}{path}", body)
+
+    async def find_element(self, by: str, value: str) -> "AsyncElement":
+        found = await self.execute("POST", "/element", {"using": by, "value": value})
+        return AsyncElement(self, found[ELEMENT_KEY])
+
+    async def find_elements(self, by: str, value: str) -> List["AsyncElement"]:
+        found = await self.execute("POST", "/elements", {"using": by, "value": value})
+        return [AsyncElement(self, element[ELEMENT_KEY]) for element in found]
+
+    async def page_source(self) -> str:
+        return await self.execute("GET", "/source")
+
+    async def get_screenshot_as_base64(self) -> str:
+        return await self.execute("GET", "/screenshot")
+
+    async def press_keycode(self, keycode: int):
+        await self.execute("POST", "/appium/device/press_keycode", {"keycode": keycode})
+
+    async def execute_script(self, script: str, *args) -> Any:
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": list(args)})
+
+    async def terminate_app(self, app_id: str):
+        await self.execute_script("mobile: terminateApp", {"appId": app_id})
+
+    async def activate_app(self, app_id: str):
+        await self.execute_script("mobile: activateApp", {"appId": app_id})
+
+    async def quit(self):
+        try:
+            await self.client.request("DELETE", f"{self.server_url}/session/{self.session_id}")
+        except (WebDriverException, aiohttp.ClientError) as e:
+            logger.warning(f"Could not quit async session {self.session_id}: {e}")
+        logger.info(f"Async session {self.session_id} ended")
+
+
+class AsyncElement:
+    def __init__(self, driver: AsyncDriver, element_id: str):
+        self.driver = driver
+        self.id = element_id
+
+    async def _execute(self, method: str, command: str, body: Optional[dict] = None) -> Any:
+        return await self.driver.execute(method, f"/element/{self.id}/{command}", body)
+
+    async def click(self):
+        await self._execute("POST", "click", {})
+
+    async def clear(self):
+        await self._execute("POST", "clear", {})
+
+    async def send_keys(self, text: str):
+        await self._execute("POST", "value", {"text": text, "value": list(text)})
+
+    async def text(self) -> str:
+        return await self._execute("GET", "text")
+
+    async def get_attribute(self, name: str) -> Optional[str]:
+        return await self._execute("GET", f"attribute/{name}")
+
+    async def is_displayed(self) -> bool:
+        return bool(await self._execute("GET", "displayed"))
@@ -5,12 +5,17 @@ from appium import webdriver
 from appium.options.android import UiAutomator2Options
 from appium.webdriver.appium_service import AppiumService
 
-from src.config.constants import TEST_RESOURCES_DIR, APK_PATH
+from selenium.common.exceptions import WebDriverException
+
+from src.config.constants import TEST_RESOURCES_DIR, APK_PATH, APP_PACKAGE, APP_ACTIVITY
+from src.utilities.apk_cache import get_apk_installer
 from src.utilities.custom_logger import CustomLogger
+from src.utilities.readiness import ReadinessError, wait_for_server
+from src.utilities.port_allocator import get_port_allocator
+from src.utilities.timing import get_timing_recorder
 import os
 import socket
-import time
-import requests
+import subprocess
 import threading
 
 logger = CustomLogger.get_logger(__name__)
@@ -18,10 +23,13 @@ logger = CustomLogger.get_logger(__name__)
 class Driver:
     _thread_local = threading.local()
 
-    def __init__(self, appium_port_base=4723, system_port_base=8200, udid=None, apk_path=None):
+    def __init__(self, appium_port_base=4723, system_port_base=8200, udid=None, apk_path=None, server_pool=None):
         self.appium_host = os.getenv("APPIUM_HOST", "127.0.0.1")
-        self.appium_port = self.find_free_port(appium_port_base)
-        self.system_port = self.find_free_port(system_port_base)
+        self.server_pool = server_pool
+        self.ports = get_port_allocator()
+        # A pooled server brings its own port; only a private AppiumService needs one reserved
+        self.appium_port = None if server_pool is not None else self.ports.allocate("appium", appium_port_base)
+        self.system_port = self.ports.allocate("system", system_port_base)
         self.udid = udid
         self.apk_path = APK_PATH
         # Ensure capabilities are valid
@@ -46,7 +54,8 @@ class Driver:
     def _start_appium_service(self):
         if not hasattr(self._thread_local, 'appium_service') or not self._thread_local.appium_service.is_running:
             if self._is_port_in_use(self.appium_port):
-                self.appium_port = self.find_free_port(self.appium_port + 1)
+                self.ports.release(self.appium_port)
+                self.appium_port = self.ports.allocate("appium", self.appium_port + 1)
             self._thread_local.appium_service = AppiumService()
             self._thread_local.appium_service.start(args=['-p', str(self.appium_port), '-a', self.appium_host])
             logger.info(f"Thread {threading.current_thread().name}: Appium server started on {self.appium_host}:{self.appium_port}")
@@ -56,45 +65,105 @@ class Driver:
             return s.connect_ex((self.appium_host, port)) == 0
 
     def _is_appium_ready(self, timeout=60):
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                response = requests.get(f"http://{self.appium_host}:{self.appium_port}/status")
-                if response.status_code == 200:
-                    logger.info(f"Thread {threading.current_thread().name}: Appium server is ready!")
-                    return True
-            except requests.RequestException:
-                time.sleep(1)
-        raise RuntimeError(f"Appium server did not start within {timeout} seconds")
+        try:
+            wait_for_server(f"http://{self.appium_host}:{self.appium_port}", timeout=timeout)
+        except ReadinessError:
+            raise RuntimeError(f"Appium server did not start within {timeout} seconds")
+        logger.info(f"Thread {threading.current_thread().name}: Appium server is ready!")
+        return True
+
+    def _lease_appium_server(self):
+        if getattr(self._thread_local, 'server_lease', None) is None:
+            self._thread_local.server_lease = self.server_pool.acquire()
+        lease = self._thread_local.server_lease
+        self.appium_host, self.appium_port = lease.server.host, lease.port
+        logger.info(f"Thread {threading.current_thread().name}: Using pooled Appium server {lease.url} "
+                    f"(lease acquired in {lease.acquire_seconds:.3f}s)")
+
+    def _prepare_app(self):
+        """Install the APK only if the device lacks this build, then launch by package instead of uploading it."""
+        if self.udid is None or os.getenv("APK_INSTALL_CACHE", "1") == "0":
+            return
+        try:
+            get_apk_installer().ensure_installed(self.udid, self.apk_path, APP_PACKAGE)
+        except (OSError, RuntimeError, subprocess.SubprocessError) as e:
+            logger.warning(f"APK install cache unavailable for {self.udid}, letting Appium install: {e}")
+            self.capabilities["app"] = self.apk_path
+            return
+        self.capabilities.pop("app", None)
+        self.capabilities.update(appPackage=APP_PACKAGE, appActivity=APP_ACTIVITY)
 
     def get_driver(self):
         if not hasattr(self._thread_local, 'driver') or self._thread_local.driver is None:
-            self._start_appium_service()
-            self._is_appium_ready()
+            timings = get_timing_recorder()
+            with timings.action("driver.app_install"):
+                self._prepare_app()
+            if self.server_pool is not None:
+                with timings.action("driver.server_lease"):
+                    self._lease_appium_server()
+            else:
+                with timings.action("driver.server_start"):
+                    self._start_appium_service()
+                with timings.action("driver.readiness"):
+                    self._is_appium_ready()
             options = UiAutomator2Options()
             try:
                 options.load_capabilities(self.capabilities)
             except Exception as e:
                 logger.error(f"Failed to load capabilities: {e}")
                 raise
-            self._thread_local.driver = webdriver.Remote(f"http://{self.appium_host}:{self.appium_port}", options=options)
+            with timings.action("driver.session_create"):
+                self._thread_local.driver = webdriver.Remote(f"http://{self.appium_host}:{self.appium_port}",
+                                                             options=options)
             logger.info(f"Thread {threading.current_thread().name}: Driver initialized for {self.udid}")
         return self._thread_local.driver
 
+    def is_session_alive(self):
+        """Return True if the current WebDriver session still answers commands."""
+        driver = getattr(self._thread_local, 'driver', None)
+        if driver is None or driver.session_id is None:
+            return False
+        try:
+            driver.current_package
+            return True
+        except WebDriverException as e:
+            logger.warning(f"Thread {threading.current_thread().name}: WebDriver session is dead: {e.msg}")
+            return False
+
+    def reuse_session(self, reset_strategy):
+        """Return the live session after a cheap app reset, recreating it if it died."""
+        if getattr(self._thread_local, 'driver', None) is None:
+            return self.get_driver()
+        if not self.is_session_alive():
+            self._discard_session()
+            logger.info(f"Thread {threading.current_thread().name}: Recreating WebDriver session for {self.udid}")
+            return self.get_driver()
+        reset_strategy.reset(self._thread_local.driver, APP_PACKAGE, APP_ACTIVITY)
+        return self._thread_local.driver
+
+    def _discard_session(self):
+        try:
+            self._thread_local.driver.quit()
+        except WebDriverException:
+            pass
+        self._thread_local.driver = None
+
     def stop(self):
         if hasattr(self._thread_local, 'driver') and self._thread_local.driver:
-            self._thread_local.driver.quit()
+            with get_timing_recorder().action("driver.session_quit"):
+                self._thread_local.driver.quit()
             self._thread_local.driver = None
             logger.info(f"Thread {threading.current_thread().name}: Driver stopped")
-        if hasattr(self._thread_local, 'appium_service') and self._thread_local.appium_service.is_running:
+        if getattr(self._thread_local, 'server_lease', None) is not None:
+            self.server_pool.release(self._thread_local.server_lease)
+            self._thread_local.server_lease = None
+        elif hasattr(self._thread_local, 'appium_service') and self._thread_local.appium_service.is_running:
             self._thread_local.appium_service.stop()
             logger.info(f"Thread {threading.current_thread().name}: Appium server on port {self.appium_port} stopped")
+        self.release_ports()
 
-    @staticmethod
-    def find_free_port(start_port):
-        port = start_port
-        while True:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                if s.connect_ex(("127.0.0.1", port)) != 0:
-                    return port
-            port += 1
\ No newline at end of file
+    def release_ports(self):
+        """Give the systemPort (and private Appium port) back to the allocator."""
+        for port in (self.appium_port if self.server_pool is None else None, self.system_port):
+            if port is not None:
+                self.ports.release(port)
@@ -0,0 +1,72 @@
+# AppiumFramework/src/drivers/reset_strategies.py
+
+from abc import ABC, abstractmethod
+
+from selenium.common.exceptions import WebDriverException
+
+from src.utilities.adb_client import AdbError, get_adb_client
+from src.utilities.custom_logger import CustomLogger
+
+logger = CustomLogger.get_logger(__name__)
+
+
+class ResetStrategy(ABC):
+    """Bring the app under test back to a clean state on a reused session."""
+
+    name = "base"
+
+    @abstractmethod
+    def reset(self, driver, app_package, app_activity):
+        """Reset the app on the driver's device."""
+
+
+class NoReset(ResetStrategy):
+    """Leave the app exactly as the previous test class left it."""
+
+    name = "none"
+
+    def reset(self, driver, app_package, app_activity):
+        logger.info("Reusing session without resetting app state")
+
+
+class RestartAppReset(ResetStrategy):
+    """Terminate and re-activate the app, keeping its data."""
+
+    name = "restart"
+
+    def reset(self, driver, app_package, app_activity):
+        driver.terminate_app(app_package)
+        driver.activate_app(app_package)
+        logger.info(f"Restarted app {app_package}")
+
+
+class ClearDataReset(ResetStrategy):
+    """Wipe app data (like `adb shell pm clear`) and launch the app again."""
+
+    name = "clear"
+
+    def __init__(self, adb=None):
+        self.adb = adb
+
+    def reset(self, driver, app_package, app_activity):
+        try:
+            driver.execute_script("mobile: clearApp", {"appId": app_package})
+        except WebDriverException as e:
+            logger.warning(f"mobile: clearApp failed ({e.msg}), falling back to adb pm clear")
+            udid = driver.capabilities.get("udid")
+            result = (self.adb or get_adb_client()).shell(udid, f"pm clear {app_package}")
+            if result.exit_code != 0:
+                raise AdbError(f"pm clear {app_package} on {udid or 'the only device'} failed: "
+                               f"{(result.stdout + result.stderr).strip()}")
+        driver.activate_app(app_package)
+        logger.info(f"Cleared data and relaunched app {app_package}")
+
+
+RESET_STRATEGIES = {strategy.name: strategy for strategy in (NoReset, RestartAppReset, ClearDataReset)}
+
+
+def get_reset_strategy(name):
+    """Return a reset strategy instance by its registered name."""
+    if name not in RESET_STRATEGIES:
+        raise ValueError(f"Invalid reset strategy: {name}. Available: {sorted(RESET_STRATEGIES)}")
+    return RESET_STRATEGIES[name]()
@@ -0,0 +1,148 @@
+# src/locators/locator_compiler.py
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+class Locator:
+    """Declarative locator spec, compiled to the cheapest strategy BasePage supports.
+
+    Predicates are combined (AND). `index` is the position within the parent,
+    `instance` the n-th match on screen; `child` and `sibling` narrow the match
+    with a nested Locator (UiSelector childSelector / fromParent).
+    """
+
+    __slots__ = ("id", "text", "text_contains", "desc", "class_name", "index", "instance", "child",
+                 "sibling", "xpath")
+
+    def __init__(self, id: Optional[str] = None, text: Optional[str] = None, text_contains: Optional[str] = None,
+                 desc: Optional[str] = None, class_name: Optional[str] = None, index: Optional[int] = None,
+                 instance: Optional[int] = None, child: Optional["Locator"] = None,
+                 sibling: Optional["Locator"] = None, xpath: Optional[str] = None):
+        self.id = id
+        self.text = text
+        self.text_contains = text_contains
+        self.desc = desc
+        self.class_name = class_name
+        self.index = index
+        self.instance = instance
+        self.child = child
+        self.sibling = sibling
+        self.xpath = xpath
+        if xpath is not None and any(value is not None for value in self._fields()[:-1]):
+            raise ValueError("An xpath Locator cannot be combined with other predicates")
+        if not any(value is not None for value in self._fields()):
+            raise ValueError("A Locator needs at least one predicate")
+
+    def _fields(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, Locator) and self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        set_fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__
+                               if getattr(self, name) is not None)
+        return f"Locator({set_fields})"
+
+    def compile(self) -> Tuple[str, str]:
+        return compile_locator(self)
+
+
+class CompiledLocator(NamedTuple):
+    """A locator already in BasePage form; BasePage methods take it in place of (locator_value, locator_type)."""
+
+    value: str
+    type: str
+
+
+class PageLocator:
+    """Class-level locator declaration for page objects.
+
+    Compiled once, on first access, and shared by every instance of the page:
+
+        class LoginPage(BasePage):
+            _login_button = PageLocator(LoginPageLocators.LOGIN_BUTTON)
+            _title = PageLocator(text="Enter Admin")
+    """
+
+    __slots__ = ("spec", "name", "_compiled")
+
+    def __init__(self, spec: Optional[Locator] = None, **predicates):
+        if (spec is None) == (not predicates):
+            raise ValueError("PageLocator takes either a Locator or locator predicates")
+        self.spec = spec if spec is not None else Locator(**predicates)
+        self.name = None
+        self._compiled = None
+
+    def __set_name__(self, owner, name):
+        self.name = f"{owner.__name__}.{name}"
+
+    def __get__(self, instance, owner=None) -> CompiledLocator:
+        compiled = self._compiled
+        if compiled is None:
+            locator_type, locator_value = compile_locator(self.spec)
+            compiled = self._compiled = CompiledLocator(locator_value, locator_type)
+        return compiled
+
+    def __repr__(self):
+        return f"PageLocator({self.name or self.spec!r})"
+
+
+def escape(value: str) -> str:
+    """Escape a value for use inside a double-quoted UiSelector string argument."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _uiselector(locator: Locator) -> str:
+    parts = ["new UiSelector()"]
+    if locator.id is not None:
+        parts.append(f'.resourceId("{escape(locator.id)}")')
+    if locator.class_name is not None:
+        parts.append(f'.className("{escape(locator.class_name)}")')
+    if locator.text is not None:
+        parts.append(f'.text("{escape(locator.text)}")')
+    if locator.text_contains is not None:
+        parts.append(f'.textContains("{escape(locator.text_contains)}")')
+    if locator.desc is not None:
+        parts.append(f'.description("{escape(locator.desc)}")')
+    if locator.index is not None:
+        parts.append(f".index({int(locator.index)})")
+    if locator.instance is not None:
+        parts.append(f".instance({int(locator.instance)})")
+    if locator.child is not None:
+        parts.append(f".childSelector({_uiselector(locator.child)})")
+    if locator.sibling is not None:
+        parts.append(f".fromParent({_uiselector(locator.sibling)})")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def compile_locator(locator: Locator) -> Tuple[str, str]:
+    """Return (locator_type, locator_value) for BasePage, picking the cheapest strategy.
+
+    Cost order is id > accessibility_id > UiSelector > XPath: a lone id or desc
+    is a direct lookup, any other combination becomes one on-device UiSelector,
+    and only raw xpath specs pay for a hierarchy dump.
+    """
+    if locator.xpath is not None:
+        return "xpath", locator.xpath
+    predicates = {name: getattr(locator, name) for name in Locator.__slots__ if getattr(locator, name) is not None}
+    if predicates.keys() == {"id"}:
+        return "id", locator.id
+    if predicates.keys() == {"desc"}:
+        return "accessibility_id", locator.desc
+    return "android_uiautomator", _uiselector(locator)
+
+
+_SINGLE_ATTRIBUTE_TYPES = {"text": "text", "uiautomator_text": "text", "uiautomator_desc": "desc",
+                           "uiautomator_class": "class_name"}
+
+
+@lru_cache(maxsize=1024)
+def uiselector_for(locator_type: str, locator_value: str) -> str:
+    """Memoized UiSelector for BasePage's single-attribute locator types, with proper escaping."""
+    if locator_type not in _SINGLE_ATTRIBUTE_TYPES:
+        return locator_value
+    return _uiselector(Locator(**{_SINGLE_ATTRIBUTE_TYPES[locator_type]: locator_value}))
@@ -1,12 +1,29 @@
 # src/locators/login_locators.py
+from src.locators.locator_compiler import Locator
+
+
 class LoginPageLocators:
-    """Stores locators for the login page."""
-
-    LOGIN_BUTTON = "Btn6"
-    EMAIL_INPUT = "com.code2lead.kwad:id/Et4"
-    PASSWORD_INPUT = "com.code2lead.kwad:id/Et5"
-    LOGIN_SUBMIT_BUTTON = "com.code2lead.kwad:id/Btn3"
-    WRONG_CREDENTIALS_MESSAGE = "Wrong Credentials"
-    ADMIN_PAGE_TITLE = "Enter Admin"
-    ADMIN_TEXT_INPUT = "com.code2lead.kwad:id/Edt_admin"
-    ADMIN_SUBMIT_BUTTON = "SUBMIT"
\ No newline at end of file
+    """Stores locators for the login page.
+
+    The constants are Locator specs, passed to BasePage without a locator_type.
+    The plain values they are built from are kept as *_VALUE for code that
+    still passes (value, locator_type) pairs.
+    """
+
+    LOGIN_BUTTON_VALUE = "Btn6"
+    EMAIL_INPUT_VALUE = "com.code2lead.kwad:id/Et4"
+    PASSWORD_INPUT_VALUE = "com.code2lead.kwad:id/Et5"
+    LOGIN_SUBMIT_BUTTON_VALUE = "com.code2lead.kwad:id/Btn3"
+    WRONG_CREDENTIALS_MESSAGE_VALUE = "Wrong Credentials"
+    ADMIN_PAGE_TITLE_VALUE = "Enter Admin"
+    ADMIN_TEXT_INPUT_VALUE = "com.code2lead.kwad:id/Edt_admin"
+    ADMIN_SUBMIT_BUTTON_VALUE = "SUBMIT"
+
+    LOGIN_BUTTON = Locator(desc=LOGIN_BUTTON_VALUE)
+    EMAIL_INPUT = Locator(id=EMAIL_INPUT_VALUE)
+    PASSWORD_INPUT = Locator(id=PASSWORD_INPUT_VALUE)
+    LOGIN_SUBMIT_BUTTON = Locator(id=LOGIN_SUBMIT_BUTTON_VALUE)
+    WRONG_CREDENTIALS_MESSAGE = Locator(text=WRONG_CREDENTIALS_MESSAGE_VALUE)
+    ADMIN_PAGE_TITLE = Locator(text=ADMIN_PAGE_TITLE_VALUE)
+    ADMIN_TEXT_INPUT = Locator(id=ADMIN_TEXT_INPUT_VALUE)
+    ADMIN_SUBMIT_BUTTON = Locator(text=ADMIN_SUBMIT_BUTTON_VALUE)
@@ -0,0 +1,166 @@
+import asyncio
+import time
+import weakref
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+from src.pages.base_page import BasePage
+from src.pages.element_cache import ElementCache
+from src.pages.page_snapshot import PageSnapshot
+from src.pages.polling import ExponentialPolling, LatencyHistory
+from src.utilities.custom_logger import CustomLogger
+
+logger = CustomLogger.get_logger(__name__)
+
+
+class AsyncBasePage:
+    """BasePage for an AsyncDriver: the same locators and element cache, with every command awaited.
+
+    Pages on different drivers run concurrently on one event loop, e.g. one
+    flow on ten devices with asyncio.gather. Step recovery and the per-thread
+    action timings of BasePage are not available here.
+    """
+
+    _snapshots = weakref.WeakKeyDictionary()
+    _screen_versions = weakref.WeakKeyDictionary()
+    polling_strategy = ExponentialPolling()
+    latency_history = None  # Set with BasePage.latency_history by the locator_latency_history fixture
+
+    # Locator handling is shared with the synchronous pages
+    _resolve_locator = staticmethod(BasePage._resolve_locator)
+    to_by = BasePage.to_by
+    _build_uiselector = BasePage._build_uiselector
+    _wait_settings = BasePage._wait_settings
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.element_cache = ElementCache()
+
+    def _screen_version(self):
+        return self._screen_versions.get(self.driver, 0)
+
+    def screen_changed(self):
+        """Mark the screen as navigated: cached elements and the snapshot of every page are dropped."""
+        self._screen_versions[self.driver] = self._screen_version() + 1
+        self.invalidate_snapshot()
+
+    async def snapshot(self, refresh=False):
+        """Return a page-source snapshot of the current screen, fetching it only when needed."""
+        snapshot = None if refresh else self._snapshots.get(self.driver)
+        if snapshot is None:
+            snapshot = PageSnapshot(await self.driver.page_source())
+            self._snapshots[self.driver] = snapshot
+            logger.debug("Fetched page source snapshot")
+        return snapshot
+
+    def invalidate_snapshot(self):
+        self._snapshots.pop(self.driver, None)
+
+    async def is_present(self, locator_value, locator_type=None):
+        """Check the snapshot for a visible element without a round-trip per query."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        try:
+            present = (await self.snapshot()).exists(locator_value, locator_type)
+        except ValueError:
+            return await self.is_displayed(locator_value, locator_type, fail_fast=True)
+        logger.info("Element with %s: %s present in snapshot: %s", locator_type, locator_value, present)
+        return present
+
+    async def wait_for_element(self, locator_value, locator_type=None, timeout=None, poll_frequency=None):
+        """Wait for an element to be present; other sessions keep running while this one polls."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        history_key = LatencyHistory.key(locator_type, locator_value)
+        timeout, strategy = self._wait_settings(history_key, timeout, poll_frequency)
+        by, value = self.to_by(locator_value, locator_type)
+        started = time.monotonic()
+        deadline = started + timeout
+        intervals = strategy.intervals()
+        while True:
+            try:
+                element = await self.driver.find_element(by, value)
+                break
+            except NoSuchElementException:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.error("Element not found with %s: %s within %ss", locator_type, value, timeout)
+                raise TimeoutException(f"No element with {locator_type}: {value}")
+            await asyncio.sleep(min(next(intervals), remaining))
+        if self.latency_history is not None:
+            self.latency_history.record(history_key, time.monotonic() - started)
+        logger.info("Element found with %s: %s", locator_type, value)
+        return element
+
+    async def get_element(self, locator_value, locator_type=None, timeout=None, poll_frequency=None):
+        """Get an element by its locator, reusing the handle resolved earlier on the same screen."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        key = (locator_type, locator_value)
+        version = self._screen_version()
+        element = self.element_cache.get(key, version)
+        if element is None:
+            element = await self.wait_for_element(locator_value, locator_type, timeout, poll_frequency)
+            self.element_cache.put(key, element, version)
+        return element
+
+    async def _with_element(self, locator_value, locator_type, timeout, poll_frequency, action):
+        """Await action(element), re-resolving once if the cached handle has gone stale."""
+        element = await self.get_element(locator_value, locator_type, timeout, poll_frequency)
+        try:
+            return await action(element)
+        except StaleElementReferenceException:
+            logger.warning("Stale element for %s: %s, re-resolving", locator_type, locator_value)
+            self.element_cache.invalidate((locator_type, locator_value))
+            return await action(await self.get_element(locator_value, locator_type, timeout, poll_frequency))
+
+    async def click_element(self, locator_value, locator_type=None, timeout=None, poll_frequency=None):
+        """Click an element by its locator."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        await self._with_element(locator_value, locator_type, timeout, poll_frequency,
+                                 lambda element: element.click())
+        self.screen_changed()  # A click may navigate
+        logger.info("Clicked element with %s: %s", locator_type, locator_value)
+
+    async def send_text(self, locator_value, locator_type=None, text="", timeout=None, poll_frequency=None):
+        """Send text to an element."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+
+        async def clear_and_type(element):
+            await element.clear()
+            await element.send_keys(text)
+
+        self.invalidate_snapshot()
+        await self._with_element(locator_value, locator_type, timeout, poll_frequency, clear_and_type)
+        logger.info("Sent text '%s' to element with %s: %s", text, locator_type, locator_value)
+
+    async def is_displayed(self, locator_value, locator_type=None, timeout=None, poll_frequency=None,
+                           fail_fast=False):
+        """Check if an element is displayed; fail_fast does a single lookup for negative checks."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        try:
+            is_visible = await self._with_element(locator_value, locator_type, 0 if fail_fast else timeout,
+                                                  poll_frequency, lambda element: element.is_displayed())
+        except TimeoutException:
+            logger.warning("Element not found with %s: %s", locator_type, locator_value)
+            return False
+        logger.info("Element with %s: %s is displayed: %s", locator_type, locator_value, is_visible)
+        return is_visible
+
+    async def get_element_text(self, locator_value, locator_type=None, timeout=None, poll_frequency=None):
+        """Get the text of an element."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        text = await self._with_element(locator_value, locator_type, timeout, poll_frequency,
+                                        lambda element: element.text())
+        logger.info("Retrieved text '%s' from element with %s: %s", text, locator_type, locator_value)
+        return text
+
+    async def get_element_attribute(self, locator_value, locator_type=None, attribute="text", timeout=5,
+                                    poll_frequency=None):
+        """Get a specific attribute of an element (e.g., 'value' for input fields)."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        return await self._with_element(locator_value, locator_type, timeout, poll_frequency,
+                                        lambda element: element.get_attribute(attribute))
+
+    async def keyCode(self, value):
+        self.screen_changed()
+        await self.driver.press_keycode(value)
+        logger.debug("Pressed keycode: %s", value)
@@ -0,0 +1,49 @@
+from src.pages.async_base_page import AsyncBasePage
+from src.pages.login_page import LoginPage
+from src.utilities.custom_logger import CustomLogger as cl
+
+
+class AsyncLoginPage(AsyncBasePage):
+    """The login page for an AsyncDriver, e.g. to run the login flow on many devices at once."""
+
+    log = cl.get_logger(__name__)
+
+    # Same compiled locators as the synchronous page
+    _login_button = LoginPage._login_button
+    _email_input = LoginPage._email_input
+    _password_input = LoginPage._password_input
+    _login_submit_button = LoginPage._login_submit_button
+    _wrong_credentials_message = LoginPage._wrong_credentials_message
+    _admin_page_title = LoginPage._admin_page_title
+
+    async def click_login_button(self):
+        await self.click_element(self._login_button)
+        self.log.info("Clicked login button")
+
+    async def enter_email(self, email):
+        await self.send_text(self._email_input, text=email)
+        self.log.info("Entered email: %s", email)
+
+    async def enter_password(self, password):
+        await self.send_text(self._password_input, text=password)
+        self.log.info("Entered password: %s", password)
+
+    async def click_login_submit(self):
+        await self.click_element(self._login_submit_button)
+        self.log.info("Clicked login submit button")
+
+    async def verify_admin_screen_displayed(self):
+        assert await self.is_displayed(self._admin_page_title), "Admin screen not displayed"
+        self.log.info("Verified admin screen is displayed")
+
+    async def verify_wrong_credentials_message_displayed(self):
+        assert await self.is_displayed(self._wrong_credentials_message), "Wrong credentials message is not displayed"
+        self.log.info("Verified wrong credentials message is displayed")
+
+    async def login(self, email, password):
+        """Open the login screen, sign in and check that the admin screen is shown."""
+        await self.click_login_button()
+        await self.enter_email(email)
+        await self.enter_password(password)
+        await self.click_login_submit()
+        await self.verify_admin_screen_displayed()
@@ -1,169 +1,439 @@
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException, TimeoutException,
+                                        UnknownMethodException, WebDriverException)
 from appium.webdriver.common.appiumby import AppiumBy
 from src.utilities.custom_logger import CustomLogger  # Adjusted path
-from src.config.constants import SCREENSHOT_DIR  # Adjusted path
-import os
-from datetime import datetime
+from src.config.constants import DEFAULT_TIMEOUT  # Adjusted path
+from src.locators.locator_compiler import CompiledLocator, Locator, compile_locator, uiselector_for
+from src.pages.element_cache import ElementCache
+from src.pages.page_snapshot import PageSnapshot
+from src.pages.polling import ExponentialPolling, FixedPolling, LatencyHistory, wait_until
+from src.pages.recovery import StepRecovery
+from src.utilities.screenshots import get_screenshot_store
+from src.utilities.timing import get_timing_recorder
+from src.utilities.visual_diff import device_key
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import re
+import time
+import weakref
 
 logger = CustomLogger.get_logger(__name__)
 
+# How automation backends answer an execute-script command they do not implement
+_UNSUPPORTED_SCRIPT = re.compile(r"unknown (method|command)|unsupported|not (yet )?implemented", re.IGNORECASE)
+
+def _timed(action):
+    """Record the decorated locator action with the timing recorder (nested calls fold into the outer one)."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, locator_value, locator_type=None, *args, **kwargs):
+            locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+            with self.timings.action(action, locator_type, locator_value):
+                return method(self, locator_value, locator_type, *args, **kwargs)
+        return wrapper
+    return decorate
+
 class BasePage:
+    # Shared by every page object on the same driver, so an action on one page invalidates all of them
+    _snapshots = weakref.WeakKeyDictionary()
+    _screen_versions = weakref.WeakKeyDictionary()
+    polling_strategy = ExponentialPolling()
+    latency_history = None  # LatencyHistory shared by all pages when learned timeouts are enabled
+    timings = get_timing_recorder()
+    step_recovery = StepRecovery()  # Cheap fixes tried before a lookup timeout fails the test
+    _no_replace_value = weakref.WeakSet()  # Drivers without `mobile: replaceElementValue`
+    visual_comparator = None  # VisualComparator checking screen_shot frames when visual checks are enabled
+    form_find_workers = 4
+
     def __init__(self, driver):
         self.driver = driver
+        self.element_cache = ElementCache()
+
+    def _screen_version(self):
+        return self._screen_versions.get(self.driver, 0)
+
+    def screen_changed(self):
+        """Mark the screen as navigated: cached elements and the snapshot of every page are dropped."""
+        self._screen_versions[self.driver] = self._screen_version() + 1
+        self.invalidate_snapshot()
 
-    def wait_for_element(self, locator_value, locator_type, timeout=10, poll_frequency=0.5):
-        """Wait for an element to be present in the DOM and visible."""
+    def snapshot(self, refresh=False):
+        """Return a page-source snapshot of the current screen, fetching it only when needed."""
+        snapshot = None if refresh else self._snapshots.get(self.driver)
+        if snapshot is None:
+            snapshot = PageSnapshot(self.driver.page_source)
+            self._snapshots[self.driver] = snapshot
+            logger.debug("Fetched page source snapshot")
+        return snapshot
+
+    def invalidate_snapshot(self):
+        """Drop the cached snapshot; called after any action that may change the screen."""
+        self._snapshots.pop(self.driver, None)
+
+    def is_present(self, locator_value, locator_type=None):
+        """Check the snapshot for a visible element without a round-trip per query."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
         try:
-            locator_map = {
-                "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
-                "id": AppiumBy.ID,
-                "xpath": AppiumBy.XPATH,
-                "class_name": AppiumBy.CLASS_NAME,
-                "text": AppiumBy.ANDROID_UIAUTOMATOR,
-                "android_uiautomator": AppiumBy.ANDROID_UIAUTOMATOR,
-                "uiautomator_text": AppiumBy.ANDROID_UIAUTOMATOR,
-                "uiautomator_desc": AppiumBy.ANDROID_UIAUTOMATOR,
-                "uiautomator_class": AppiumBy.ANDROID_UIAUTOMATOR
-            }
-            if locator_type not in locator_map:
-                raise ValueError(f"Invalid locator_type: {locator_type}")
-
-            if locator_type in ["text", "uiautomator_text", "uiautomator_desc", "uiautomator_class"]:
-                locator_value = self._build_uiselector(locator_type, locator_value)
-
-            locator = (locator_map[locator_type], locator_value)
-            wait = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency)
-            element = wait.until(EC.presence_of_element_located(locator))
-            logger.info(f"Element found with {locator_type}: {locator_value}")
+            present = self.snapshot().exists(locator_value, locator_type)
+        except ValueError:
+            return self.is_displayed(locator_value, locator_type, fail_fast=True)
+        logger.info("Element with %s: %s present in snapshot: %s", locator_type, locator_value, present)
+        return present
+
+    def get_snapshot_text(self, locator_value, locator_type=None):
+        """Get an element's text from the snapshot; None if it is not on screen."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        return self.snapshot().text(locator_value, locator_type)
+
+    def get_snapshot_attribute(self, locator_value, locator_type=None, attribute="text"):
+        """Get an element's page-source attribute (e.g. 'checked') from the snapshot."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        return self.snapshot().attribute(locator_value, locator_type, attribute)
+
+    @staticmethod
+    def _resolve_locator(locator_value, locator_type):
+        """Compile a Locator spec into (locator_value, locator_type); plain pairs pass through.
+
+        A Locator already carries its type, so a second positional argument
+        (e.g. the text in send_text(locator, "hello")) is rejected instead of
+        being silently ignored.
+        """
+        if isinstance(locator_value, (CompiledLocator, Locator)) and locator_type is not None:
+            raise ValueError(f"locator_type {locator_type!r} given with {type(locator_value).__name__} "
+                             f"{locator_value!r}; pass further arguments by keyword, e.g. text=...")
+        if type(locator_value) is CompiledLocator:
+            return locator_value
+        if isinstance(locator_value, Locator):
+            locator_type, locator_value = compile_locator(locator_value)
+        if locator_type is None:
+            raise ValueError(f"locator_type is required for plain locator value {locator_value!r}")
+        return locator_value, locator_type
+
+    def to_by(self, locator_value, locator_type):
+        """Translate a BasePage locator into the (By, value) pair WebDriver expects."""
+        locator_map = {
+            "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
+            "id": AppiumBy.ID,
+            "xpath": AppiumBy.XPATH,
+            "class_name": AppiumBy.CLASS_NAME,
+            "text": AppiumBy.ANDROID_UIAUTOMATOR,
+            "android_uiautomator": AppiumBy.ANDROID_UIAUTOMATOR,
+            "uiautomator_text": AppiumBy.ANDROID_UIAUTOMATOR,
+            "uiautomator_desc": AppiumBy.ANDROID_UIAUTOMATOR,
+            "uiautomator_class": AppiumBy.ANDROID_UIAUTOMATOR
+        }
+        if locator_type not in locator_map:
+            raise ValueError(f"Invalid locator_type: {locator_type}")
+        if locator_type in ["text", "uiautomator_text", "uiautomator_desc", "uiautomator_class"]:
+            locator_value = self._build_uiselector(locator_type, locator_value)
+        return locator_map[locator_type], locator_value
+
+    def _wait_settings(self, history_key, timeout, poll_frequency):
+        """Resolve the timeout (explicit, learned or default) and polling strategy for one lookup."""
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+            if self.latency_history is not None:
+                timeout = self.latency_history.timeout_for(history_key, DEFAULT_TIMEOUT)
+        strategy = self.polling_strategy if poll_frequency is None else FixedPolling(poll_frequency)
+        return timeout, strategy
+
+    @_timed("find")
+    def wait_for_element(self, locator_value, locator_type=None, timeout=None, poll_frequency=None):
+        """Wait for an element to be present in the DOM and visible.
+
+        timeout=None uses the learned per-locator timeout (or DEFAULT_TIMEOUT);
+        poll_frequency=None uses the page's polling strategy instead of a fixed interval.
+        """
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        try:
+            history_key = LatencyHistory.key(locator_type, locator_value)
+            timeout, strategy = self._wait_settings(history_key, timeout, poll_frequency)
+            locator = self.to_by(locator_value, locator_type)
+            locator_value = locator[1]
+            attempts = [0]
+            def find():
+                attempts[0] += 1
+                return self.driver.find_element(*locator)
+
+            started = time.monotonic()
+            try:
+                element = wait_until(find, timeout, strategy, message=f"No element with {locator_type}: {locator_value}")
+            finally:
+                self.timings.add_wait(time.monotonic() - started, attempts[0])
+            if self.latency_history is not None:
+                self.latency_history.record(history_key, time.monotonic() - started)
+            logger.info("Element found with %s: %s", locator_type, locator_value)
             return element
         except TimeoutException:
-            logger.error(f"Element not found with {locator_type}: {locator_value} within {timeout}s")
+            logger.error("Element not found with %s: %s within %ss", locator_type, locator_value, timeout)
             raise
         except Exception as e:
-            logger.error(f"Error waiting for element: {str(e)}")
+            logger.error("Error waiting for element: %s", e)
             raise
 
-    def get_element(self, locator_value, locator_type, timeout=10, poll_frequency=0.5):
-        """Get an element by its locator."""
+    def get_element(self, locator_value, locator_type=None, timeout=None, poll_frequency=None, recover=True):
+        """Get an element by its locator, reusing the handle resolved earlier on the same screen.
+
+        A lookup that times out goes through step_recovery unless recover is
+        False or timeout is 0.
+        """
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        key = (locator_type, locator_value)
+        version = self._screen_version()
+        element = self.element_cache.get(key, version)
+        if element is not None:
+            logger.debug("Element cache hit for %s: %s", locator_type, locator_value)
+            return element
         try:
-            return self.wait_for_element(locator_value, locator_type, timeout, poll_frequency)
+            element = self.wait_for_element(locator_value, locator_type, timeout, poll_frequency)
         except TimeoutException:
-            logger.error(f"Element not found with {locator_type}: {locator_value} within {timeout}s")
-            raise
+            element = None
+            if self.step_recovery is not None and recover and timeout != 0:
+                element = self.step_recovery.recover(self, locator_value, locator_type)
+            if element is None:
+                logger.error("Element not found with %s: %s", locator_type, locator_value)
+                raise
+            version = self._screen_version()  # Recovery may have changed the screen
         except Exception as e:
-            logger.error(f"An error occurred while getting element: {str(e)}")
+            logger.error("An error occurred while getting element: %s", e)
             raise
+        self.element_cache.put(key, element, version)
+        return element
+
+    def _with_element(self, locator_value, locator_type, timeout, poll_frequency, action, recover=True):
+        """Run action(element), re-resolving once if the cached handle has gone stale."""
+        element = self.get_element(locator_value, locator_type, timeout, poll_frequency, recover)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            logger.warning("Stale element for %s: %s, re-resolving", locator_type, locator_value)
+            self.element_cache.invalidate((locator_type, locator_value))
+            self.timings.add_retry()
+            return action(self.get_element(locator_value, locator_type, timeout, poll_frequency, recover))
 
-    def click_element(self, locator_value, locator_type, timeout=10, poll_frequency=0.5):
+    @_timed("click")
+    def click_element(self, locator_value, locator_type=None, timeout=None, poll_frequency=None):
         """Click an element by its locator."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
         try:
-            element = self.get_element(locator_value, locator_type, timeout, poll_frequency)
-            element.click()
-            logger.info(f"Clicked element with {locator_type}: {locator_value}")
+            self._with_element(locator_value, locator_type, timeout, poll_frequency, lambda element: element.click())
+            self.screen_changed()  # A click may navigate
+            logger.info("Clicked element with %s: %s", locator_type, locator_value)
         except NoSuchElementException:
-            logger.error(f"Element not clickable with {locator_type}: {locator_value}")
+            logger.error("Element not clickable with %s: %s", locator_type, locator_value)
             raise
         except Exception as e:
-            logger.error(f"An error occurred while clicking element: {str(e)}")
+            logger.error("An error occurred while clicking element: %s", e)
             raise
 
-    def send_text(self, locator_value, locator_type, text, timeout=10, poll_frequency=0.5):
+    @_timed("send_text")
+    def send_text(self, locator_value, locator_type=None, text="", timeout=None, poll_frequency=None):
         """Send text to an element."""
-        try:
-            element = self.get_element(locator_value, locator_type, timeout, poll_frequency)
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        def clear_and_type(element):
             element.clear()
             element.send_keys(text)
-            logger.info(f"Sent text '{text}' to element with {locator_type}: {locator_value}")
+
+        try:
+            self.invalidate_snapshot()
+            self._with_element(locator_value, locator_type, timeout, poll_frequency, clear_and_type)
+            logger.info("Sent text '%s' to element with %s: %s", text, locator_type, locator_value)
         except NoSuchElementException:
-            logger.error(f"Element not interactable with {locator_type}: {locator_value}")
+            logger.error("Element not interactable with %s: %s", locator_type, locator_value)
             raise
         except Exception as e:
-            logger.error(f"An error occurred while sending text: {str(e)}")
+            logger.error("An error occurred while sending text: %s", e)
             raise
 
-    def is_displayed(self, locator_value, locator_type, timeout=10, poll_frequency=0.5):
-        """Check if an element is displayed."""
+    def fill_form(self, fields, verify=True, timeout=None, poll_frequency=None):
+        """Type into several fields at once; fields maps locators (or (value, type) pairs) to text.
+
+        Fields without a cached handle are looked up concurrently, each value is
+        set with one `mobile: replaceElementValue` call (clear + send_keys where
+        the driver lacks it) and verify checks every field against a single
+        page-source snapshot. Masked (password) fields cannot be verified.
+
+        The batch only pays off when commands cost a device round-trip: in
+        benchmarks/ at 5 ms per command the contact form takes ~96 ms instead
+        of ~140 ms (p50) with one send_text per field. Without latency the
+        thread pool and the verify snapshot are pure overhead, so it is no
+        faster and can be slower (up to ~21.5 ms vs ~16.7 ms p50), with about
+        twice the peak allocations.
+        """
+        resolved = [(self._resolve_locator(*key) if type(key) is tuple else self._resolve_locator(key, None), text)
+                    for key, text in fields.items()]
+        with self.timings.action("fill_form", "form", f"{len(resolved)} fields"):
+            self.invalidate_snapshot()
+            self._find_all([locator for locator, _ in resolved], timeout, poll_frequency)
+            for (locator_value, locator_type), text in resolved:
+                self._with_element(locator_value, locator_type, timeout, poll_frequency,
+                                   lambda element: self._set_value(element, text))
+                logger.info("Set text '%s' on element with %s: %s", text, locator_type, locator_value)
+            if verify:
+                self._verify_form(resolved, timeout, poll_frequency)
+
+    def _find_all(self, locators, timeout, poll_frequency):
+        """Resolve every uncached locator in parallel; failed lookups get the usual recovery afterwards."""
+        version = self._screen_version()
+        pending = [locator for locator in locators if self.element_cache.get((locator[1], locator[0]), version) is None]
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.form_find_workers, len(pending))) as executor:
+                futures = [(locator, executor.submit(self.wait_for_element, *locator, timeout, poll_frequency))
+                           for locator in pending]
+                for (locator_value, locator_type), future in futures:
+                    try:
+                        self.element_cache.put((locator_type, locator_value), future.result(), version)
+                    except TimeoutException:
+                        pass
+        for locator_value, locator_type in pending:
+            self.get_element(locator_value, locator_type, timeout, poll_frequency)
+
+    def _set_value(self, element, text):
+        if self.driver not in self._no_replace_value:
+            try:
+                self.driver.execute_script("mobile: replaceElementValue", {"elementId": element.id, "text": text})
+                return
+            except StaleElementReferenceException:
+                raise
+            except WebDriverException as e:
+                if not isinstance(e, UnknownMethodException) and not _UNSUPPORTED_SCRIPT.search(e.msg or ""):
+                    raise
+                logger.info("mobile: replaceElementValue not supported, typing with clear + send_keys")
+                self._no_replace_value.add(self.driver)
+        element.clear()
+        element.send_keys(text)
+
+    def _verify_form(self, resolved, timeout, poll_frequency):
+        snapshot = self.snapshot(refresh=True)
+        mismatched = []
+        for (locator_value, locator_type), text in resolved:
+            try:
+                matches = snapshot.find_all(locator_value, locator_type)
+            except ValueError:
+                actual = self._with_element(locator_value, locator_type, timeout, poll_frequency,
+                                            lambda element: element.text)
+                filled = actual == text
+            else:
+                # Text and hint locators stop matching once the field holds the typed value
+                filled = (any(node.get("text") == text or node.get("password") == "true" for node in matches)
+                          or (not matches and (not text or bool(snapshot.find_all(text, "text")))))
+            if not filled:
+                mismatched.append(f"{locator_type}: {locator_value}")
+        assert not mismatched, f"Form fields not filled: {', '.join(mismatched)}"
+
+    @_timed("is_displayed")
+    def is_displayed(self, locator_value, locator_type=None, timeout=None, poll_frequency=None, fail_fast=False):
+        """Check if an element is displayed; fail_fast does a single lookup for negative checks.
+
+        A missing element is an answer here, not a failure: no step recovery
+        (dismissing dialogs, scrolling) is attempted.
+        """
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
+        if fail_fast:
+            timeout = 0
         try:
-            element = self.get_element(locator_value, locator_type, timeout, poll_frequency)
-            is_visible = element.is_displayed()
-            logger.info(f"Element with {locator_type}: {locator_value} is displayed: {is_visible}")
+            is_visible = self._with_element(locator_value, locator_type, timeout, poll_frequency,
+                                            lambda element: element.is_displayed(), recover=False)
+            logger.info("Element with %s: %s is displayed: %s", locator_type, locator_value, is_visible)
             return is_visible
         except TimeoutException:
-            logger.warning(f"Element not found with {locator_type}: {locator_value} within {timeout}s")
+            logger.warning("Element not found with %s: %s", locator_type, locator_value)
             return False
         except Exception as e:
-            logger.error(f"Error checking if element is displayed: {str(e)}")
+            logger.error("Error checking if element is displayed: %s", e)
             return False
 
-    def screen_shot(self, screenshot_name):
-        """Capture a screenshot and save it."""
+    def capture_screenshot(self, screenshot_name):
+        """Capture a screenshot in memory; the file is written and deduplicated in the background."""
         try:
-            if not os.path.exists(SCREENSHOT_DIR):
-                os.makedirs(SCREENSHOT_DIR, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_name = f"{screenshot_name}_{timestamp}"
-            file_path = os.path.join(SCREENSHOT_DIR, f"{file_name}.png")
-            if self.driver.get_screenshot_as_file(file_path):
-                logger.info(f"Screenshot saved successfully: {file_path}")
-                return file_path  # Changed to return path for consistency with your framework
-            else:
-                logger.error(f"Failed to save screenshot: {file_path}")
-                return None
+            return get_screenshot_store().capture(self.driver, screenshot_name)
         except Exception as e:
-            logger.error(f"Error capturing screenshot: {str(e)}")
+            logger.error("Error capturing screenshot: %s", e)
             return None
 
+    def screen_shot(self, screenshot_name, masks=None):
+        """Capture a screenshot and save it; with visual checks enabled it is also compared with its baseline.
+
+        masks leave parts of the frame out of the comparison: pixel boxes
+        (left, top, right, bottom) or locators, masked wherever they match.
+        Returns the Screenshot handle (None on error) without waiting for the
+        file. It stands in for the file path: os.fspath(), str() and open()
+        wait for the write and use the path.
+        """
+        screenshot = self.capture_screenshot(screenshot_name)
+        if screenshot and self.visual_comparator is not None:
+            try:
+                self.visual_comparator.submit(screenshot.png, screenshot_name, device_key(self.driver),
+                                              self._mask_bounds(masks))
+            except Exception as e:
+                logger.error("Error queueing visual comparison: %s", e)
+        return screenshot
+
+    def _mask_bounds(self, masks):
+        """Pixel boxes for masks; locators become the bounds of every match on the current screen."""
+        boxes = []
+        for mask in masks or ():
+            if not isinstance(mask, Locator) and len(mask) != 2:
+                boxes.append(tuple(mask))
+                continue
+            locator_value, locator_type = self._resolve_locator(*mask) if type(mask) is tuple else \
+                self._resolve_locator(mask, None)
+            for node in self.snapshot().find_all(locator_value, locator_type):
+                bounds = [int(number) for number in re.findall(r"-?\d+", node.get("bounds", ""))]
+                if len(bounds) == 4:
+                    boxes.append(tuple(bounds))
+        return boxes
+
     def _build_uiselector(self, locator_type, locator_value):
         """Build a UiSelector string for Android UIAutomator based on locator type."""
-        if locator_type in ["text", "uiautomator_text"]:
-            return f'new UiSelector().text("{locator_value}")'
-        elif locator_type == "uiautomator_desc":
-            return f'new UiSelector().description("{locator_value}")'
-        elif locator_type == "uiautomator_class":
-            return f'new UiSelector().className("{locator_value}")'
-        return locator_value
-
-    def get_element_text(self, locator_value, locator_type, timeout=10, poll_frequency=0.5):
+        return uiselector_for(locator_type, locator_value)
+
+    @_timed("get_text")
+    def get_element_text(self, locator_value, locator_type=None, timeout=None, poll_frequency=None):
         """Get the text of an element."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
         try:
-            element = self.get_element(locator_value, locator_type, timeout, poll_frequency)
-            text = element.text
-            logger.info(f"Retrieved text '{text}' from element with {locator_type}: {locator_value}")
+            text = self._with_element(locator_value, locator_type, timeout, poll_frequency, lambda element: element.text)
+            logger.info("Retrieved text '%s' from element with %s: %s", text, locator_type, locator_value)
             return text
         except NoSuchElementException:
-            logger.error(f"Element not found with {locator_type}: {locator_value}")
+            logger.error("Element not found with %s: %s", locator_type, locator_value)
             raise
         except Exception as e:
-            logger.error(f"Error retrieving text from element: {str(e)}")
+            logger.error("Error retrieving text from element: %s", e)
             raise
 
-    def get_element_attribute(self, locator_value, locator_type, attribute="text", timeout=5, poll_frequency=0.5):
+    @_timed("get_attribute")
+    def get_element_attribute(self, locator_value, locator_type=None, attribute="text", timeout=5, poll_frequency=None):
         """Get a specific attribute of an element (e.g., 'value' for input fields)."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
         try:
-            element = self.get_element(locator_value, locator_type, timeout, poll_frequency)
-            attr_value = element.get_attribute(attribute)
-            logger.info(f"Retrieved attribute '{attribute}' with value '{attr_value}' from element with {locator_type}: {locator_value}")
+            attr_value = self._with_element(locator_value, locator_type, timeout, poll_frequency,
+                                            lambda element: element.get_attribute(attribute))
+            logger.info("Retrieved attribute '%s' with value '%s' from element with %s: %s",
+                        attribute, attr_value, locator_type, locator_value)
             return attr_value
         except NoSuchElementException:
-            logger.error(f"Element not found with {locator_type}: {locator_value}")
+            logger.error("Element not found with %s: %s", locator_type, locator_value)
             raise
         except Exception as e:
-            logger.error(f"Error retrieving attribute '{attribute}' from element: {str(e)}")
+            logger.error("Error retrieving attribute '%s' from element: %s", attribute, e)
             raise
 
-    def is_field_populated(self, locator_value, locator_type, attribute="text"):
+    def is_field_populated(self, locator_value, locator_type=None, attribute="text"):
         """Check if a field is non-empty."""
+        locator_value, locator_type = self._resolve_locator(locator_value, locator_type)
         try:
             actual_value = self.get_element_attribute(locator_value, locator_type, attribute)
             is_populated = bool(actual_value and actual_value.strip())
-            logger.info(
-                f"Field with {locator_type}: {locator_value} has value '{actual_value}', is non-empty: {is_populated}")
+            logger.info("Field with %s: %s has value '%s', is non-empty: %s",
+                        locator_type, locator_value, actual_value, is_populated)
             return is_populated
         except Exception as e:
-            logger.error(f"Error checking field population: {str(e)}")
+            logger.error("Error checking field population: %s", e)
             return False
     def keyCode(self, value):
-        self.driver.press_keycode(value)
-        logger.debug(f"Pressed keycode: {value}")
\ No newline at end of file
+        self.screen_changed()
+        with self.timings.action("keycode"):
+            self.driver.press_keycode(value)
+        logger.debug("Pressed keycode: %s", value)
\ No newline at end of file
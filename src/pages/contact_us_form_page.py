@@ -1,41 +1,53 @@
 from src.pages.base_page import BasePage
+from src.locators.locator_compiler import PageLocator
 import allure
 
 class ContactForm(BasePage):
-    _contact_from_button = "Btn2"  # accessibilityID
-    _page_title = "Contact Us form"  # Text
-    _enter_name = "Enter Name"  # text
-    _enter_email = "Enter Email"  # text
-    _enter_address = "Enter Address"  # text
-    _enter_mobile_number = "Enter Mobile No"  # text
-    _submit_button = "SUBMIT"
+    _contact_from_button = PageLocator(desc="Btn2")  # accessibilityID
+    _page_title = PageLocator(text="Contact Us form")
+    _enter_name = PageLocator(text="Enter Name")
+    _enter_email = PageLocator(text="Enter Email")
+    _enter_address = PageLocator(text="Enter Address")
+    _enter_mobile_number = PageLocator(text="Enter Mobile No")
+    _submit_button = PageLocator(text="SUBMIT")
+    input_fields = PageLocator(class_name="android.widget.EditText")  # Every text field, e.g. to mask in screenshots
 
     @allure.step("Click Contact Form button")
     def click_contact_from_button(self):
-        self.click_element(self._contact_from_button, "accessibility_id")
+        self.click_element(self._contact_from_button)
 
     @allure.step("Verify Contact Page is displayed")
     def verify_contact_page(self):
-        element = self.is_displayed(self._page_title, "text")
+        element = self.is_displayed(self._page_title)
         assert element, "Contact Us form page title not displayed"
         return element  # Return for clarity in test assertions if needed
 
     @allure.step("Enter Name: {text}")
     def enter_name(self, text="Code2Lead"):
-        self.send_text(self._enter_name, "text", text)
+        self.send_text(self._enter_name, text=text)
 
     @allure.step("Enter Email: {text}")
     def enter_email(self, text):
-        self.send_text(self._enter_email, "text", text)
+        self.send_text(self._enter_email, text=text)
 
     @allure.step("Enter Address: {text}")
     def enter_address(self, text):
-        self.send_text(self._enter_address, "text", text)
+        self.send_text(self._enter_address, text=text)
 
     @allure.step("Enter Mobile Number: {text}")
     def enter_mobile_number(self, text):
-        self.send_text(self._enter_mobile_number, "text", text)
+        self.send_text(self._enter_mobile_number, text=text)
+
+    @allure.step("Fill Contact Us form")
+    def fill_contact_form(self, name, email, address, mobile_number):
+        """Fill all four fields in one batch (see BasePage.fill_form)."""
+        self.fill_form({
+            self._enter_name: name,
+            self._enter_email: email,
+            self._enter_address: address,
+            self._enter_mobile_number: mobile_number,
+        })
 
     @allure.step("Click Submit Button")
     def click_submit_button(self):
-        self.click_element(self._submit_button, "text")
\ No newline at end of file
+        self.click_element(self._submit_button)
\ No newline at end of file
@@ -0,0 +1,40 @@
+class ElementCache:
+    """Resolved element handles for one page object, keyed by (locator_type, locator_value).
+
+    Entries belong to a screen version; when the driver's screen version moves on
+    (navigation, keycodes) the whole cache is dropped on the next lookup.
+    """
+
+    def __init__(self):
+        self._elements = {}
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        """Return the cached element for key on this screen version, or None."""
+        if version != self._version:
+            self._elements.clear()
+            self._version = version
+        element = self._elements.get(key)
+        if element is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return element
+
+    def put(self, key, element, version):
+        if version != self._version:
+            self._elements.clear()
+            self._version = version
+        self._elements[key] = element
+
+    def invalidate(self, key=None):
+        """Forget one locator (e.g. after a StaleElementReferenceException) or everything."""
+        if key is None:
+            self._elements.clear()
+        else:
+            self._elements.pop(key, None)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._elements)}
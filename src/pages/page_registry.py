@@ -0,0 +1,57 @@
+import threading
+from typing import Dict, Type, TypeVar
+
+from src.utilities.custom_logger import CustomLogger
+
+logger = CustomLogger.get_logger(__name__)
+
+PageT = TypeVar("PageT")
+
+
+class PageRegistry:
+    """Page objects of one driver, created on first use and shared for as long as the driver lives.
+
+    Pages are cheap to share: their element caches are keyed by the driver's
+    screen version, so a page handed to a later test never serves handles from
+    an earlier screen.
+    """
+
+    _registries_lock = threading.Lock()
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._pages: Dict[type, object] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    @classmethod
+    def for_driver(cls, driver) -> "PageRegistry":
+        """Return the registry of this driver; it lives on the driver, so it goes away with the session."""
+        registry = getattr(driver, "_page_registry", None)
+        if registry is None:
+            with cls._registries_lock:
+                registry = getattr(driver, "_page_registry", None)
+                if registry is None:
+                    registry = cls(driver)
+                    driver._page_registry = registry
+        return registry
+
+    def get(self, page_class: Type[PageT]) -> PageT:
+        """Return this driver's instance of page_class, constructing it on first access."""
+        page = self._pages.get(page_class)
+        if page is None:
+            with self._lock:
+                page = self._pages.get(page_class)
+                if page is None:
+                    page = self._pages[page_class] = page_class(self.driver)
+                    self.created += 1
+                    logger.debug("Created page %s", page_class.__name__)
+        return page
+
+    def __contains__(self, page_class) -> bool:
+        return page_class in self._pages
+
+    def clear(self):
+        """Forget every page, e.g. after the app was reinstalled."""
+        with self._lock:
+            self._pages.clear()
@@ -0,0 +1,70 @@
+import re
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# BasePage locator types mapped to the page-source attribute they match on
+ATTRIBUTE_FOR_LOCATOR = {
+    "accessibility_id": "content-desc",
+    "id": "resource-id",
+    "text": "text",
+    "uiautomator_text": "text",
+    "uiautomator_desc": "content-desc",
+    "class_name": "class",
+    "uiautomator_class": "class",
+}
+
+# Single-attribute UiSelector strings, e.g. new UiSelector().text("SUBMIT")
+_UISELECTOR_PATTERN = re.compile(r'^new UiSelector\(\)\.(text|description|className|resourceId)\("((?:[^"\\]|\\.)*)"\)$')
+_UISELECTOR_ATTRIBUTES = {"text": "text", "description": "content-desc", "className": "class", "resourceId": "resource-id"}
+
+
+class PageSnapshot:
+    """An indexed, in-memory copy of `driver.page_source` for local element queries.
+
+    Works with both Appium page sources (tag = widget class) and raw
+    `uiautomator dump` output (<node class=...>).
+    """
+
+    def __init__(self, page_source: str):
+        self.root = ET.fromstring(page_source.encode("utf-8") if isinstance(page_source, str) else page_source)
+        self._index: Dict[str, Dict[str, List[ET.Element]]] = defaultdict(lambda: defaultdict(list))
+        for element in self.root.iter():
+            if element.tag != "node" and "class" not in element.attrib and element is not self.root:
+                element.set("class", element.tag)
+            for attribute in ("resource-id", "content-desc", "text", "class"):
+                value = element.get(attribute)
+                if value:
+                    self._index[attribute][value].append(element)
+
+    def find_all(self, locator_value: str, locator_type: str) -> List[ET.Element]:
+        """Return every node matching a BasePage locator; raises ValueError if it can't be answered locally."""
+        if locator_type in ATTRIBUTE_FOR_LOCATOR:
+            return list(self._index[ATTRIBUTE_FOR_LOCATOR[locator_type]].get(locator_value, []))
+        if locator_type == "android_uiautomator":
+            match = _UISELECTOR_PATTERN.match(locator_value.strip())
+            if not match:
+                raise ValueError(f"UiSelector not supported in snapshot queries: {locator_value}")
+            value = re.sub(r'\\(.)', r'\1', match.group(2))
+            return list(self._index[_UISELECTOR_ATTRIBUTES[match.group(1)]].get(value, []))
+        if locator_type == "xpath":
+            try:
+                return self.root.findall(locator_value if locator_value.startswith(".") else f".{locator_value}")
+            except SyntaxError as e:
+                raise ValueError(f"XPath not supported in snapshot queries: {locator_value}") from e
+        raise ValueError(f"Invalid locator_type: {locator_type}")
+
+    def find(self, locator_value: str, locator_type: str) -> Optional[ET.Element]:
+        matches = self.find_all(locator_value, locator_type)
+        return matches[0] if matches else None
+
+    def exists(self, locator_value: str, locator_type: str) -> bool:
+        """Return True if a matching node is in the snapshot and not reported as hidden."""
+        return any(element.get("displayed", "true") != "false" for element in self.find_all(locator_value, locator_type))
+
+    def text(self, locator_value: str, locator_type: str) -> Optional[str]:
+        return self.attribute(locator_value, locator_type, "text")
+
+    def attribute(self, locator_value: str, locator_type: str, attribute: str) -> Optional[str]:
+        element = self.find(locator_value, locator_type)
+        return element.get(attribute) if element is not None else None
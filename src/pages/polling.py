@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from src.config.constants import LOCATOR_HISTORY_FILE
+
+
+class PollingStrategy(ABC):
+    """Yields the sleep intervals between element lookups."""
+
+    @abstractmethod
+    def intervals(self) -> Iterator[float]:
+        """Yield the seconds to sleep before each next lookup."""
+
+
+class FixedPolling(PollingStrategy):
+    """Poll at a constant interval, like WebDriverWait(poll_frequency=...)."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+
+    def intervals(self) -> Iterator[float]:
+        while True:
+            yield self.interval
+
+
+class ExponentialPolling(PollingStrategy):
+    """Poll quickly at first, then back off: fast elements are found within tens of milliseconds."""
+
+    def __init__(self, initial: float = 0.05, factor: float = 2.0, maximum: float = 0.5):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+
+    def intervals(self) -> Iterator[float]:
+        interval = self.initial
+        while True:
+            yield interval
+            interval = min(interval * self.factor, self.maximum)
+
+
+class LatencyHistory:
+    """Find latencies per locator from earlier runs, used to learn per-locator timeouts.
+
+    A locator with enough samples gets a timeout of `safety_factor` times its
+    slowest observed find, clamped between min_timeout and the caller's default.
+    """
+
+    def __init__(self, path: str = LOCATOR_HISTORY_FILE, max_samples: int = 50, min_samples: int = 3,
+                 safety_factor: float = 3.0, min_timeout: float = 2.0):
+        self.path = path
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self.safety_factor = safety_factor
+        self.min_timeout = min_timeout
+        self._samples: Dict[str, List[float]] = {}
+        self._new_samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as history_file:
+                self._samples = json.load(history_file)
+
+    @staticmethod
+    def key(locator_type: str, locator_value: str) -> str:
+        return f"{locator_type}:{locator_value}"
+
+    def record(self, key: str, seconds: float):
+        with self._lock:
+            for store in (self._samples, self._new_samples):
+                samples = store.setdefault(key, [])
+                samples.append(round(seconds, 4))
+                del samples[:-self.max_samples]
+
+    def timeout_for(self, key: str, default: float) -> float:
+        samples = self._samples.get(key, [])
+        if len(samples) < self.min_samples:
+            return default
+        return min(default, max(self.min_timeout, max(samples) * self.safety_factor))
+
+    def save(self):
+        """Merge this run's samples into the file, so parallel workers don't overwrite each other."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            merged = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as history_file:
+                    merged = json.load(history_file)
+            for key, samples in self._new_samples.items():
+                merged[key] = (merged.get(key, []) + samples)[-self.max_samples:]
+            with open(self.path, "w", encoding="utf-8") as history_file:
+                json.dump(merged, history_file, indent=1, sort_keys=True)
+            self._new_samples.clear()
+
+
+def wait_until(condition, timeout: float, strategy: PollingStrategy, message: str = "",
+               ignored_exceptions=(NoSuchElementException,)):
+    """Call condition() until it returns a truthy value, sleeping per the strategy; raise TimeoutException."""
+    deadline = time.monotonic() + timeout
+    intervals = strategy.intervals()
+    while True:
+        try:
+            value = condition()
+            if value:
+                return value
+        except ignored_exceptions:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(message)
+        time.sleep(min(next(intervals), remaining))
@@ -0,0 +1,126 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from src.locators.locator_compiler import escape, uiselector_for
+from src.utilities.custom_logger import CustomLogger
+
+logger = CustomLogger.get_logger(__name__)
+
+# System dialogs that commonly cover the app: (locator_value, locator_type). Only system ids: a generic
+# AlertDialog button (android:id/button1) would also confirm the app's own, possibly destructive, dialogs.
+KNOWN_POPUPS: List[Tuple[str, str]] = [
+    ("com.android.permissioncontroller:id/permission_allow_foreground_only_button", "id"),
+    ("com.android.permissioncontroller:id/permission_allow_button", "id"),
+    ("com.android.packageinstaller:id/permission_allow_button", "id"),  # Android 9 and older
+    ("android:id/aerr_wait", "id"),  # "App isn't responding" -> Wait
+]
+
+
+class RecoveryStep(ABC):
+    """One cheap attempt to make a missing element findable; returns the element or None."""
+
+    name = "recovery"
+
+    @abstractmethod
+    def attempt(self, page, locator_value: str, locator_type: str, timeout: float):
+        """Try to make the element findable and return it, or None."""
+
+
+class Refind(RecoveryStep):
+    """Drop cached handles and the page-source snapshot, then look again."""
+
+    name = "refind"
+
+    def attempt(self, page, locator_value, locator_type, timeout):
+        page.element_cache.invalidate((locator_type, locator_value))
+        page.invalidate_snapshot()
+        return _find(page, locator_value, locator_type, timeout)
+
+
+class ScrollIntoView(RecoveryStep):
+    """Let UiScrollable scroll the first scrollable container until the element is on screen."""
+
+    name = "scroll_into_view"
+
+    def attempt(self, page, locator_value, locator_type, timeout):
+        selector = _selector_for(locator_value, locator_type)
+        if selector is None:
+            return None
+        scroll = f"new UiScrollable(new UiSelector().scrollable(true)).scrollIntoView({selector})"
+        try:
+            element = page.driver.find_element(AppiumBy.ANDROID_UIAUTOMATOR, scroll)
+        except WebDriverException:
+            return None
+        page.screen_changed()
+        return element
+
+
+class DismissPopup(RecoveryStep):
+    """Close a known system dialog (permission prompt, ANR) covering the app, then look again."""
+
+    name = "dismiss_popup"
+
+    def __init__(self, popups: Sequence[Tuple[str, str]] = tuple(KNOWN_POPUPS)):
+        self.popups = list(popups)
+
+    def attempt(self, page, locator_value, locator_type, timeout):
+        for popup_value, popup_type in self.popups:
+            by, value = page.to_by(popup_value, popup_type)
+            buttons = page.driver.find_elements(by, value)
+            if buttons:
+                buttons[0].click()
+                page.screen_changed()
+                logger.warning("Dismissed popup %s while looking for %s: %s", popup_value, locator_type, locator_value)
+                return _find(page, locator_value, locator_type, timeout)
+        return None
+
+
+def _find(page, locator_value, locator_type, timeout):
+    try:
+        return page.wait_for_element(locator_value, locator_type, timeout=timeout)
+    except TimeoutException:
+        return None
+
+
+def _selector_for(locator_value: str, locator_type: str) -> Optional[str]:
+    """Express a BasePage locator as a UiSelector, or None for XPath and class-only lookups."""
+    if locator_type == "android_uiautomator":
+        return locator_value if locator_value.startswith("new UiSelector()") else None
+    if locator_type == "id":
+        return f'new UiSelector().resourceId("{escape(locator_value)}")'
+    if locator_type == "accessibility_id":
+        return f'new UiSelector().description("{escape(locator_value)}")'
+    if locator_type in ("text", "uiautomator_text", "uiautomator_desc", "uiautomator_class"):
+        return uiselector_for(locator_type, locator_value)
+    return None
+
+
+class StepRecovery:
+    """Runs recovery steps in order after a lookup times out, before the test is allowed to fail.
+
+    Each step gets `step_timeout` seconds; the first one that yields the
+    element wins. Lookups with timeout=0 and is_displayed checks, which
+    guards use to ask whether a screen is showing, are never recovered.
+    """
+
+    def __init__(self, steps: Optional[Sequence[RecoveryStep]] = None, step_timeout: float = 2.0):
+        self.steps = list(steps) if steps is not None else [Refind(), DismissPopup(), ScrollIntoView()]
+        self.step_timeout = step_timeout
+        self.recovered = {step.name: 0 for step in self.steps}
+
+    def recover(self, page, locator_value: str, locator_type: str):
+        for step in self.steps:
+            page.timings.add_retry()
+            try:
+                element = step.attempt(page, locator_value, locator_type, self.step_timeout)
+            except WebDriverException as e:
+                logger.debug("Recovery step %s failed: %s", step.name, e)
+                continue
+            if element is not None:
+                self.recovered[step.name] += 1
+                logger.warning("Recovered %s: %s with %s", locator_type, locator_value, step.name)
+                return element
+        return None
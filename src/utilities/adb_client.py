@@ -0,0 +1,328 @@
+# src/utilities/adb_client.py
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional
+
+from src.utilities.command_runner import CommandRunner
+
+logger = logging.getLogger(__name__)
+
+ADB_HOST = os.getenv("ADB_SERVER_HOST", "127.0.0.1")
+ADB_PORT = int(os.getenv("ANDROID_ADB_SERVER_PORT", "5037"))
+CONSOLE_TOKEN_FILE = Path.home() / ".emulator_console_auth_token"
+
+# Shell protocol v2 packet ids (adb/shell_protocol.h)
+SHELL_STDOUT, SHELL_STDERR, SHELL_EXIT = 1, 2, 3
+LEGACY_EXIT_MARKER = "__ADB_EXIT__"
+
+
+class AdbError(RuntimeError):
+    """The adb server (or an emulator console) refused a request."""
+
+
+class ShellResult(NamedTuple):
+    stdout: str
+    stderr: str
+    exit_code: int
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise AdbError(f"adb server closed the connection after {len(data)} of {size} bytes")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def _parse_devices(payload: str) -> Dict[str, str]:
+    devices = {}
+    for line in payload.splitlines():
+        if "\t" in line:
+            serial, state = line.split("\t", 1)
+            devices[serial] = state.strip()
+    return devices
+
+
+class AdbClient:
+    """Speaks the adb server protocol over TCP instead of spawning an `adb` process per query.
+
+    Every request is a short TCP exchange with the local adb server (which
+    closes one-shot service connections itself); device state comes from one
+    long-lived `host:track-devices` connection in a DeviceTracker. If the
+    server is not running it is started once with `adb start-server`, like
+    the adb CLI does.
+    """
+
+    def __init__(self, host: str = ADB_HOST, port: int = ADB_PORT, timeout: float = 10.0,
+                 runner: Optional[CommandRunner] = None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.runner = runner or CommandRunner()
+        self._tracker: Optional[DeviceTracker] = None
+        self._lock = threading.Lock()
+
+    def _connect(self, timeout: Optional[float]) -> socket.socket:
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except ConnectionRefusedError:
+            logger.info(f"No adb server on {self.host}:{self.port}, starting one")
+            self.runner.run(["adb", "start-server"], capture_output=True, text=True)
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(timeout)
+        return sock
+
+    @staticmethod
+    def _send(sock: socket.socket, request: str):
+        payload = request.encode("utf-8")
+        sock.sendall(b"%04x" % len(payload) + payload)
+        status = _recv_exactly(sock, 4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            raise AdbError(f"{request}: {AdbClient._read_message(sock)}")
+        raise AdbError(f"{request}: unexpected adb status {status!r}")
+
+    @staticmethod
+    def _read_message(sock: socket.socket) -> str:
+        length = int(_recv_exactly(sock, 4), 16)
+        return _recv_exactly(sock, length).decode("utf-8", "replace")
+
+    def _host_query(self, request: str) -> str:
+        with self._connect(self.timeout) as sock:
+            self._send(sock, request)
+            return self._read_message(sock)
+
+    def _transport(self, serial: Optional[str], timeout: Optional[float]) -> socket.socket:
+        sock = self._connect(timeout)
+        try:
+            self._send(sock, f"host:transport:{serial}" if serial else "host:transport-any")
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def version(self) -> int:
+        return int(self._host_query("host:version"), 16)
+
+    def devices(self) -> Dict[str, str]:
+        """Return {serial: state} for every device the server knows, e.g. {"emulator-5554": "device"}."""
+        return _parse_devices(self._host_query("host:devices"))
+
+    def track_devices(self) -> Iterator[Dict[str, str]]:
+        """Yield the full device list now and after every change, over one connection."""
+        with self._connect(None) as sock:
+            self._send(sock, "host:track-devices")
+            while True:
+                yield _parse_devices(self._read_message(sock))
+
+    def shell(self, serial: Optional[str], command: str, timeout: Optional[float] = None) -> ShellResult:
+        """Run a shell command on the device; raises TimeoutError if it outlives `timeout`."""
+        with self._transport(serial, timeout or self.timeout) as sock:
+            try:
+                self._send(sock, f"shell,v2,raw:{command}")
+            except AdbError:
+                return self._legacy_shell(serial, command, timeout)
+            stdout, stderr, exit_code = bytearray(), bytearray(), None
+            while exit_code is None:
+                header = sock.recv(5)
+                if not header:
+                    break
+                if len(header) < 5:
+                    header += _recv_exactly(sock, 5 - len(header))
+                packet_id, length = struct.unpack("<BI", header)
+                data = _recv_exactly(sock, length)
+                if packet_id == SHELL_STDOUT:
+                    stdout.extend(data)
+                elif packet_id == SHELL_STDERR:
+                    stderr.extend(data)
+                elif packet_id == SHELL_EXIT:
+                    exit_code = data[0]
+        return ShellResult(stdout.decode("utf-8", "replace"), stderr.decode("utf-8", "replace"),
+                           exit_code if exit_code is not None else -1)
+
+    def shell_stream(self, serial: Optional[str], command: str) -> "ShellStream":
+        """Start a long-running command (logcat, screenrecord) and return its stdout as a stream (shell v2 only)."""
+        sock = self._transport(serial, None)
+        try:
+            self._send(sock, f"shell,v2,raw:{command}")
+        except BaseException:
+            sock.close()
+            raise
+        return ShellStream(sock)
+
+    def _legacy_shell(self, serial: Optional[str], command: str, timeout: Optional[float]) -> ShellResult:
+        """Shell service of devices without shell v2: stderr is merged and the exit code echoed."""
+        with self._transport(serial, timeout or self.timeout) as sock:
+            self._send(sock, f"shell:{command}; echo {LEGACY_EXIT_MARKER}$?")
+            output = _recv_all(sock).decode("utf-8", "replace").replace("\r\n", "\n")
+        body, _, status = output.rstrip("\n").rpartition(LEGACY_EXIT_MARKER)
+        return ShellResult(body, "", int(status) if status.isdigit() else -1)
+
+    def getprop(self, serial: Optional[str], name: str) -> str:
+        return self.shell(serial, f"getprop {name}").stdout.strip()
+
+    def properties(self, serial: Optional[str]) -> Dict[str, str]:
+        """All system properties of the device in one round trip."""
+        properties = {}
+        for line in self.shell(serial, "getprop").stdout.splitlines():
+            if line.startswith("[") and "]: [" in line:
+                key, _, value = line[1:].partition("]: [")
+                properties[key] = value.rstrip("]")
+        return properties
+
+    def tracker(self) -> "DeviceTracker":
+        """The shared device tracker, started on first use."""
+        with self._lock:
+            if self._tracker is None or not self._tracker.is_alive():
+                self._tracker = DeviceTracker(self)
+                self._tracker.start()
+            return self._tracker
+
+    def wait_for_state(self, serial: str, state: str = "device", timeout: float = 60) -> float:
+        """Block until the tracker reports `serial` in `state`; return how long that took."""
+        return self.tracker().wait_for(serial, state, timeout)
+
+    def emu(self, serial: str, command: str, timeout: float = 10.0) -> str:
+        """Send a console command (e.g. "kill", "avd snapshot save golden") to an emulator."""
+        if not serial.startswith("emulator-"):
+            raise AdbError(f"{serial} is not an emulator")
+        port = int(serial.split("-", 1)[1])
+        with socket.create_connection(("127.0.0.1", port), timeout=timeout) as sock:
+            reader = sock.makefile("r", encoding="utf-8", newline="\n")
+            banner = self._read_console_reply(reader)
+            if "Authentication required" in banner:
+                token = CONSOLE_TOKEN_FILE.read_text().strip() if CONSOLE_TOKEN_FILE.exists() else ""
+                sock.sendall(f"auth {token}\r\n".encode())
+                self._read_console_reply(reader)
+            sock.sendall(f"{command}\r\n".encode())
+            return self._read_console_reply(reader, allow_eof=command == "kill")
+
+    @staticmethod
+    def _read_console_reply(reader, allow_eof: bool = False) -> str:
+        lines = []
+        for line in reader:
+            line = line.rstrip("\r\n")
+            if line.startswith("OK"):
+                return "\n".join(lines + [line])
+            if line.startswith("KO"):
+                raise AdbError(f"Emulator console: {line[3:].strip()}")
+            lines.append(line)
+        if allow_eof:
+            return "\n".join(lines)
+        raise AdbError("Emulator console closed the connection")
+
+    def kill_server(self):
+        with self._connect(self.timeout) as sock:
+            sock.sendall(b"0009host:kill")
+
+
+class ShellStream:
+    """stdout of a running shell v2 command, chunk by chunk as the device sends it.
+
+    Iteration ends when the command exits or the connection drops; close() may
+    be called from another thread to stop a reader blocked on the socket.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self.exit_code: Optional[int] = None
+
+    def __iter__(self) -> Iterator[bytes]:
+        while self.exit_code is None:
+            try:
+                packet_id, length = struct.unpack("<BI", _recv_exactly(self._sock, 5))
+                data = _recv_exactly(self._sock, length)
+            except (OSError, AdbError):
+                return
+            if packet_id == SHELL_STDOUT:
+                yield data
+            elif packet_id == SHELL_EXIT:
+                self.exit_code = data[0]
+
+    def close(self):
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+class DeviceTracker(threading.Thread):
+    """Keeps {serial: state} current from one host:track-devices stream, reconnecting if it drops."""
+
+    def __init__(self, client: AdbClient, reconnect_delay: float = 0.5):
+        super().__init__(name="adb-track-devices", daemon=True)
+        self.client = client
+        self.reconnect_delay = reconnect_delay
+        self.states: Dict[str, str] = {}
+        self.connected = False
+        self.updates = 0
+        self._changed = threading.Condition()
+        self._stopped = threading.Event()
+        self._sock: Optional[socket.socket] = None
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                with self.client._connect(None) as sock:
+                    self._sock = sock
+                    self.client._send(sock, "host:track-devices")
+                    while not self._stopped.is_set():
+                        devices = _parse_devices(self.client._read_message(sock))
+                        with self._changed:
+                            self.states, self.connected = devices, True
+                            self.updates += 1
+                            self._changed.notify_all()
+            except (OSError, AdbError) as e:
+                if not self._stopped.is_set():
+                    logger.debug(f"Device tracking interrupted: {e}")
+            with self._changed:
+                self.connected = False
+            self._stopped.wait(self.reconnect_delay)
+
+    def wait_for(self, serial: str, state: str = "device", timeout: float = 60) -> float:
+        started = time.monotonic()
+        with self._changed:
+            if not self._changed.wait_for(lambda: self.states.get(serial) == state, timeout):
+                raise TimeoutError(f"{serial} not in state {state!r} after {timeout}s "
+                                   f"(currently {self.states.get(serial, 'absent')!r})")
+        return time.monotonic() - started
+
+    def stop(self):
+        self._stopped.set()
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+_client: Optional[AdbClient] = None
+_client_lock = threading.Lock()
+
+
+def get_adb_client() -> AdbClient:
+    """Return the process-wide adb client, so every caller shares one device tracker."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = AdbClient()
+        return _client
@@ -0,0 +1,116 @@
+# src/utilities/apk_cache.py
+import hashlib
+import logging
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.utilities.adb_client import AdbClient, get_adb_client
+from src.utilities.command_runner import CommandRunner
+
+logger = logging.getLogger(__name__)
+
+# Hash the installed base.apk (the host APK; config splits added by the store are ignored): "<sha256>  <path>"
+INSTALLED_DIGEST = 'p=$(pm path {package} | grep /base.apk$) && sha256sum "${{p#package:}}"'
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as apk:
+        for chunk in iter(lambda: apk.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ApkInstaller:
+    """Installs the app under test only on devices that do not already have this exact build.
+
+    The host APK is hashed once per (path, size, mtime). Each device is asked
+    for the sha256 of the installed base.apk, so a build installed by an
+    earlier run (or another worker) is recognised too. Verified devices are
+    remembered for the rest of the process.
+    """
+
+    def __init__(self, runner: Optional[CommandRunner] = None, max_workers: int = 4, timeout: float = 180,
+                 adb: Optional[AdbClient] = None):
+        self.runner = runner or CommandRunner()  # adb install; queries go through the adb server protocol
+        self.adb = adb or get_adb_client()
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.installs = 0
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._verified: Dict[Tuple[str, str], str] = {}  # (udid, package) -> digest known to be installed
+        self._device_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def apk_digest(self, apk_path: str) -> str:
+        stat = os.stat(apk_path)
+        key = (os.path.realpath(apk_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if key not in self._digests:
+                self._digests[key] = _sha256_file(apk_path)
+            return self._digests[key]
+
+    def _adb(self, udid: Optional[str], *args: str, timeout: Optional[float] = 30) -> subprocess.CompletedProcess:
+        target = ["-s", udid] if udid else []
+        return self.runner.run(["adb", *target, *args], capture_output=True, text=True, timeout=timeout)
+
+    def installed_digest(self, udid: Optional[str], package: str) -> Optional[str]:
+        """Return the sha256 of the package's base.apk on the device, or None if it is not installed."""
+        result = self.adb.shell(udid, INSTALLED_DIGEST.format(package=package), timeout=30)
+        fields = result.stdout.split()
+        if result.exit_code != 0 or not fields or len(fields[0]) != 64:
+            return None
+        return fields[0].lower()
+
+    def ensure_installed(self, udid: Optional[str], apk_path: str, package: str) -> bool:
+        """Make sure the device runs this APK; return True if it had to be installed."""
+        digest = self.apk_digest(apk_path)
+        with self._lock:
+            device_lock = self._device_locks.setdefault(udid or "", threading.Lock())
+        with device_lock:
+            if self._verified.get((udid, package)) == digest:
+                return False
+            installed = self.installed_digest(udid, package)
+            if installed == digest:
+                logger.info(f"{package} on {udid or 'default device'} already matches {os.path.basename(apk_path)}")
+                self._verified[(udid, package)] = digest
+                return False
+            logger.info(f"Installing {os.path.basename(apk_path)} on {udid or 'default device'} "
+                        f"(installed: {installed[:12] if installed else 'none'}, wanted: {digest[:12]})")
+            result = self._adb(udid, "install", "-r", "-t", apk_path, timeout=self.timeout)
+            if result.returncode != 0 or "Success" not in result.stdout:
+                raise RuntimeError(f"Installing {apk_path} on {udid} failed: {(result.stderr or result.stdout).strip()}")
+            self._verified[(udid, package)] = digest
+            with self._lock:
+                self.installs += 1
+            return True
+
+    def ensure_installed_on(self, udids: Iterable[Optional[str]], apk_path: str, package: str) -> Dict[str, bool]:
+        """ensure_installed on several devices at once; returns {udid: installed now}."""
+        udids = list(udids)
+        self.apk_digest(apk_path)  # Hash once before fanning out
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(udids)))) as executor:
+            futures = {udid: executor.submit(self.ensure_installed, udid, apk_path, package) for udid in udids}
+            return {udid: future.result() for udid, future in futures.items()}
+
+    def forget(self, udid: Optional[str] = None):
+        """Drop remembered verifications (all devices, or one), e.g. after the app was uninstalled."""
+        with self._lock:
+            self._verified = {key: digest for key, digest in self._verified.items()
+                              if udid is not None and key[0] != udid}
+
+
+_installer: Optional[ApkInstaller] = None
+_installer_lock = threading.Lock()
+
+
+def get_apk_installer() -> ApkInstaller:
+    """Return the process-wide installer so hashes and verified devices are shared by every Driver."""
+    global _installer
+    with _installer_lock:
+        if _installer is None:
+            _installer = ApkInstaller()
+        return _installer
@@ -0,0 +1,13 @@
+# src/utilities/command_runner.py
+import subprocess
+from typing import List
+
+
+class CommandRunner:
+    """Thin subprocess wrapper so emulator/adb calls can be replaced in tests."""
+
+    def run(self, cmd: List[str], **kwargs) -> subprocess.CompletedProcess:
+        return subprocess.run(cmd, **kwargs)
+
+    def popen(self, cmd: List[str], **kwargs) -> subprocess.Popen:
+        return subprocess.Popen(cmd, **kwargs)
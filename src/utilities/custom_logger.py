@@ -1,15 +1,79 @@
 # src/utilities/custom_logger.py
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 import allure
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler with a bounded buffer and an overflow policy.
+
+    Records are enqueued unformatted; the message is built on the writer thread.
+    overflow is "drop_oldest", "drop_new" or "block".
+    """
+
+    OVERFLOW_POLICIES = ("drop_oldest", "drop_new", "block")
+
+    def __init__(self, log_queue, overflow="drop_oldest"):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy: {overflow}. Available: {self.OVERFLOW_POLICIES}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Skip QueueHandler's eager formatting; the listener formats on its own thread
+        return record
+
+    def enqueue(self, record):
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.overflow == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: the record's `event` dict, or its message when it has none."""
+
+    def format(self, record):
+        event = getattr(record, "event", None)
+        if event is None:
+            event = {"message": record.getMessage(), "logger": record.name, "level": record.levelname}
+        return json.dumps(event, separators=(",", ":"), default=str)
+
+
 class CustomLogger:
     # Default log directory
     LOG_DIR = Path("./logs")
     DEFAULT_LOG_FILE = LOG_DIR / "appium_framework.log"
 
+    # Async mode: one queue handler in front of every logger, one writer thread behind all of them
+    _queue_handler = None
+    _listener = None
+    _managed_loggers = []
+    _async_lock = threading.Lock()
+
     @staticmethod
     def ensure_log_directory():
         """Ensure the log directory exists."""
@@ -36,11 +100,14 @@ class CustomLogger:
         if logger.handlers:
             return logger
 
+        CustomLogger._managed_loggers.append(logger)
+        if CustomLogger._queue_handler is not None:
+            logger.addHandler(CustomLogger._queue_handler)
+            logger.propagate = False
+            return logger
+
         # Formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
 
         # Console handler
         console_handler = logging.StreamHandler()
@@ -64,22 +131,43 @@ class CustomLogger:
 
         return logger
 
+    @staticmethod
+    def get_event_logger(filename, name="appium_framework.events"):
+        """
+        Configure and return a logger that writes structured events as JSON lines.
+
+        Log with `logger.info("", extra={"event": {...}})`. The file is started
+        fresh; a later call with another filename moves the logger there.
+        """
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        filename = os.path.abspath(filename)
+        for handler in list(logger.handlers):
+            if getattr(handler, "baseFilename", None) == filename:
+                return logger
+            logger.removeHandler(handler)
+            handler.close()
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        handler = logging.FileHandler(filename, mode="w", encoding="utf-8")
+        handler.setFormatter(JsonLinesFormatter())
+        logger.addHandler(handler)
+        return logger
+
     @staticmethod
     def set_level(logger, level):
         """Set the logging level for an existing logger."""
         logger.setLevel(level)
         for handler in logger.handlers:
-            handler.setLevel(level)
+            if handler is not CustomLogger._queue_handler:  # Shared by every logger in async mode
+                handler.setLevel(level)
 
     @staticmethod
     def add_file_handler(logger, filename=None, level=logging.DEBUG, max_bytes=10485760, backup_count=5):
         """Add a file handler to an existing logger."""
         CustomLogger.ensure_log_directory()
         filename = filename or CustomLogger.DEFAULT_LOG_FILE
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
         file_handler = RotatingFileHandler(
             filename=filename,
             maxBytes=max_bytes,
@@ -89,6 +177,74 @@ class CustomLogger:
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
 
+    @staticmethod
+    def enable_async(max_queue_size=10000, overflow="drop_oldest", log_to_file=True, max_bytes=10485760,
+                     backup_count=5):
+        """
+        Switch every CustomLogger logger to queue-based, non-blocking logging.
+
+        Loggers created before the call are re-wired too. A single background
+        thread writes to the console and the rotating log file.
+
+        Args:
+            max_queue_size: Records buffered before the overflow policy applies (default: 10000)
+            overflow: "drop_oldest", "drop_new" or "block" when the buffer is full
+        """
+        with CustomLogger._async_lock:
+            if CustomLogger._queue_handler is not None:
+                return CustomLogger._queue_handler
+            formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+            handlers = [logging.StreamHandler()]
+            if log_to_file:
+                CustomLogger.ensure_log_directory()
+                file_handler = RotatingFileHandler(
+                    filename=CustomLogger.DEFAULT_LOG_FILE, maxBytes=max_bytes, backupCount=backup_count
+                )
+                file_handler.setLevel(logging.DEBUG)
+                handlers.append(file_handler)
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            queue_handler = BoundedQueueHandler(queue.Queue(max_queue_size), overflow)
+            CustomLogger._listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+            CustomLogger._listener.start()
+            for logger in CustomLogger._managed_loggers:
+                for handler in list(logger.handlers):
+                    logger.removeHandler(handler)
+                    handler.close()
+                logger.addHandler(queue_handler)
+            CustomLogger._queue_handler = queue_handler
+            atexit.register(CustomLogger.disable_async)
+            return queue_handler
+
+    @staticmethod
+    def flush():
+        """Block until every queued record has been written (call at session end)."""
+        queue_handler = CustomLogger._queue_handler
+        if queue_handler is None:
+            return
+        queue_handler.queue.join()
+        for handler in CustomLogger._listener.handlers:
+            handler.flush()
+        if queue_handler.dropped:
+            logging.getLogger(__name__).warning(f"Async logging dropped {queue_handler.dropped} record(s)")
+
+    @staticmethod
+    def disable_async():
+        """Flush and stop the writer thread; loggers go back to direct handlers."""
+        with CustomLogger._async_lock:
+            queue_handler, listener = CustomLogger._queue_handler, CustomLogger._listener
+            if queue_handler is None:
+                return
+            CustomLogger._queue_handler = CustomLogger._listener = None
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+            loggers = list(CustomLogger._managed_loggers)
+            CustomLogger._managed_loggers.clear()
+        for logger in loggers:
+            logger.removeHandler(queue_handler)
+            CustomLogger.get_logger(logger.name, level=logger.level)
+
     def allureLogs(text):
         with allure.step(text):
-            pass
\ No newline at end of file
+            pass
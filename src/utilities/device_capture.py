@@ -0,0 +1,263 @@
+# src/utilities/device_capture.py
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Optional, Tuple
+
+from src.utilities.adb_client import AdbClient, get_adb_client
+
+logger = logging.getLogger(__name__)
+
+LOGCAT_COMMAND = "logcat -v threadtime -b main,system,crash -T 1"
+SCREENRECORD_COMMAND = "screenrecord --output-format=h264 --bit-rate {bit_rate} -"
+LOGCAT_BUFFER_BYTES = int(os.getenv("CAPTURE_LOGCAT_BYTES", str(4 << 20)))
+VIDEO_BUFFER_BYTES = int(os.getenv("CAPTURE_VIDEO_BYTES", str(32 << 20)))
+VIDEO_BIT_RATE = int(os.getenv("CAPTURE_VIDEO_BIT_RATE", "2000000"))
+WINDOW_BEFORE = float(os.getenv("CAPTURE_WINDOW_BEFORE", "5"))  # Seconds kept before the test started
+WINDOW_AFTER = float(os.getenv("CAPTURE_WINDOW_AFTER", "1"))  # Seconds of trailing output awaited after a failure
+
+# H.264 NAL unit types (ITU-T H.264 table 7-1)
+NAL_IDR, NAL_SPS, NAL_PPS = 5, 7, 8
+
+
+class RingBuffer:
+    """Timestamped chunks, oldest dropped first once the total exceeds max_bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.dropped = 0
+        self._chunks: Deque[Tuple[float, bytes]] = deque()
+        self._lock = threading.Lock()
+
+    def append(self, data: bytes, timestamp: Optional[float] = None):
+        if not data:
+            return
+        with self._lock:
+            self._chunks.append((time.monotonic() if timestamp is None else timestamp, data))
+            self.size += len(data)
+            while self.size > self.max_bytes and len(self._chunks) > 1:
+                _, dropped = self._chunks.popleft()
+                self.size -= len(dropped)
+                self.dropped += len(dropped)
+
+    def since(self, timestamp: float) -> bytes:
+        """Everything received at or after timestamp (monotonic clock)."""
+        with self._lock:
+            return b"".join(data for received, data in self._chunks if received >= timestamp)
+
+    def discard(self, before: float):
+        """Drop chunks received before timestamp; a passed test's window is not needed any more."""
+        with self._lock:
+            while self._chunks and self._chunks[0][0] < before:
+                _, dropped = self._chunks.popleft()
+                self.size -= len(dropped)
+
+
+class H264Ring(RingBuffer):
+    """Ring of whole H.264 GOPs, so any window starts at a keyframe and decodes on its own.
+
+    The SPS/PPS sent before the first keyframe is kept aside and prepended to
+    every window; chunks are split at IDR frames (or at an SPS right before one).
+    """
+
+    def __init__(self, max_bytes: int):
+        super().__init__(max_bytes)
+        self.header = b""
+        self._gop = bytearray()
+        self._gop_started = 0.0
+        self._scanned = 0
+        self._previous_nal: Optional[int] = None
+        self._seen_idr = False
+
+    def reset_stream(self):
+        """A new encoder session starts (screenrecord restarted); its header replaces the old one."""
+        self._close_gop(time.monotonic())
+        self.header = b""
+        self._gop.clear()
+        self._scanned = 0
+        self._previous_nal = None
+        self._seen_idr = False
+
+    def feed(self, data: bytes, timestamp: Optional[float] = None):
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        if not self._gop:
+            self._gop_started = timestamp
+        self._gop.extend(data)
+        position = self._scanned
+        while True:
+            start = self._gop.find(b"\x00\x00\x01", position)
+            if start < 0 or start + 3 >= len(self._gop):
+                self._scanned = max(0, len(self._gop) - 3) if start < 0 else start
+                return
+            nal_type = self._gop[start + 3] & 0x1F
+            begins_gop = nal_type == NAL_SPS or (nal_type == NAL_IDR
+                                                 and self._previous_nal not in (NAL_SPS, NAL_PPS))
+            if begins_gop and start > 0:
+                cut = start - 1 if self._gop[start - 1] == 0 else start  # 4-byte start code
+                if cut > 0:
+                    self._emit(bytes(self._gop[:cut]), timestamp)
+                    del self._gop[:cut]
+                    start -= cut
+            if nal_type == NAL_IDR and not self._seen_idr:
+                cut = start - 1 if start and self._gop[start - 1] == 0 else start
+                self.header = bytes(self._gop[:cut])  # SPS/PPS; kept out of the ring
+                del self._gop[:cut]
+                start -= cut
+                self._seen_idr = True
+            self._previous_nal = nal_type
+            position = start + 3
+
+    def _emit(self, gop: bytes, timestamp: float):
+        if self._seen_idr:  # Anything before the first keyframe cannot be decoded
+            self.append(gop, self._gop_started)
+        self._gop_started = timestamp
+
+    def _close_gop(self, timestamp: float):
+        if self._gop:
+            self._emit(bytes(self._gop), timestamp)
+            self._gop.clear()
+
+    def since(self, timestamp: float) -> bytes:
+        pending = bytes(self._gop) if self._seen_idr else b""
+        with self._lock:
+            chunks = [data for received, data in self._chunks if received >= timestamp]
+            if chunks or not pending or self._gop_started > timestamp:
+                # Start with the GOP that was playing at `timestamp`
+                chunks[:0] = [data for received, data in self._chunks if received < timestamp][-1:]
+        body = b"".join(chunks) + pending
+        return self.header + body if body else b""
+
+
+def to_mp4(h264: bytes, timeout: float = 30) -> Optional[bytes]:
+    """Remux a raw H.264 stream into MP4 with ffmpeg (no re-encode); None when ffmpeg is unavailable."""
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg or not h264:
+        return None
+    try:
+        result = subprocess.run([ffmpeg, "-loglevel", "error", "-f", "h264", "-i", "pipe:0", "-c", "copy",
+                                 "-movflags", "frag_keyframe+empty_moov", "-f", "mp4", "pipe:1"],
+                                input=h264, capture_output=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"ffmpeg remux failed: {e}")
+        return None
+    return result.stdout if result.returncode == 0 and result.stdout else None
+
+
+class CaptureWindow(NamedTuple):
+    logcat: bytes
+    video: bytes  # Raw H.264, starting at a keyframe; empty without video capture
+
+
+class _StreamReader(threading.Thread):
+    """Keeps one adb shell stream running into a sink, restarting it when it ends."""
+
+    def __init__(self, adb: AdbClient, udid: str, command: str, sink, on_restart=None, retry_delay: float = 1.0):
+        super().__init__(name=f"capture-{udid}-{command.split()[0]}", daemon=True)
+        self.adb = adb
+        self.udid = udid
+        self.command = command
+        self.sink = sink
+        self.on_restart = on_restart
+        self.retry_delay = retry_delay
+        self.restarts = 0
+        self._stream = None
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                self._stream = self.adb.shell_stream(self.udid, self.command)
+                if self.on_restart is not None:
+                    self.on_restart()
+                for chunk in self._stream:
+                    self.sink(chunk)
+            except Exception as e:
+                if not self._stopped.is_set():
+                    logger.debug(f"{self.command.split()[0]} stream of {self.udid} interrupted: {e}")
+            finally:
+                if self._stream is not None:
+                    self._stream.close()
+            self.restarts += 1
+            self._stopped.wait(self.retry_delay)
+
+    def stop(self):
+        self._stopped.set()
+        if self._stream is not None:
+            self._stream.close()
+
+
+class DeviceCapture:
+    """Streams logcat (and optionally screenrecord) of one device into bounded in-memory rings.
+
+    Nothing is written to disk while tests pass: `window(since)` returns the
+    logs and video received after a point in time, `discard(before)` frees
+    what a passed test no longer needs.
+    """
+
+    def __init__(self, udid: str, adb: Optional[AdbClient] = None, video: bool = False,
+                 logcat_bytes: int = LOGCAT_BUFFER_BYTES, video_bytes: int = VIDEO_BUFFER_BYTES,
+                 bit_rate: int = VIDEO_BIT_RATE):
+        self.udid = udid
+        self.adb = adb or get_adb_client()
+        self.logcat = RingBuffer(logcat_bytes)
+        self.video = H264Ring(video_bytes) if video else None
+        self._partial_line = b""
+        self._readers = [_StreamReader(self.adb, udid, LOGCAT_COMMAND, self._on_logcat)]
+        if self.video is not None:
+            self._readers.append(_StreamReader(self.adb, udid, SCREENRECORD_COMMAND.format(bit_rate=bit_rate),
+                                               self.video.feed, on_restart=self.video.reset_stream))
+
+    def _on_logcat(self, chunk: bytes):
+        # Store whole lines only, so a window never starts mid-line
+        data = self._partial_line + chunk
+        complete, newline, self._partial_line = data.rpartition(b"\n")
+        if newline:
+            self.logcat.append(complete + newline)
+
+    def start(self) -> "DeviceCapture":
+        for reader in self._readers:
+            reader.start()
+        logger.info(f"Capturing logcat{' and video' if self.video else ''} of {self.udid}")
+        return self
+
+    def window(self, since: float) -> CaptureWindow:
+        return CaptureWindow(self.logcat.since(since), self.video.since(since) if self.video else b"")
+
+    def discard(self, before: float):
+        self.logcat.discard(before)
+        if self.video is not None:
+            self.video.discard(before)
+
+    def stop(self):
+        for reader in self._readers:
+            reader.stop()
+
+
+class CaptureManager:
+    """One DeviceCapture per device for the whole session, started on first use."""
+
+    def __init__(self, video: bool = False, adb: Optional[AdbClient] = None):
+        self.video = video
+        self.adb = adb
+        self._captures: Dict[str, DeviceCapture] = {}
+        self._lock = threading.Lock()
+
+    def capture_for(self, udid: str) -> DeviceCapture:
+        with self._lock:
+            if udid not in self._captures:
+                self._captures[udid] = DeviceCapture(udid, self.adb, self.video).start()
+            return self._captures[udid]
+
+    def get(self, udid: Optional[str]) -> Optional[DeviceCapture]:
+        return self._captures.get(udid)
+
+    def stop(self):
+        with self._lock:
+            captures, self._captures = list(self._captures.values()), {}
+        for capture in captures:
+            capture.stop()
@@ -0,0 +1,444 @@
+# src/utilities/device_daemon.py
+"""Long-lived owner of a local emulator pool that hands devices out as leases over HTTP.
+
+Start it once and leave it running; pytest sessions then lease a booted
+device in milliseconds instead of cold-booting (and killing) an emulator:
+    python -m src.utilities.device_daemon serve --avd Emulator-5556 --count 2
+    python -m src.utilities.device_daemon status
+    python -m src.utilities.device_daemon stop
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import requests
+
+from src.config.constants import APP_PACKAGE
+from src.utilities.adb_client import AdbClient, AdbError, get_adb_client
+from src.utilities.emulator_manager import GOLDEN_SNAPSHOT, EmulatorManager
+from src.utilities.readiness import wait_for_device
+
+logger = logging.getLogger(__name__)
+
+DAEMON_URL = os.getenv("DEVICE_DAEMON_URL", "http://127.0.0.1:7100")
+LEASE_TTL = float(os.getenv("DEVICE_LEASE_TTL", "120"))  # A lease not renewed for this long is reclaimed
+RESET_MODES = ("clear", "snapshot", "none")
+
+
+class PooledDevice:
+    """One device of the pool and the lease currently holding it."""
+
+    def __init__(self, udid: str, avd: Optional[str] = None):
+        self.udid = udid
+        self.avd = avd
+        self.state = "idle"  # "idle", "leased", "resetting" or "broken"
+        self.lease: Optional[str] = None
+        self.owner: Optional[str] = None
+        self.expires = 0.0
+        self.leases = 0
+        self.last_reset: Optional[float] = None
+
+    def as_dict(self) -> dict:
+        return {"udid": self.udid, "avd": self.avd, "state": self.state, "owner": self.owner,
+                "leases": self.leases, "last_reset": self.last_reset}
+
+
+class DevicePool:
+    """Leases devices one at a time and resets each one before it is handed out again.
+
+    `reset` is "clear" (`pm clear` of the app under test: fast, the APK stays
+    installed), "snapshot" (restore the emulator's golden quick-boot
+    snapshot; falls back to clear on devices without one) or "none".
+    """
+
+    def __init__(self, adb: Optional[AdbClient] = None, reset: str = "clear", app_package: str = APP_PACKAGE,
+                 lease_ttl: float = LEASE_TTL, reset_timeout: float = 120):
+        if reset not in RESET_MODES:
+            raise ValueError(f"Invalid reset mode: {reset}. Available: {list(RESET_MODES)}")
+        self.adb = adb or get_adb_client()
+        self.reset = reset
+        self.app_package = app_package
+        self.lease_ttl = lease_ttl
+        self.reset_timeout = reset_timeout
+        self.devices: Dict[str, PooledDevice] = {}
+        self._leases: Dict[str, PooledDevice] = {}
+        self._changed = threading.Condition()
+        self._resets = ThreadPoolExecutor(max_workers=4, thread_name_prefix="device-reset")
+
+    def add(self, udid: str, avd: Optional[str] = None):
+        with self._changed:
+            self.devices.setdefault(udid, PooledDevice(udid, avd))
+            self._changed.notify_all()
+        logger.info(f"Device {udid} joined the pool")
+
+    def acquire(self, owner: str, wait: float = 0, ttl: Optional[float] = None,
+                avd: Optional[str] = None) -> Optional[dict]:
+        """Lease an idle device (of `avd`, if given), waiting up to `wait` seconds; None when none freed up."""
+        deadline = time.monotonic() + wait
+        with self._changed:
+            while True:
+                self._reclaim_expired()
+                device = next((device for device in self.devices.values()
+                               if device.state == "idle" and avd in (None, device.avd)), None)
+                if device is not None:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._changed.wait(min(remaining, 1.0))  # Wake up now and then to reclaim expired leases
+            device.state, device.owner, device.lease = "leased", owner, uuid.uuid4().hex
+            device.expires = time.monotonic() + (ttl or self.lease_ttl)
+            device.leases += 1
+            self._leases[device.lease] = device
+            lease = {"lease": device.lease, "udid": device.udid, "avd": device.avd, "ttl": ttl or self.lease_ttl}
+        logger.info(f"Leased {device.udid} to {owner}")
+        return lease
+
+    def renew(self, lease_id: str, ttl: Optional[float] = None) -> bool:
+        with self._changed:
+            device = self._leases.get(lease_id)
+            if device is None:
+                return False
+            device.expires = time.monotonic() + (ttl or self.lease_ttl)
+            return True
+
+    def release(self, lease_id: str, reset: bool = True) -> bool:
+        """End a lease; the device is reset in the background and becomes idle afterwards."""
+        with self._changed:
+            device = self._leases.pop(lease_id, None)
+            if device is None:
+                return False
+            self._end_lease(device, reset)
+        return True
+
+    def _end_lease(self, device: PooledDevice, reset: bool):
+        logger.info(f"Lease of {device.udid} by {device.owner} ended")
+        device.lease = device.owner = None
+        if reset and self.reset != "none":
+            device.state = "resetting"
+            self._resets.submit(self._reset, device)
+        else:
+            device.state = "idle"
+            self._changed.notify_all()
+
+    def _reclaim_expired(self):
+        """Return devices whose holder stopped renewing (e.g. a killed pytest run); call with the lock held."""
+        now = time.monotonic()
+        for lease_id, device in list(self._leases.items()):
+            if device.expires < now:
+                logger.warning(f"Lease of {device.udid} by {device.owner} expired; reclaiming the device")
+                del self._leases[lease_id]
+                self._end_lease(device, reset=True)
+
+    def _reset(self, device: PooledDevice):
+        started = time.monotonic()
+        state = "idle"
+        try:
+            if self.reset == "snapshot" and device.udid.startswith("emulator-"):
+                try:
+                    self.adb.emu(device.udid, f"avd snapshot load {GOLDEN_SNAPSHOT}", timeout=self.reset_timeout)
+                    wait_for_device(device.udid, timeout=self.reset_timeout, adb=self.adb)
+                except AdbError as e:  # No golden snapshot on this AVD
+                    logger.warning(f"Snapshot restore of {device.udid} failed ({e}), clearing app data instead")
+                    self._clear_app(device.udid)
+            else:
+                self._clear_app(device.udid)
+        except (OSError, RuntimeError) as e:
+            logger.error(f"Reset of {device.udid} failed, taking it out of the pool: {e}")
+            state = "broken"
+        device.last_reset = round(time.monotonic() - started, 3)
+        with self._changed:
+            device.state = state
+            self._changed.notify_all()
+
+    def _clear_app(self, udid: str):
+        result = self.adb.shell(udid, f"pm clear {self.app_package}", timeout=self.reset_timeout)
+        # An app that is not installed yet has no data to clear
+        output = f"{result.stdout}{result.stderr}".strip()
+        if result.exit_code != 0 and "Unknown package" not in output:
+            raise AdbError(f"pm clear {self.app_package} on {udid} failed: {output}")
+
+    def status(self) -> List[dict]:
+        with self._changed:
+            self._reclaim_expired()
+            return [device.as_dict() for device in self.devices.values()]
+
+    def close(self):
+        self._resets.shutdown(wait=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+        status, value = self.server.daemon.handle(method, self.path, body)
+        payload = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    daemon: "DeviceDaemon"
+
+
+class DeviceDaemon:
+    """Owns the emulators and serves the lease API.
+
+    Devices already attached to adb are adopted; the rest of `count` are
+    booted from `avd_names` with the golden snapshot (saved on the first cold
+    boot). Booting runs in the background, so leases are served as soon as the
+    first device is ready. Only emulators the daemon booted are killed on stop.
+    """
+
+    def __init__(self, avd_names: Optional[List[str]] = None, count: int = 0, host: str = "127.0.0.1",
+                 port: int = 7100, pool: Optional[DevicePool] = None, manager: Optional[EmulatorManager] = None,
+                 adopt: bool = True, boot_timeout: float = 180):
+        self.avd_names = list(avd_names or [])
+        self.count = count
+        self.host = host
+        self.port = port
+        self.pool = pool or DevicePool()
+        self.manager = manager
+        self.adopt = adopt
+        self.boot_timeout = boot_timeout
+        self._httpd: Optional[_Server] = None
+        self._stopped = threading.Event()
+        self._routes = [
+            ("GET", r"/status", lambda body: (200, {"ready": True, "devices": len(self.pool.devices)})),
+            ("GET", r"/devices", lambda body: (200, self.pool.status())),
+            ("POST", r"/leases", self._acquire),
+            ("POST", r"/leases/(?P<lease>[0-9a-f]+)/renew", self._renew),
+            ("DELETE", r"/leases/(?P<lease>[0-9a-f]+)", self._release),
+            ("POST", r"/shutdown", self._shutdown),
+        ]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "DeviceDaemon":
+        if self.adopt:
+            for udid, state in self.pool.adb.devices().items():
+                if state == "device":
+                    self.pool.add(udid, self._avd_name(udid))
+        missing = self.count - len(self.pool.devices)
+        if missing > 0:
+            if not self.avd_names:
+                raise ValueError(f"{missing} more device(s) needed but no AVD names were given")
+            threading.Thread(target=self._boot, args=(missing,), name="device-daemon-boot", daemon=True).start()
+        self._httpd = _Server((self.host, self.port), _Handler)
+        self._httpd.daemon = self
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, name="device-daemon", daemon=True).start()
+        logger.info(f"Device daemon listening on {self.url}")
+        return self
+
+    def _boot(self, count: int):
+        self.manager = self.manager or EmulatorManager(adb=self.pool.adb)
+        try:
+            # Devices arrive in the order they finish booting, so each one carries its AVD name
+            for udid, _, avd in self.manager.start_many(self.avd_names, count, snapshot=True,
+                                                        timeout=self.boot_timeout):
+                self.pool.add(udid, avd)
+        except RuntimeError as e:
+            logger.error(f"Device daemon could not boot every emulator: {e}")
+
+    def _avd_name(self, udid: str) -> Optional[str]:
+        """AVD name of an adopted emulator (`emu avd name`), or None for a physical device."""
+        if not udid.startswith("emulator-"):
+            return None
+        try:
+            reply = self.pool.adb.emu(udid, "avd name")
+        except (OSError, AdbError) as e:
+            logger.warning(f"Could not read the AVD name of {udid}: {e}")
+            return None
+        return next((line.strip() for line in reply.splitlines() if line.strip() and line.strip() != "OK"), None)
+
+    def serve_forever(self):
+        try:
+            while not self._stopped.wait(1):
+                pass
+        except KeyboardInterrupt:
+            pass
+        self.stop()
+
+    def stop(self):
+        self._stopped.set()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        self.pool.close()
+        if self.manager is not None:
+            self.manager.stop_all_emulators()
+
+    def handle(self, method: str, path: str, body: dict):
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        for route_method, pattern, handler in self._routes:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                return handler(body, **match.groupdict())
+        return 404, {"error": "unknown command", "message": f"{method} {path}"}
+
+    def _acquire(self, body):
+        lease = self.pool.acquire(body.get("owner") or "anonymous", float(body.get("wait", 0)), body.get("ttl"),
+                                  body.get("avd"))
+        if lease is None:
+            return 503, {"error": "no device", "message": f"No idle device within {body.get('wait', 0)}s"}
+        return 200, lease
+
+    def _renew(self, body, lease):
+        if not self.pool.renew(lease, body.get("ttl")):
+            return 404, {"error": "unknown lease", "message": f"Lease {lease} expired or was released"}
+        return 200, True
+
+    def _release(self, body, lease):
+        if not self.pool.release(lease, reset=body.get("reset", True)):
+            return 404, {"error": "unknown lease", "message": f"Lease {lease} expired or was released"}
+        return 200, True
+
+    def _shutdown(self, body):
+        self._stopped.set()  # serve_forever stops the server once this response is sent
+        return 200, True
+
+
+class DeviceLease:
+    """A leased device; a heartbeat thread renews the lease until it is released."""
+
+    def __init__(self, client: "DeviceDaemonClient", lease_id: str, udid: str, ttl: float):
+        self.client = client
+        self.lease_id = lease_id
+        self.udid = udid
+        self.ttl = ttl
+        self._released = threading.Event()
+        self._heartbeat = threading.Thread(target=self._renew_until_released, name=f"lease-{udid}", daemon=True)
+
+    def start_heartbeat(self) -> "DeviceLease":
+        self._heartbeat.start()
+        return self
+
+    def _renew_until_released(self):
+        while not self._released.wait(self.ttl / 3):
+            try:
+                if not self.client.renew(self.lease_id):
+                    logger.error(f"Lease of {self.udid} was lost; the daemon may hand the device out again")
+                    return
+            except requests.RequestException as e:
+                logger.warning(f"Could not renew the lease of {self.udid}: {e}")
+
+    def release(self, reset: bool = True):
+        if self._released.is_set():
+            return
+        self._released.set()
+        try:
+            self.client.release(self.lease_id, reset)
+        except requests.RequestException as e:
+            logger.warning(f"Could not release {self.udid}; the daemon reclaims it when the lease expires: {e}")
+
+
+class DeviceDaemonClient:
+    """HTTP client of the device daemon."""
+
+    def __init__(self, url: str = DAEMON_URL, connect_timeout: float = 1.0, read_timeout: float = 10.0):
+        self.url = url.rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.session = requests.Session()
+
+    def _call(self, method: str, path: str, body: Optional[dict] = None, read_timeout: Optional[float] = None):
+        response = self.session.request(method, f"{self.url}{path}", json=body,
+                                         timeout=(self.connect_timeout, read_timeout or self.read_timeout))
+        value = response.json().get("value")
+        if response.status_code == 404 and path.startswith("/leases/"):
+            return None
+        if response.status_code != 200:
+            raise RuntimeError(f"Device daemon: {value.get('message') if isinstance(value, dict) else value}")
+        return value
+
+    def is_available(self) -> bool:
+        try:
+            return bool(self._call("GET", "/status", read_timeout=2.0).get("ready"))
+        except (requests.RequestException, RuntimeError, ValueError):
+            return False
+
+    def acquire(self, owner: str, wait: float = 300, ttl: float = LEASE_TTL, avd: Optional[str] = None) -> DeviceLease:
+        """Lease a device, waiting up to `wait` seconds for one; raises RuntimeError when none frees up."""
+        value = self._call("POST", "/leases", {"owner": owner, "wait": wait, "ttl": ttl, "avd": avd},
+                           read_timeout=wait + self.read_timeout)
+        return DeviceLease(self, value["lease"], value["udid"], value["ttl"])
+
+    def renew(self, lease_id: str) -> bool:
+        return bool(self._call("POST", f"/leases/{lease_id}/renew", {}))
+
+    def release(self, lease_id: str, reset: bool = True):
+        self._call("DELETE", f"/leases/{lease_id}", {"reset": reset})
+
+    def devices(self) -> List[dict]:
+        return self._call("GET", "/devices")
+
+    def shutdown(self):
+        self._call("POST", "/shutdown", {})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DAEMON_URL, help="Daemon address (default: DEVICE_DAEMON_URL)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Run the daemon in the foreground")
+    serve.add_argument("--avd", action="append", default=[], help="AVD to boot (repeat for several)")
+    serve.add_argument("--count", type=int, default=1, help="Devices to keep in the pool")
+    serve.add_argument("--reset", choices=RESET_MODES, default=os.getenv("DEVICE_RESET", "clear"),
+                       help="How a device is cleaned between leases")
+    serve.add_argument("--no-adopt", action="store_true", help="Do not pool devices that are already attached")
+    commands.add_parser("status", help="List the pooled devices and their leases")
+    commands.add_parser("stop", help="Stop the daemon and the emulators it booted")
+    args = parser.parse_args(argv)
+    client = DeviceDaemonClient(args.url)
+    if args.command == "status":
+        if not client.is_available():
+            print(f"No device daemon at {args.url}")
+            return 1
+        for device in client.devices():
+            print(f"{device['udid']:<16} {device['state']:<9} {device['owner'] or '-'} ({device['leases']} leases)")
+        return 0
+    if args.command == "stop":
+        client.shutdown()
+        return 0
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    host, _, port = args.url.split("://", 1)[-1].partition(":")
+    daemon = DeviceDaemon(args.avd or [os.getenv("AVD_NAME", "Emulator-5556")], args.count, host, int(port or 7100),
+                          DevicePool(reset=args.reset), adopt=not args.no_adopt)
+    daemon.start().serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
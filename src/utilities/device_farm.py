@@ -0,0 +1,147 @@
+# src/utilities/device_farm.py
+import heapq
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import pytest
+
+from src.utilities.adb_client import AdbClient, get_adb_client
+
+logger = logging.getLogger(__name__)
+
+DURATIONS_CACHE_KEY = "device_farm/durations"
+ORDERED_UNIT = "<ordered>"
+SHARD_KEY = pytest.StashKey[int]()
+
+
+def discover_devices(adb: Optional[AdbClient] = None) -> List[str]:
+    """Return the serials of every device the adb server reports in the 'device' state."""
+    devices = (adb or get_adb_client()).devices()
+    return sorted(serial for serial, state in devices.items() if state == "device")
+
+
+def base_nodeid(nodeid: str) -> str:
+    """Strip the "@device-N" suffix xdist's loadgroup adds to the nodeids of a farm run."""
+    base, _, group = nodeid.rpartition("@")
+    return base if group.startswith("device-") else nodeid
+
+
+def lpt_schedule(weights: Dict[str, float], bins: int) -> Dict[str, int]:
+    """Assign weighted units to bins, longest processing time first.
+
+    Each unit goes to the currently least loaded bin; ties are broken by unit
+    name so every xdist worker computes the same assignment.
+    """
+    if bins < 1:
+        raise ValueError(f"Need at least one bin, got {bins}")
+    loads = [(0.0, index) for index in range(bins)]
+    assignment = {}
+    for unit, weight in sorted(weights.items(), key=lambda entry: (-entry[1], entry[0])):
+        load, index = heapq.heappop(loads)
+        assignment[unit] = index
+        heapq.heappush(loads, (load + weight, index))
+    return assignment
+
+
+class DurationStore:
+    """Per-test durations from earlier runs, kept in the pytest cache."""
+
+    def __init__(self, cache, default: float = 5.0):
+        self.cache = cache
+        self.default = default
+        self.durations: Dict[str, float] = dict(cache.get(DURATIONS_CACHE_KEY, {})) if cache else {}
+        self._current: Dict[str, float] = defaultdict(float)
+
+    def estimate(self, nodeid: str) -> float:
+        """Return the recorded duration, or the median of known tests when there is none."""
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        if not self.durations:
+            return self.default
+        known = sorted(self.durations.values())
+        return known[len(known) // 2]
+
+    def record(self, nodeid: str, seconds: float):
+        """Add the duration of one phase (setup/call/teardown) of a test."""
+        self._current[nodeid] += seconds
+
+    def save(self):
+        if self.cache is None or not self._current:
+            return
+        self.durations.update(self._current)
+        self.cache.set(DURATIONS_CACHE_KEY, self.durations)
+        logger.info(f"Saved durations for {len(self._current)} test(s)")
+
+
+def _unit_node(item) -> pytest.Item:
+    """Return the node whose tests must stay together: the class, or the module for plain functions."""
+    return item.getparent(pytest.Class) or item.getparent(pytest.Module)
+
+
+class DeviceFarmPlugin:
+    """Shard test classes across connected devices by historical duration.
+
+    Classes are bin-packed onto devices with LPT scheduling and tagged with an
+    xdist_group per device, so `--dist loadgroup` keeps each device on one worker.
+    All classes that use pytest.mark.order form a single unit on one device.
+    Flaky tests weigh more, since their reruns are likely to cost device time.
+    """
+
+    def __init__(self, devices: List[str], store: DurationStore, flake_scores=None):
+        if not devices:
+            raise RuntimeError("Device farm mode needs at least one connected device")
+        self.devices = devices
+        self.store = store
+        self.flake_scores = flake_scores
+        self.shard_by_node: Dict[str, int] = {}
+
+    def _weight(self, nodeid: str) -> float:
+        """Expected device time of a test: recorded duration plus its likely reruns."""
+        flake_score = self.flake_scores.score(nodeid) if self.flake_scores is not None else 0.0
+        return self.store.estimate(nodeid) * (1 + flake_score)
+
+    def device_for(self, node) -> str:
+        """Return the device assigned to a test item or one of its parent collectors."""
+        while node is not None:
+            if node.nodeid in self.shard_by_node:
+                return self.devices[self.shard_by_node[node.nodeid]]
+            node = node.parent
+        return self.devices[0]
+
+    def pytest_configure(self, config):
+        if getattr(config.option, "numprocesses", None) and getattr(config.option, "dist", None) != "loadgroup":
+            logger.warning("Device farm sharding needs '--dist loadgroup' to pin each device to one worker")
+
+    @pytest.hookimpl(tryfirst=True)  # xdist reads xdist_group marks in its own modifyitems hook
+    def pytest_collection_modifyitems(self, config, items):
+        ordered = {_unit_node(item).nodeid for item in items if item.get_closest_marker("order")}
+        units: Dict[str, List[pytest.Item]] = defaultdict(list)
+        unit_of: Dict[str, str] = {}
+        for item in items:
+            node_id = _unit_node(item).nodeid
+            key = ORDERED_UNIT if node_id in ordered else node_id
+            units[key].append(item)
+            unit_of[node_id] = key
+        weights = {key: sum(self._weight(item.nodeid) for item in members) for key, members in units.items()}
+        assignment = lpt_schedule(weights, len(self.devices))
+        for node_id, key in unit_of.items():
+            self.shard_by_node[node_id] = assignment[key]
+        for key, members in units.items():
+            shard = assignment[key]
+            for item in members:
+                item.stash[SHARD_KEY] = shard
+                self.shard_by_node[item.nodeid] = shard
+                item.add_marker(pytest.mark.xdist_group(name=f"device-{shard}"))
+        loads = defaultdict(float)
+        for key, shard in assignment.items():
+            loads[shard] += weights[key]
+        for shard, device in enumerate(self.devices):
+            logger.info(f"Device {device}: estimated {loads[shard]:.1f}s of tests")
+
+    def pytest_runtest_logreport(self, report):
+        self.store.record(base_nodeid(report.nodeid), report.duration)
+
+    def pytest_sessionfinish(self, session):
+        if not hasattr(session.config, "workerinput"):  # Only the controller sees every report
+            self.store.save()
@@ -4,20 +4,40 @@ import subprocess
 import time
 import logging
 import socket
-from typing import List, Optional, Tuple
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from src.utilities.adb_client import AdbClient, AdbError, get_adb_client
+from src.utilities.command_runner import CommandRunner
+from src.utilities.port_allocator import PORT_RANGES, PortAllocator, get_port_allocator
+from src.utilities.readiness import ReadinessError, wait_for_device
 
 logger = logging.getLogger(__name__)
 
+# Console ports the emulator accepts; each instance also takes port + 1 for adb.
+CONSOLE_PORT_RANGE = PORT_RANGES["console"]
+GOLDEN_SNAPSHOT = "golden"
+
+
 class EmulatorManager:
-    def __init__(self):
+    def __init__(self, runner: Optional[CommandRunner] = None, avd_home: Optional[str] = None,
+                 ports: Optional[PortAllocator] = None, adb: Optional[AdbClient] = None):
         self.emulators: List[str] = []
         self.fixed_system_ports = [5554, 5556]  # Fixed ports for emulators
         self.processes = []  # Track emulator processes
+        self.runner = runner or CommandRunner()
+        self.adb = adb or get_adb_client()  # adb server protocol; the adb binary only starts the server
+        self.ports = ports or get_port_allocator()
+        self.avd_home = Path(avd_home or os.getenv("ANDROID_AVD_HOME", Path.home() / ".android" / "avd"))
+        self._allocated_ports: set = set()
+        self._lock = threading.Lock()
 
     def _check_avd_exists(self, avd_name: str) -> bool:
         """Check if the specified AVD exists."""
         try:
-            result = subprocess.run(
+            result = self.runner.run(
                 ["emulator", "-list-avds"], capture_output=True, text=True
             )
             available_avds = result.stdout.splitlines()
@@ -38,14 +58,14 @@ class EmulatorManager:
             except socket.error as e:
                 logger.warning(f"Port {port} is already in use, attempting to free it: {str(e)}")
                 try:
-                    result = subprocess.run(
+                    result = self.runner.run(
                         ["lsof", "-i", f":{port}"], capture_output=True, text=True
                     )
                     if result.stdout:
                         lines = result.stdout.splitlines()
                         for line in lines[1:]:  # Skip header
                             pid = line.split()[1]  # Extract PID
-                            subprocess.run(["kill", "-9", pid], check=True)
+                            self.runner.run(["kill", "-9", pid], check=True)
                             logger.info(f"Killed process {pid} using port {port}")
                     # Retry binding after killing
                     time.sleep(1)  # Give the system a moment to release the port
@@ -59,14 +79,14 @@ class EmulatorManager:
         """Restart the ADB server safely."""
         try:
             # Stop the ADB server
-            subprocess.run(["adb", "kill-server"], check=True)
+            self.adb.kill_server()
             logger.info("Stopped ADB server")
-        except subprocess.CalledProcessError as e:
+        except (OSError, AdbError) as e:
             logger.warning(f"Failed to stop ADB server (might not be running): {str(e)}")
 
         try:
             # Start the ADB server
-            result = subprocess.run(
+            result = self.runner.run(
                 ["adb", "start-server"], capture_output=True, text=True, check=True
             )
             logger.info("Started ADB server")
@@ -104,7 +124,7 @@ class EmulatorManager:
         ]
         try:
             # Start emulator without waiting for output
-            process = subprocess.Popen(
+            process = self.runner.popen(
                 cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
             )
             logger.info(f"Started emulator {avd_name} on system port {system_port} with PID {process.pid}")
@@ -113,34 +133,22 @@ class EmulatorManager:
             self.emulators.append(udid)
 
             # Wait for emulator to boot and verify it’s connected via ADB
-            start_time = time.time()
             timeout = 180  # Timeout of 180 seconds
-            max_attempts = 3  # Retry ADB detection up to 3 times
-            attempt = 0
-            while time.time() - start_time < timeout and attempt < max_attempts:
-                cmd = f"adb devices | grep {udid}"
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-                if udid in result.stdout:
-                    # Additional check: ensure the device is fully booted
-                    boot_check = subprocess.run(
-                        f"adb -s {udid} shell getprop sys.boot_completed",
-                        shell=True, capture_output=True, text=True
-                    )
-                    if boot_check.stdout.strip() == "1":
-                        logger.info(f"Emulator {udid} detected by ADB and fully booted")
-                        break
-                    logger.debug(f"Emulator {udid} detected by ADB but not fully booted yet")
-                else:
-                    attempt += 1
-                    logger.debug(f"Emulator {udid} not detected by ADB (attempt {attempt}/{max_attempts})")
-                    if attempt < max_attempts:
-                        # Restart ADB server to resolve detection issues
-                        if not self._restart_adb_server():
-                            logger.warning("ADB server restart failed, continuing anyway")
-                        time.sleep(5)  # Wait for ADB to stabilize
-                time.sleep(5)
+            max_attempts = 3  # Restart the ADB server between attempts to resolve detection issues
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    wait_for_device(udid, timeout=timeout / max_attempts, runner=self.runner,
+                                    abort=lambda: process.poll() is not None, adb=self.adb)
+                    logger.info(f"Emulator {udid} detected by ADB and fully booted")
+                    break
+                except ReadinessError as e:
+                    logger.debug(f"Emulator {udid} not ready (attempt {attempt}/{max_attempts}): {str(e)}")
+                    if attempt < max_attempts and process.poll() is None and not self._restart_adb_server():
+                        logger.warning("ADB server restart failed, continuing anyway")
             else:
                 # Log emulator output for debugging
+                if process.poll() is None:
+                    process.terminate()
                 stdout, stderr = process.communicate(timeout=10)
                 logger.error(f"Emulator stdout: {stdout}")
                 logger.error(f"Emulator stderr: {stderr}")
@@ -154,13 +162,138 @@ class EmulatorManager:
         """Stop all running emulators."""
         for udid in self.emulators:
             try:
-                subprocess.run(["adb", "-s", udid, "emu", "kill"], check=True)
+                self.adb.emu(udid, "kill")
                 logger.info(f"Stopped emulator {udid}")
-            except subprocess.CalledProcessError as e:
+            except (OSError, AdbError) as e:
                 logger.error(f"Failed to stop emulator {udid}: {str(e)}")
         # Terminate any tracked processes
         for process in self.processes:
             if process.poll() is None:  # Process is still running
                 process.terminate()
                 process.wait(timeout=5)
-                logger.info(f"Terminated emulator process with PID {process.pid}")
\ No newline at end of file
+                logger.info(f"Terminated emulator process with PID {process.pid}")
+        with self._lock:
+            ports, self._allocated_ports = self._allocated_ports, set()
+        for port in ports:
+            self.ports.release(port)
+
+    def allocate_console_port(self) -> int:
+        """Reserve a free even console port (and its adb port) through the cross-process allocator."""
+        port = self.ports.allocate("console", owner="emulator")
+        with self._lock:
+            self._allocated_ports.add(port)
+        return port
+
+    def release_console_port(self, port: int):
+        with self._lock:
+            self._allocated_ports.discard(port)
+        self.ports.release(port)
+
+    def has_snapshot(self, avd_name: str, snapshot_name: str = GOLDEN_SNAPSHOT) -> bool:
+        """Check whether the AVD already has the named quick-boot snapshot on disk."""
+        return (self.avd_home / f"{avd_name}.avd" / "snapshots" / snapshot_name).is_dir()
+
+    def _emulator_command(self, avd_name: str, port: int, snapshot: bool, read_only: bool) -> List[str]:
+        cmd = ["emulator", "-avd", avd_name, "-port", str(port), "-no-audio", "-no-boot-anim",
+               "-gpu", "swiftshader_indirect"]
+        if snapshot and self.has_snapshot(avd_name):
+            cmd += ["-snapshot", GOLDEN_SNAPSHOT, "-no-snapshot-save"]
+        elif snapshot:
+            cmd += ["-no-snapshot-load"]  # Cold boot once, then save the golden snapshot
+        else:
+            cmd += ["-no-snapshot", "-wipe-data"]
+        if read_only:
+            cmd.append("-read-only")
+        return cmd
+
+    def _boot_one(self, avd_name: str, snapshot: bool, read_only: bool, timeout: float) -> Tuple[str, int]:
+        port = self.allocate_console_port()
+        udid = f"emulator-{port}"
+        save_golden = snapshot and not self.has_snapshot(avd_name)
+        cmd = self._emulator_command(avd_name, port, snapshot, read_only)
+        process = self.runner.popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with self._lock:
+            self.processes.append(process)
+            self.emulators.append(udid)
+        logger.info(f"Booting emulator {avd_name} as {udid} with PID {process.pid}")
+        try:
+            wait_for_device(udid, timeout=timeout, runner=self.runner, abort=lambda: process.poll() is not None,
+                            adb=self.adb)
+        except ReadinessError:
+            if process.poll() is None:
+                process.terminate()
+            self.release_console_port(port)
+            raise RuntimeError(f"Emulator {udid} ({avd_name}) failed to boot within {timeout} seconds, "
+                               f"exit code {process.returncode}")
+        if save_golden and not read_only:
+            try:
+                self.adb.emu(udid, f"avd snapshot save {GOLDEN_SNAPSHOT}", timeout=120)
+                logger.info(f"Saved golden snapshot for {avd_name}")
+            except (OSError, AdbError) as e:
+                logger.warning(f"Could not save golden snapshot for {avd_name}: {e}")
+        logger.info(f"Emulator {udid} ({avd_name}) is ready")
+        return udid, port
+
+    def _seed_golden(self, avd_name: str, timeout: float):
+        """Cold boot one writable instance to save the golden snapshot, then shut it down.
+
+        Read-only instances never write snapshots, and the emulator refuses to
+        start them while a writable instance holds the AVD.
+        """
+        udid, port = self._boot_one(avd_name, snapshot=True, read_only=False, timeout=timeout)
+        with self._lock:
+            index = self.emulators.index(udid)
+            self.emulators.pop(index)
+            process = self.processes.pop(index)
+        try:
+            self.adb.emu(udid, "kill")
+        except (OSError, AdbError) as e:
+            logger.warning(f"Failed to stop seed emulator {udid}: {e}")
+        if process.poll() is None:
+            try:
+                process.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                process.terminate()
+                process.wait(timeout=5)
+        self.release_console_port(port)
+        logger.info(f"Seed emulator {udid} for {avd_name} stopped")
+
+    def start_many(self, avd_names: List[str], count: Optional[int] = None, snapshot: bool = False,
+                   timeout: float = 180) -> Iterator[Tuple[str, int, str]]:
+        """Boot `count` emulators concurrently and yield (udid, console_port, avd_name) as each becomes ready.
+
+        AVDs are assigned round-robin from avd_names; an AVD used by more than one
+        instance is started with -read-only. With snapshot=True each AVD restores
+        the golden snapshot, which is saved on the first cold boot if missing; for
+        a shared AVD that boot is a writable seed instance, stopped once the
+        snapshot is saved, before its read-only instances start from it.
+        """
+        if not avd_names:
+            raise ValueError("At least one AVD name is required")
+        count = count or len(avd_names)
+        plan = [avd_names[i % len(avd_names)] for i in range(count)]
+        shared = {avd for avd in plan if plan.count(avd) > 1}
+        seeding = {avd for avd in shared if snapshot and not self.has_snapshot(avd)}
+        failures = []
+        with ThreadPoolExecutor(max_workers=count, thread_name_prefix="emulator-boot") as executor:
+            futures = {executor.submit(self._seed_golden, avd, timeout): (avd, "seed") for avd in seeding}
+            futures.update({executor.submit(self._boot_one, avd, snapshot, avd in shared, timeout): (avd, "boot")
+                            for avd in plan if avd not in seeding})
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    avd, kind = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to start emulator {avd}: {str(e)}")
+                        if kind == "boot":
+                            failures.append(e)
+                    else:
+                        if kind == "boot":
+                            yield (*result, avd)
+                    if kind == "seed":  # Without a saved snapshot the instances still cold boot read-only
+                        futures.update({executor.submit(self._boot_one, avd, snapshot, True, timeout): (avd, "boot")
+                                        for _ in range(plan.count(avd))})
+        if failures:
+            raise RuntimeError(f"{len(failures)} of {count} emulators failed to boot: {failures[0]}")
@@ -0,0 +1,189 @@
+# src/utilities/events.py
+"""Structured run events (JSON lines) and their export to Chrome Trace / Perfetto format.
+
+Export a run from the repository root:
+    python -m src.utilities.events                      # newest run in logs/events
+    python -m src.utilities.events logs/events/<run> -o trace.json
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from src.config.constants import EVENT_LOG_DIR
+from src.utilities.custom_logger import CustomLogger
+
+logger = logging.getLogger(__name__)
+
+
+class EventRecorder:
+    """Writes one JSON line per driver phase, page action, wait, screenshot and test.
+
+    Every event carries the worker, device and test it belongs to, the
+    monotonic start time `ts` and duration `dur` in seconds, and the wall-clock
+    `wall` start used to line up files from different processes. Nothing is
+    written until `configure` points the recorder at a file.
+    """
+
+    def __init__(self):
+        self.context: Dict[str, Optional[str]] = {"worker": None, "device": None, "test": None}
+        self.path: Optional[str] = None
+        self._logger: Optional[logging.Logger] = None
+        self._pid = os.getpid()
+
+    @property
+    def enabled(self) -> bool:
+        return self._logger is not None
+
+    def configure(self, directory: str, worker: str):
+        """Start writing <directory>/<worker>.jsonl."""
+        self.path = os.path.join(directory, f"{worker}.jsonl")
+        self.context["worker"] = worker
+        self._logger = CustomLogger.get_event_logger(self.path)
+
+    def disable(self):
+        if self._logger is not None:
+            for handler in list(self._logger.handlers):
+                self._logger.removeHandler(handler)
+                handler.close()
+        self._logger = None
+
+    def set_context(self, **values: Optional[str]):
+        self.context.update(values)
+
+    def emit(self, kind: str, name: str, start: float, duration: Optional[float] = None, **args):
+        """Record an event that started at `start` (time.monotonic()) and lasted `duration` seconds."""
+        event_logger = self._logger
+        if event_logger is None:
+            return
+        event = {"ts": round(start, 6), "wall": round(time.time() - (time.monotonic() - start), 6), "kind": kind,
+                 "name": name, **self.context, "pid": self._pid, "thread": threading.current_thread().name}
+        if duration is not None:
+            event["dur"] = round(duration, 6)
+        if args:
+            event["args"] = {key: value for key, value in args.items() if value is not None}
+        event_logger.info(name, extra={"event": event})
+
+    @contextmanager
+    def span(self, kind: str, name: str, **args) -> Iterator[Dict[str, object]]:
+        """Time the block as one event; values put into the yielded dict are added to its args."""
+        if self._logger is None:
+            yield args
+            return
+        started = time.monotonic()
+        try:
+            yield args
+        except BaseException:
+            args.setdefault("outcome", "failed")
+            raise
+        finally:
+            self.emit(kind, name, started, time.monotonic() - started, **args)
+
+
+_recorder = EventRecorder()
+
+
+def get_event_recorder() -> EventRecorder:
+    """Return the process-wide event recorder."""
+    return _recorder
+
+
+def read_events(directory: str) -> List[dict]:
+    """Load every worker's events of one run, on a common clock (`ts` shifted by each file's wall offset)."""
+    events = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.jsonl"))):
+        with open(path, encoding="utf-8") as event_file:
+            file_events = [json.loads(line) for line in event_file if line.strip()]
+        if not file_events:
+            continue
+        # Monotonic clocks are per host; the wall clock ties files together, the monotonic one orders within
+        offset = min(event["wall"] - event["ts"] for event in file_events)
+        for event in file_events:
+            event["ts"] += offset
+        events.extend(file_events)
+    events.sort(key=lambda event: event["ts"])
+    return events
+
+
+def to_chrome_trace(events: List[dict]) -> dict:
+    """Chrome Trace Event Format: one process row per device, one thread row per worker."""
+    if not events:
+        return {"traceEvents": [], "displayTimeUnit": "ms"}
+    origin = events[0]["ts"]
+    devices: Dict[str, int] = {}
+    workers: Dict[tuple, int] = {}
+    trace = []
+    for event in events:
+        device = event.get("device") or "host"
+        worker = f"{event.get('worker') or 'master'} {event.get('thread') or ''}".strip()
+        pid = devices.setdefault(device, len(devices) + 1)
+        tid = workers.setdefault((pid, worker), len(workers) + 1)
+        args = dict(event.get("args") or {}, test=event.get("test"))
+        entry = {"name": event["name"], "cat": event["kind"], "pid": pid, "tid": tid,
+                 "ts": round((event["ts"] - origin) * 1e6, 1), "args": args}
+        if "dur" in event:
+            entry.update(ph="X", dur=round(event["dur"] * 1e6, 1))
+        else:
+            entry.update(ph="i", s="t")
+        trace.append(entry)
+    for device, pid in devices.items():
+        trace.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": device}})
+    for (pid, worker), tid in workers.items():
+        trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": worker}})
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def export_trace(directory: str, output: Optional[str] = None) -> Optional[str]:
+    """Write the run in `directory` as a Chrome trace (default <directory>/trace.json); None if it is empty."""
+    events = read_events(directory)
+    if not events:
+        return None
+    output = output or os.path.join(directory, "trace.json")
+    with open(output, "w", encoding="utf-8") as trace_file:
+        json.dump(to_chrome_trace(events), trace_file, separators=(",", ":"))
+    logger.info(f"Trace of {len(events)} events written to {output} (open in ui.perfetto.dev or chrome://tracing)")
+    return output
+
+
+def prune_runs(root: str = EVENT_LOG_DIR, keep: int = 10) -> List[str]:
+    """Delete all but the newest `keep` run directories; returns the removed ones."""
+    runs = sorted((path for path in glob.glob(os.path.join(root, "*")) if os.path.isdir(path)),
+                  key=os.path.getmtime, reverse=True)
+    removed = []
+    for run in runs[keep:]:
+        try:
+            shutil.rmtree(run)
+            removed.append(run)
+        except OSError as e:
+            logger.warning(f"Could not remove old event log {run}: {e}")
+    return removed
+
+
+def latest_run(root: str = EVENT_LOG_DIR) -> Optional[str]:
+    runs = [path for path in glob.glob(os.path.join(root, "*")) if os.path.isdir(path)]
+    return max(runs, key=os.path.getmtime) if runs else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("run", nargs="?", help="Run directory with <worker>.jsonl files (default: newest run)")
+    parser.add_argument("-o", "--output", help="Trace file to write (default: <run>/trace.json)")
+    args = parser.parse_args(argv)
+    run = args.run or latest_run()
+    if run is None:
+        print(f"No runs in {EVENT_LOG_DIR}")
+        return 1
+    output = export_trace(run, args.output)
+    print(output or f"No events in {run}")
+    return 0 if output else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# src/utilities/flaky.py
+import logging
+import time
+from typing import Dict, Optional
+
+import pytest
+from _pytest.runner import call_and_report, show_test_item
+
+from src.utilities.device_farm import base_nodeid
+
+logger = logging.getLogger(__name__)
+
+FLAKE_CACHE_KEY = "flaky/scores"
+
+
+class FlakeStore:
+    """Per-test flake scores from earlier runs, kept in the pytest cache.
+
+    The score is an exponential moving average of "failed, then passed on
+    rerun": 0 for a test that always passes first time, towards 1 for one
+    that routinely needs a rerun. Tests that fail every attempt are not
+    counted as flaky.
+    """
+
+    def __init__(self, cache, alpha: float = 0.3):
+        self.cache = cache
+        self.alpha = alpha
+        self.scores: Dict[str, float] = dict(cache.get(FLAKE_CACHE_KEY, {})) if cache else {}
+        self._updated = False
+
+    def score(self, nodeid: str) -> float:
+        return self.scores.get(nodeid, 0.0)
+
+    def record(self, nodeid: str, flaked: bool):
+        previous = self.scores.get(nodeid, 0.0)
+        self.scores[nodeid] = round((1 - self.alpha) * previous + self.alpha * (1.0 if flaked else 0.0), 4)
+        self._updated = True
+
+    def save(self):
+        if self.cache is None or not self._updated:
+            return
+        self.cache.set(FLAKE_CACHE_KEY, self.scores)
+        flaky = sum(1 for score in self.scores.values() if score >= 0.1)
+        logger.info(f"Saved flake scores for {len(self.scores)} test(s), {flaky} flaky")
+
+
+class RerunPlugin:
+    """Reruns a failed test on the same warm session, within per-test and per-worker budgets.
+
+    Only failures in the test body are rerun; setup errors mean the session
+    itself is broken and rerunning on it would not help. Between attempts only
+    function-scoped fixtures are torn down, so class and session fixtures (the
+    driver) stay alive. Attempts back off exponentially from `delay`.
+    """
+
+    def __init__(self, reruns: int = 1, budget: int = 10, delay: float = 1.0, store: Optional[FlakeStore] = None):
+        self.reruns = reruns
+        self.budget = budget
+        self.delay = delay
+        self.store = store
+        self.reruns_used = 0
+        self._rerun_nodeids = set()
+
+    def _reruns_for(self, item) -> int:
+        marker = item.get_closest_marker("flaky")
+        if marker is not None:
+            return int(marker.kwargs.get("reruns", marker.args[0] if marker.args else self.reruns))
+        return self.reruns
+
+    def pytest_configure(self, config):
+        config.addinivalue_line("markers", "flaky(reruns=N): rerun this test up to N times on failure")
+
+    @staticmethod
+    def _run_once(item, nextitem, can_rerun: bool):
+        """runtestprotocol, except that teardown keeps the class alive when a rerun will follow."""
+        if hasattr(item, "_request") and not item._request:
+            item._initrequest()
+        reports = [call_and_report(item, "setup", log=False)]
+        if reports[0].passed:
+            if item.config.getoption("setupshow", False):
+                show_test_item(item)
+            if not item.config.getoption("setuponly", False):
+                reports.append(call_and_report(item, "call", log=False))
+        rerun = can_rerun and any(report.when == "call" and report.failed for report in reports)
+        if item.session.shouldfail or item.session.shouldstop:
+            rerun, nextitem = False, None
+        # Tearing down towards the parent only finalizes function-scoped fixtures
+        reports.append(call_and_report(item, "teardown", log=False, nextitem=item.parent if rerun else nextitem))
+        if hasattr(item, "_request"):
+            item._request = False
+            item.funcargs = None
+        return reports, rerun
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        allowed = self._reruns_for(item)
+        if allowed <= 0:
+            return None
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        attempt = 0
+        while True:
+            reports, rerun = self._run_once(item, nextitem, attempt < allowed and self.reruns_used < self.budget)
+            if not rerun:
+                break
+            for report in reports:
+                if report.when == "call":
+                    report.outcome = "rerun"
+                item.ihook.pytest_runtest_logreport(report=report)
+            attempt += 1
+            self.reruns_used += 1
+            wait = self.delay * 2 ** (attempt - 1)
+            logger.warning(f"Rerunning {item.nodeid} (attempt {attempt + 1}/{allowed + 1}) in {wait:.1f}s, "
+                           f"{self.budget - self.reruns_used} rerun(s) left in budget")
+            time.sleep(wait)
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    def pytest_report_teststatus(self, report):
+        if report.outcome == "rerun":
+            return "rerun", "R", ("RERUN", {"yellow": True})
+        return None
+
+    def pytest_runtest_logreport(self, report):
+        # Runs on the xdist controller too, so flake scores see every worker's reports
+        if report.outcome == "rerun":
+            self._rerun_nodeids.add(report.nodeid)
+        elif report.when == "call" and self.store is not None:
+            if report.passed:
+                # Keyed like DeviceFarmPlugin._weight looks them up: without the @device-N suffix
+                self.store.record(base_nodeid(report.nodeid), report.nodeid in self._rerun_nodeids)
+            self._rerun_nodeids.discard(report.nodeid)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        reruns = terminalreporter.stats.get("rerun", [])
+        if reruns:
+            terminalreporter.write_line(f"{len(reruns)} rerun(s) of {len({r.nodeid for r in reruns})} test(s)")
+
+    def pytest_sessionfinish(self, session):
+        if self.store is not None and not hasattr(session.config, "workerinput"):
+            self.store.save()
@@ -0,0 +1,492 @@
+# src/utilities/impact.py
+import ast
+import hashlib
+import logging
+import os
+import re
+import subprocess
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+IMPACT_CACHE_KEY = "impact/dependency_map"
+ANALYSIS_VERSION = 2
+# The framework core: a change here (or in anything these import from src/) can affect every test
+CORE_FILES = ("src/pages/base_page.py", "src/drivers/driver_class.py", "tests/conftest.py")
+FULL_SUITE_FILES = ("requirements.txt", "pytest.ini", "setup.cfg", "tox.ini", "pyproject.toml")
+FINE_GRAINED_DIRS = ("src/pages/", "src/locators/")
+DEVICE_TEST_FILE = re.compile(r"^tests/test_[^/]+\.py$")
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def _module_path(module: str) -> str:
+    return module.replace(".", "/") + ".py"
+
+
+def _constructed_class(call: ast.AST) -> Optional[str]:
+    """The class a call builds: Page(driver), or pages.get(Page) through the page registry."""
+    if not isinstance(call, ast.Call):
+        return None
+    if isinstance(call.func, ast.Name):
+        return call.func.id
+    if isinstance(call.func, ast.Attribute) and call.args and isinstance(call.args[0], ast.Name):
+        return call.args[0].id
+    return None
+
+
+def _function_refs(node: ast.AST) -> Tuple[List[List[str]], List[str]]:
+    """Return the page-object references made inside a function, and its parameter names.
+
+    A reference is [kind, base, member]: kind "self" for self.base.member and
+    "name" for base.member, where base is a module-level name or a local
+    variable bound to one (`page = LoginPage(driver)`).
+    """
+    local_classes: Dict[str, str] = {}
+    for child in ast.walk(node):
+        if isinstance(child, ast.Assign) and _constructed_class(child.value):
+            for target in child.targets:
+                if isinstance(target, ast.Name):
+                    local_classes[target.id] = _constructed_class(child.value)
+    # self.x = Locators.X only binds the locator; it counts where self.x is read, not here
+    bindings = {id(child.value) for child in ast.walk(node)
+                if isinstance(child, ast.Assign) and isinstance(child.value, ast.Attribute)
+                and all(isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                        and target.value.id == "self" for target in child.targets)}
+    refs = []
+    for child in ast.walk(node):
+        if id(child) in bindings or isinstance(getattr(child, "ctx", None), ast.Store):
+            continue
+        if not isinstance(child, ast.Attribute):
+            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
+                refs.append(["name", local_classes.get(child.id, child.id), ""])
+            continue
+        value = child.value
+        if isinstance(value, ast.Name):
+            if value.id == "self":
+                refs.append(["self", child.attr, ""])
+            else:
+                refs.append(["name", local_classes.get(value.id, value.id), child.attr])
+        elif isinstance(value, ast.Attribute) and isinstance(value.value, ast.Name) and value.value.id == "self":
+            refs.append(["self", value.attr, child.attr])
+    params = [arg.arg for arg in node.args.args if arg.arg not in ("self", "cls")]
+    return [list(ref) for ref in {tuple(ref) for ref in refs}], params
+
+
+def _is_autouse(node: ast.AST) -> bool:
+    for decorator in node.decorator_list:
+        if isinstance(decorator, ast.Call) and any(
+                keyword.arg == "autouse" and isinstance(keyword.value, ast.Constant) and keyword.value.value
+                for keyword in decorator.keywords):
+            return True
+    return False
+
+
+def _span(node: ast.AST) -> List[int]:
+    start = min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+    return [start, node.end_lineno]
+
+
+def _function_entry(node) -> dict:
+    refs, params = _function_refs(node)
+    return {"span": _span(node), "refs": refs, "params": params, "autouse": _is_autouse(node)}
+
+
+def analyse_source(source: str) -> dict:
+    """Parse one module into the JSON-friendly summary the dependency map is built from."""
+    tree = ast.parse(source)
+    analysis = {"imports": {}, "src_imports": [], "classes": {}, "functions": {}}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            for alias in node.names:
+                analysis["imports"][alias.asname or alias.name] = [_module_path(node.module), alias.name]
+            if node.module.startswith("src."):
+                analysis["src_imports"].append(_module_path(node.module))
+        elif isinstance(node, ast.Import):
+            analysis["src_imports"].extend(_module_path(alias.name) for alias in node.names
+                                           if alias.name.startswith("src."))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            analysis["functions"][node.name] = _function_entry(node)
+        elif isinstance(node, ast.ClassDef):
+            entry = {"span": _span(node), "bases": [base.id for base in node.bases if isinstance(base, ast.Name)],
+                     "attrs": {}, "attr_refs": {}, "methods": {}, "instance_attrs": {}}
+            for member in node.body:
+                if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    entry["methods"][member.name] = _function_entry(member)
+                elif isinstance(member, (ast.Assign, ast.AnnAssign)):
+                    targets = member.targets if isinstance(member, ast.Assign) else [member.target]
+                    # Class-level locators such as PageLocator(LoginPageLocators.LOGIN_BUTTON)
+                    refs = [[child.value.id, child.attr] for child in ast.walk(member.value or ast.Pass())
+                            if isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name)]
+                    for target in targets:
+                        if isinstance(target, ast.Name):
+                            entry["attrs"][target.id] = _span(member)
+                            entry["attr_refs"][target.id] = refs
+            # What each self.<attr> is bound to: an instance of a class, or a class attribute (a locator)
+            for child in ast.walk(node):
+                if not (isinstance(child, ast.Assign) and len(child.targets) == 1):
+                    continue
+                target, value = child.targets[0], child.value
+                if not (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                        and target.value.id == "self"):
+                    continue
+                if _constructed_class(value):
+                    entry["instance_attrs"][target.attr] = [_constructed_class(value), ""]
+                elif isinstance(value, ast.Attribute) and isinstance(value.value, ast.Name):
+                    entry["instance_attrs"][target.attr] = [value.value.id, value.attr]
+            analysis["classes"][node.name] = entry
+    return analysis
+
+
+def symbol_at(analysis: dict, path: str, line: int) -> str:
+    """Name the innermost definition covering a line: path::Class.member, path::Class, path::function or path."""
+    for name, entry in analysis["classes"].items():
+        start, end = entry["span"]
+        if start <= line <= end:
+            members = list(entry["methods"].items()) + [(attr, {"span": span}) for attr, span in entry["attrs"].items()]
+            for member, member_entry in members:
+                if member_entry["span"][0] <= line <= member_entry["span"][1]:
+                    return f"{path}::{name}.{member}"
+            return f"{path}::{name}"
+    for name, entry in analysis["functions"].items():
+        if entry["span"][0] <= line <= entry["span"][1]:
+            return f"{path}::{name}"
+    return path
+
+
+def _affects(changed: str, dependency: str) -> bool:
+    if changed == dependency:
+        return True
+    separator = "." if "::" in changed else "::"
+    return dependency.startswith(changed + separator)
+
+
+def changed_lines(base: str, root: str = ".") -> Dict[str, Optional[Set[int]]]:
+    """Lines changed since `base` (working tree included) per file; None means the whole file.
+
+    Untracked files count as entirely new.
+    """
+    def git(*args):
+        result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    changes: Dict[str, Optional[Set[int]]] = {}
+    current, old_path = None, None
+    for line in git("diff", "--relative", "--no-renames", "--no-color", "--unified=0", base, "--").splitlines():
+        if line.startswith("diff --git "):
+            # Whole file unless hunks say otherwise: added, deleted and binary files
+            current = line.rsplit(" b/", 1)[-1]
+            changes[current] = None
+        elif line.startswith("--- "):
+            old_path = line[4:]
+        elif line.startswith("+++ "):
+            if line[4:] != "/dev/null" and old_path != "/dev/null":
+                changes[current] = set()
+        elif changes.get(current) is not None:
+            match = HUNK_HEADER.match(line)
+            if match:
+                start, count = int(match.group(1)), int(match.group(2) if match.group(2) is not None else 1)
+                # A pure deletion sits between two lines; count both neighbours as changed
+                changes[current].update(range(start, start + count) if count else (start, start + 1))
+    for path in git("ls-files", "--others", "--exclude-standard").splitlines():
+        changes[path] = None
+    return changes
+
+
+class Selection:
+    """Outcome of impact analysis: either the full suite (with the reason) or a set of test ids."""
+
+    def __init__(self, full: bool, reason: str, tests: Iterable[str] = (), changed: Iterable[str] = ()):
+        self.full = full
+        self.reason = reason
+        self.tests = set(tests)
+        self.changed = sorted(changed)
+
+    def selects(self, nodeid: str) -> bool:
+        return self.full or nodeid.split("[", 1)[0] in self.tests
+
+
+class ImpactAnalyzer:
+    """Maps device tests to the page objects, page methods and locators they use.
+
+    The map is built statically from the test modules (tests/test_*.py) and
+    the page and locator modules they import: a test depends on its own body,
+    the fixtures and helpers it uses, every page method it calls (and what
+    those call) and every locator those methods read. Per-file analyses are
+    kept with a content hash in the pytest cache, so only edited files are
+    parsed again on the next run.
+    """
+
+    def __init__(self, root: str = ".", cache=None):
+        self.root = root
+        self.cache = cache
+        stored = cache.get(IMPACT_CACHE_KEY, {}) if cache is not None else {}
+        self._stored = stored.get("modules", {}) if stored.get("version") == ANALYSIS_VERSION else {}
+        self.modules: Dict[str, dict] = {}
+        self.parsed = 0
+        self._deps: Dict[str, Set[str]] = {}
+        self._core: Optional[Set[str]] = None
+
+    def _analysis(self, path: str) -> Optional[dict]:
+        if path in self.modules:
+            return self.modules[path]
+        full_path = os.path.join(self.root, path)
+        if not os.path.isfile(full_path):
+            return None
+        with open(full_path, "rb") as source_file:
+            source = source_file.read()
+        digest = hashlib.sha1(source).hexdigest()
+        stored = self._stored.get(path)
+        if stored and stored["sha"] == digest:
+            analysis = stored["analysis"]
+        else:
+            try:
+                analysis = analyse_source(source.decode("utf-8"))
+            except (SyntaxError, UnicodeDecodeError) as e:
+                logger.warning(f"Impact analysis could not parse {path}: {e}")
+                analysis = {"imports": {}, "src_imports": [], "classes": {}, "functions": {}}
+            self.parsed += 1
+        self.modules[path] = dict(analysis, sha=digest)
+        return self.modules[path]
+
+    def test_files(self) -> List[str]:
+        tests_dir = os.path.join(self.root, "tests")
+        if not os.path.isdir(tests_dir):
+            return []
+        return sorted(f"tests/{name}" for name in os.listdir(tests_dir) if DEVICE_TEST_FILE.match(f"tests/{name}"))
+
+    def core_files(self) -> Set[str]:
+        """The core files plus every src module they import, directly or not."""
+        core, pending = set(), list(CORE_FILES)
+        while pending:
+            path = pending.pop()
+            if path in core:
+                continue
+            core.add(path)
+            analysis = self._analysis(path)
+            if analysis:
+                pending.extend(analysis["src_imports"])
+        return core
+
+    def fine_grained_files(self) -> Set[str]:
+        """Page and locator modules reachable from the tests, outside the core."""
+        core = self.core_files()
+        reachable, pending = set(), list(self.test_files())
+        while pending:
+            path = pending.pop()
+            if path in reachable:
+                continue
+            reachable.add(path)
+            analysis = self._analysis(path)
+            if analysis:
+                pending.extend(analysis["src_imports"])
+        return {path for path in reachable if path.startswith(FINE_GRAINED_DIRS) and path not in core}
+
+    def _resolve_class(self, path: str, name: str) -> Optional[Tuple[str, str]]:
+        """Find a class by name as seen from `path`; core classes are not followed (they select everything)."""
+        if self._core is None:
+            self._core = self.core_files()
+        analysis = self._analysis(path)
+        if analysis is None:
+            return None
+        if name in analysis["classes"] and path not in self._core:
+            return path, name
+        if name in analysis["imports"]:
+            module_path, imported = analysis["imports"][name]
+            target = self._analysis(module_path)
+            if target is not None and imported in target["classes"] and module_path not in self._core:
+                return module_path, imported
+        return None
+
+    def _class_use(self, cls: Tuple[str, str], seen: Set[str]) -> Set[str]:
+        """Dependencies of merely using a class: its constructor and the constructors of its page bases."""
+        path, name = cls
+        deps = {f"{path}::{name}.__init__"}
+        entry = self._analysis(path)["classes"][name]
+        if "__init__" in entry["methods"]:
+            deps |= self._function_deps(path, name, "__init__", seen)
+        for base in entry["bases"]:
+            base_cls = self._resolve_class(path, base)
+            if base_cls:
+                deps |= self._class_use(base_cls, seen)
+        return deps
+
+    def _member(self, cls: Tuple[str, str], member: str, seen: Set[str]) -> Set[str]:
+        path, name = cls
+        deps = self._class_use(cls, seen)
+        if not member:
+            return deps
+        entry = self._analysis(path)["classes"][name]
+        if member in entry["methods"]:
+            return deps | self._function_deps(path, name, member, seen)
+        if member in entry["attrs"]:
+            return deps | self._attribute(path, name, member, seen)
+        if member in entry["instance_attrs"]:
+            return deps | self._bound(path, entry["instance_attrs"][member], "", seen)
+        for base in entry["bases"]:
+            base_cls = self._resolve_class(path, base)
+            if base_cls:
+                deps |= self._member(base_cls, member, seen)
+        return deps
+
+    def _attribute(self, path: str, class_name: str, attr: str, seen: Set[str]) -> Set[str]:
+        """A class attribute, plus the locators it was declared from."""
+        deps = {f"{path}::{class_name}.{attr}"}
+        for base, member in self._analysis(path)["classes"][class_name]["attr_refs"].get(attr, []):
+            cls = self._resolve_class(path, base)
+            if cls:
+                deps |= self._member(cls, member, seen)
+        return deps
+
+    def _bound(self, path: str, binding: List[str], member: str, seen: Set[str]) -> Set[str]:
+        """Dependencies of self.<attr>[.member] where attr was bound to Class(...) or Class.ATTR."""
+        class_name, attr = binding
+        cls = self._resolve_class(path, class_name)
+        if cls is None:
+            return set()
+        if attr:
+            return self._member(cls, attr, seen)
+        return self._member(cls, member, seen)
+
+    def _function_deps(self, path: str, class_name: str, function: str, seen: Set[str]) -> Set[str]:
+        symbol = f"{path}::{class_name}.{function}" if class_name else f"{path}::{function}"
+        if symbol in self._deps:
+            return self._deps[symbol]
+        if symbol in seen:
+            return {symbol}
+        seen.add(symbol)
+        analysis = self._analysis(path)
+        scope = analysis["classes"][class_name] if class_name else None
+        functions = scope["methods"] if scope else analysis["functions"]
+        entry = functions[function]
+        deps = {symbol}
+        for kind, base, member in entry["refs"]:
+            if kind == "self" and scope is not None:
+                if base in scope["methods"]:
+                    deps |= self._function_deps(path, class_name, base, seen)
+                elif base in scope["attrs"]:
+                    deps |= self._attribute(path, class_name, base, seen)
+                elif base in scope["instance_attrs"]:
+                    deps |= self._bound(path, scope["instance_attrs"][base], member, seen)
+                else:
+                    # Inherited from a page base class outside this module
+                    for base_name in scope["bases"]:
+                        base_cls = self._resolve_class(path, base_name)
+                        if base_cls:
+                            deps |= self._member(base_cls, base, seen)
+            elif kind == "name":
+                cls = self._resolve_class(path, base)
+                if cls:
+                    deps |= self._member(cls, member, seen)
+                elif not member and base in analysis["functions"] and base != function:
+                    deps |= self._function_deps(path, "", base, seen)
+        # Fixtures requested by name, from the same class or module
+        for param in entry["params"]:
+            if param in functions and param != function:
+                deps |= self._function_deps(path, class_name, param, seen)
+            elif scope is not None and param in analysis["functions"]:
+                deps |= self._function_deps(path, "", param, seen)
+        seen.discard(symbol)
+        self._deps[symbol] = deps
+        return deps
+
+    def dependency_map(self) -> Dict[str, List[str]]:
+        """Return {test id without parameters: sorted dependency symbols} for every device test."""
+        tests = {}
+        for path in self.test_files():
+            analysis = self._analysis(path)
+            module_autouse = [name for name, entry in analysis["functions"].items() if entry["autouse"]]
+            scopes = [("", analysis["functions"])] + [(name, entry["methods"])
+                                                      for name, entry in analysis["classes"].items()
+                                                      if name.startswith("Test")]
+            for class_name, functions in scopes:
+                autouse = [name for name, entry in functions.items() if entry["autouse"]]
+                for name in functions:
+                    if not name.startswith("test"):
+                        continue
+                    deps = self._function_deps(path, class_name, name, set())
+                    for fixture in autouse:
+                        deps = deps | self._function_deps(path, class_name, fixture, set())
+                    for fixture in module_autouse:
+                        deps = deps | self._function_deps(path, "", fixture, set())
+                    nodeid = f"{path}::{class_name}::{name}" if class_name else f"{path}::{name}"
+                    tests[nodeid] = sorted(deps)
+        return tests
+
+    def select(self, changes: Dict[str, Optional[Set[int]]]) -> Selection:
+        """Pick the device tests affected by the given changed lines (see changed_lines)."""
+        tests = self.dependency_map()
+        core = self.core_files()
+        fine_grained = self.fine_grained_files() | set(self.test_files())
+        changed_symbols = set()
+        for path, lines in sorted(changes.items()):
+            if path in core:
+                return Selection(True, f"framework core changed: {path}", tests, [path])
+            if path in fine_grained:
+                analysis = self._analysis(path)
+                if lines is None or analysis is None:
+                    changed_symbols.add(path)
+                else:
+                    changed_symbols.update(symbol_at(analysis, path, line) for line in lines)
+            elif path in FULL_SUITE_FILES or path.startswith("tests/resources/") \
+                    or (path.startswith("src/") and path.endswith(".py")):
+                return Selection(True, f"{path} is used by the whole suite", tests, [path])
+        selected = {nodeid for nodeid, deps in tests.items()
+                    if any(_affects(changed, dep) for changed in changed_symbols for dep in deps)}
+        return Selection(False, f"{len(selected)} of {len(tests)} device test(s) affected",
+                         selected, changed_symbols)
+
+    def save(self):
+        if self.cache is None:
+            return
+        modules = {path: {"sha": analysis["sha"], "analysis": {key: value for key, value in analysis.items()
+                                                               if key != "sha"}}
+                   for path, analysis in self.modules.items()}
+        self.cache.set(IMPACT_CACHE_KEY, {"version": ANALYSIS_VERSION, "modules": modules,
+                                          "tests": self.dependency_map()})
+        logger.info(f"Saved impact map for {len(modules)} module(s), {self.parsed} re-parsed")
+
+
+class ImpactPlugin:
+    """Deselects device tests the changes since a git ref cannot affect.
+
+    Tests outside tests/test_*.py (the offline unit tests) are always kept.
+    With scope "class" a selected test brings its whole class along, since a
+    class shares one app state and later tests build on earlier ones.
+    """
+
+    def __init__(self, base: str, root: str = ".", cache=None, scope: str = "class"):
+        self.base = base
+        self.scope = scope
+        self.analyzer = ImpactAnalyzer(root, cache)
+        self.selection: Optional[Selection] = None
+
+    def pytest_collection_modifyitems(self, config, items):
+        try:
+            self.selection = self.analyzer.select(changed_lines(self.base, self.analyzer.root))
+        except RuntimeError as e:
+            self.selection = Selection(True, f"impact analysis unavailable ({e})")
+        if not hasattr(config, "workerinput"):
+            self.analyzer.save()
+        if self.selection.full:
+            logger.info(f"Impact analysis since {self.base}: running the full suite, {self.selection.reason}")
+            return
+        keep = {item.nodeid for item in items
+                if not DEVICE_TEST_FILE.match(item.nodeid.split("::", 1)[0]) or self.selection.selects(item.nodeid)}
+        if self.scope == "class":
+            classes = {item.nodeid.rsplit("::", 1)[0] for item in items if item.nodeid in keep and item.cls}
+            keep |= {item.nodeid for item in items if item.cls and item.nodeid.rsplit("::", 1)[0] in classes}
+        deselected = [item for item in items if item.nodeid not in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in keep]
+        logger.info(f"Impact analysis since {self.base}: {self.selection.reason}, "
+                    f"{len(deselected)} test(s) deselected")
+
+    def pytest_report_collectionfinish(self, config, items):
+        if self.selection is None:
+            return None
+        if self.selection.full:
+            return f"impact since {self.base}: full suite ({self.selection.reason})"
+        return f"impact since {self.base}: {self.selection.reason}; changed {', '.join(self.selection.changed) or '-'}"
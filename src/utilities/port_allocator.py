@@ -0,0 +1,174 @@
+# src/utilities/port_allocator.py
+import atexit
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Port ranges per kind; console ports are even and the emulator also takes port + 1 for adb
+PORT_RANGES = {
+    "appium": range(4723, 4923),
+    "system": range(8200, 8400),
+    "console": range(5554, 5684, 2),
+}
+PREFERRED_SCAN = 64  # How far past a preferred port to look before falling back to the kind's range
+REGISTRY_DIR = os.getenv("PORT_REGISTRY_DIR", os.path.join(tempfile.gettempdir(), "appium-framework-ports"))
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(handle):
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(handle):
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _pid_alive(pid: int) -> bool:
+        import ctypes
+        process = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not process:
+            return False
+        exit_code = ctypes.c_ulong()
+        ctypes.windll.kernel32.GetExitCodeProcess(process, ctypes.byref(exit_code))
+        ctypes.windll.kernel32.CloseHandle(process)
+        return exit_code.value == 259  # STILL_ACTIVE
+else:
+    import fcntl
+
+    def _lock_file(handle):
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(handle):
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+
+def _is_bindable(port: int, host: str = "127.0.0.1") -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind((host, port))
+            return True
+        except OSError:
+            return False
+
+
+def _worker_slot() -> Tuple[int, int]:
+    """Return (index, count) of this pytest-xdist worker, or (0, 1) outside xdist."""
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+    count = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1") or 1)
+    index = int(worker[2:]) if worker.startswith("gw") and worker[2:].isdigit() else 0
+    return index % max(count, 1), max(count, 1)
+
+
+class PortAllocator:
+    """Hands out Appium, systemPort and emulator console ports across processes.
+
+    Reservations live in a JSON registry guarded by an OS file lock, so two
+    xdist workers can never be given the same port. Each worker searches its
+    own stripe of every range first, which keeps workers from contending for
+    the same low ports. Entries of processes that have exited are reclaimed.
+    """
+
+    def __init__(self, registry_dir: str = REGISTRY_DIR, ranges: Optional[Dict[str, range]] = None):
+        self.registry_dir = registry_dir
+        self.ranges = dict(ranges or PORT_RANGES)
+        self.registry_file = os.path.join(registry_dir, "ports.json")
+        self.lock_file = os.path.join(registry_dir, "ports.lock")
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _registry(self) -> Iterator[Dict[str, dict]]:
+        """Lock the registry, yield it for changes, write it back."""
+        os.makedirs(self.registry_dir, exist_ok=True)
+        with self._lock, open(self.lock_file, "a+") as lock_handle:
+            _lock_file(lock_handle)
+            try:
+                entries = {}
+                if os.path.exists(self.registry_file):
+                    with open(self.registry_file, encoding="utf-8") as registry_file:
+                        try:
+                            entries = json.load(registry_file)
+                        except ValueError:
+                            logger.warning(f"Port registry {self.registry_file} was corrupt, starting over")
+                entries = {port: entry for port, entry in entries.items() if _pid_alive(entry["pid"])}
+                yield entries
+                temporary_file = f"{self.registry_file}.{self.pid}.tmp"
+                with open(temporary_file, "w", encoding="utf-8") as registry_file:
+                    json.dump(entries, registry_file)
+                os.replace(temporary_file, self.registry_file)
+            finally:
+                _unlock_file(lock_handle)
+
+    def _candidates(self, kind: str, preferred: Optional[int]) -> List[int]:
+        ports = self.ranges[kind]
+        candidates = []
+        if preferred is not None:
+            candidates.extend(range(preferred, preferred + PREFERRED_SCAN * ports.step, ports.step))
+        index, count = _worker_slot()
+        start = (len(ports) // count) * index
+        candidates.extend(ports[start:])
+        candidates.extend(ports[:start])
+        return list(dict.fromkeys(candidates))
+
+    def allocate(self, kind: str, preferred: Optional[int] = None, owner: str = "") -> int:
+        """Reserve a free port of the given kind, trying `preferred` and the ports after it first."""
+        if kind not in self.ranges:
+            raise ValueError(f"Unknown port kind: {kind}")
+        with self._registry() as entries:
+            for port in self._candidates(kind, preferred):
+                if str(port) in entries or (kind == "console" and str(port + 1) in entries):
+                    continue
+                if not _is_bindable(port) or (kind == "console" and not _is_bindable(port + 1)):
+                    continue
+                entries[str(port)] = {"kind": kind, "pid": self.pid, "owner": owner}
+                logger.debug(f"Reserved {kind} port {port} for {owner or self.pid}")
+                return port
+        ports = self.ranges[kind]
+        raise RuntimeError(f"No free {kind} port left in {ports.start}-{ports.stop - 1}")
+
+    def release(self, port: int):
+        with self._registry() as entries:
+            entry = entries.get(str(port))
+            if entry and entry["pid"] == self.pid:
+                del entries[str(port)]
+
+    def release_all(self):
+        """Release every port this process still holds (called at exit)."""
+        with self._registry() as entries:
+            for port in [port for port, entry in entries.items() if entry["pid"] == self.pid]:
+                del entries[port]
+
+    def reserved(self) -> Dict[int, dict]:
+        with self._registry() as entries:
+            return {int(port): dict(entry) for port, entry in entries.items()}
+
+
+_allocator: Optional[PortAllocator] = None
+_allocator_lock = threading.Lock()
+
+
+def get_port_allocator() -> PortAllocator:
+    """Return the process-wide allocator; its ports are released when the process exits."""
+    global _allocator
+    with _allocator_lock:
+        if _allocator is None:
+            _allocator = PortAllocator()
+            atexit.register(_allocator.release_all)
+        return _allocator
@@ -0,0 +1,185 @@
+# src/utilities/readiness.py
+import functools
+import logging
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utilities.command_runner import CommandRunner
+
+logger = logging.getLogger(__name__)
+
+# Runs on the device: one adb process blocks until the boot property flips.
+BOOT_WATCH = 'while [ "$(getprop sys.boot_completed)" != "1" ]; do sleep 0.2; done'
+
+
+class ReadinessError(RuntimeError):
+    """Raised when a device or server does not become ready in time."""
+
+    def __init__(self, message: str, latencies: Optional[Dict[str, float]] = None):
+        super().__init__(message)
+        self.latencies = latencies or {}
+
+
+class Backoff:
+    """Exponential backoff with jitter between readiness attempts."""
+
+    def __init__(self, initial: float = 0.1, factor: float = 2.0, maximum: float = 2.0, jitter: float = 0.5,
+                 rng: Callable[[], float] = random.random):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.jitter = jitter
+        self.rng = rng
+
+    def delays(self) -> Iterator[float]:
+        """Yield successive delays; each is scaled down by up to `jitter` of itself."""
+        delay = self.initial
+        while True:
+            yield delay * (1 - self.jitter * self.rng())
+            delay = min(delay * self.factor, self.maximum)
+
+
+class AppiumStatusClient:
+    """Pooled HTTP client for Appium /status with connect and read timeouts."""
+
+    def __init__(self, connect_timeout: float = 1.0, read_timeout: float = 3.0, pool_size: int = 10):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def is_ready(self, server_url: str) -> bool:
+        """Return True if the server answers /status with 200 and does not report ready=false."""
+        try:
+            response = self.session.get(f"{server_url.rstrip('/')}/status", timeout=self.timeout)
+        except requests.RequestException:
+            return False
+        if response.status_code != 200:
+            return False
+        try:
+            return response.json().get("value", {}).get("ready", True) is not False
+        except ValueError:
+            return True
+
+    def close(self):
+        self.session.close()
+
+
+_status_client: Optional[AppiumStatusClient] = None
+_status_client_lock = threading.Lock()
+
+
+def get_status_client() -> AppiumStatusClient:
+    """Return the process-wide /status client so connections are pooled across callers."""
+    global _status_client
+    with _status_client_lock:
+        if _status_client is None:
+            _status_client = AppiumStatusClient()
+        return _status_client
+
+
+def wait_for_server(server_url: str, timeout: float = 60, client: Optional[AppiumStatusClient] = None,
+                    backoff: Optional[Backoff] = None) -> float:
+    """Block until the Appium server is ready and return how long that took."""
+    client = client or get_status_client()
+    delays = (backoff or Backoff()).delays()
+    started = time.monotonic()
+    deadline = started + timeout
+    while True:
+        if client.is_ready(server_url):
+            latency = time.monotonic() - started
+            logger.info(f"Appium server {server_url} ready after {latency:.2f}s")
+            return latency
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ReadinessError(f"Appium server {server_url} did not become ready within {timeout} seconds")
+        time.sleep(min(next(delays), remaining))
+
+
+def _watch_boot(udid: str, timeout: float, runner: CommandRunner, adb) -> Optional[bool]:
+    """One boot-watch attempt: True when booted, False when it failed, None when it timed out."""
+    if adb is not None:
+        started = time.monotonic()
+        try:
+            adb.wait_for_state(udid, "device", timeout)
+            result = adb.shell(udid, BOOT_WATCH, timeout=max(timeout - (time.monotonic() - started), 0.1))
+        except TimeoutError:
+            return None
+        except (OSError, RuntimeError) as e:
+            logger.debug(f"Boot watch for {udid} failed: {e}")
+            return False
+        return result.exit_code == 0
+    try:
+        result = runner.run(["adb", "-s", udid, "wait-for-device", "shell", BOOT_WATCH],
+                            capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None
+    if result.returncode != 0:
+        logger.debug(f"Boot watch for {udid} exited with {result.returncode}: {result.stderr}")
+    return result.returncode == 0
+
+
+def wait_for_device(udid: str, timeout: float = 180, runner: Optional[CommandRunner] = None,
+                    backoff: Optional[Backoff] = None, attempt_timeout: float = 10,
+                    abort: Optional[Callable[[], bool]] = None, adb=None) -> float:
+    """Block until `udid` is attached and sys.boot_completed is 1; return how long that took.
+
+    A single `adb wait-for-device shell <watch>` call waits for the device and
+    then watches the boot property on the device itself; with an AdbClient
+    (`adb`) the same happens over its device tracker and shell protocol,
+    without spawning adb. Failed attempts back off with jitter; `abort` is
+    checked between attempts (e.g. emulator exited).
+    """
+    runner = runner or CommandRunner()
+    delays = (backoff or Backoff()).delays()
+    started = time.monotonic()
+    deadline = started + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ReadinessError(f"Device {udid} did not finish booting within {timeout} seconds")
+        if abort is not None and abort():
+            raise ReadinessError(f"Device {udid} stopped while waiting for it to boot")
+        booted = _watch_boot(udid, min(remaining, attempt_timeout), runner, adb)
+        if booted is None:
+            continue  # Still booting; the watch itself was the wait
+        if booted:
+            latency = time.monotonic() - started
+            logger.info(f"Device {udid} booted after {latency:.2f}s")
+            return latency
+        time.sleep(min(next(delays), max(deadline - time.monotonic(), 0)))
+
+
+def wait_all(devices: Iterable[str] = (), servers: Iterable[str] = (), timeout: float = 180,
+             runner: Optional[CommandRunner] = None, client: Optional[AppiumStatusClient] = None,
+             adb=None) -> Dict[str, float]:
+    """Wait for many devices and Appium servers at once.
+
+    Returns {target: readiness latency in seconds}. Devices are watched over
+    `adb` (an AdbClient) when given, else through `runner`. Raises
+    ReadinessError naming every target that was not ready, with the
+    latencies that were measured.
+    """
+    waits = {udid: functools.partial(wait_for_device, udid, timeout, runner, adb=adb) for udid in devices}
+    waits.update({url: functools.partial(wait_for_server, url, timeout, client) for url in servers})
+    if not waits:
+        return {}
+    latencies, failures = {}, {}
+    with ThreadPoolExecutor(max_workers=len(waits), thread_name_prefix="readiness") as executor:
+        futures = {target: executor.submit(wait) for target, wait in waits.items()}
+        for target, future in futures.items():
+            try:
+                latencies[target] = future.result()
+            except Exception as e:
+                failures[target] = e
+    if failures:
+        raise ReadinessError(f"Not ready: {', '.join(sorted(failures))}", latencies)
+    return latencies
@@ -0,0 +1,176 @@
+# src/utilities/screenshots.py
+import atexit
+import base64
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.config.constants import SCREENSHOT_DIR, SCREENSHOT_KEEP, SCREENSHOT_MAX_AGE_DAYS
+from src.utilities.events import get_event_recorder
+
+logger = logging.getLogger(__name__)
+
+
+class Screenshot:
+    """One captured frame, held in memory; the file is written in the background.
+
+    `encoded` is the driver's base64 PNG (what pytest-html embeds), `png` the
+    decoded bytes (what Allure attaches) and `path` blocks until the file exists.
+    The handle also works as that path (os.fspath, str, open), waiting the same way.
+    """
+
+    def __init__(self, name: str, encoded: str, future: Future):
+        self.name = name
+        self.encoded = encoded
+        self._future = future
+        self._png: Optional[bytes] = None
+
+    @property
+    def png(self) -> bytes:
+        if self._png is None:
+            self._png = base64.b64decode(self.encoded)
+        return self._png
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the file holding this frame (an earlier identical one if deduplicated), or None on error."""
+        try:
+            return self._future.result()
+        except Exception as e:
+            logger.error(f"Failed to save screenshot {self.name}: {e}")
+            return None
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def __fspath__(self) -> str:
+        path = self.path
+        if path is None:
+            raise FileNotFoundError(f"Screenshot {self.name} was not saved")
+        return path
+
+    def __str__(self) -> str:
+        return self.path or ""
+
+
+class ScreenshotStore:
+    """Writes screenshots off the test thread, skips identical frames and prunes the directory.
+
+    Frames are hashed with sha256 on the writer thread; a frame already written
+    in this process reuses the earlier file. After each write the directory is
+    trimmed to the newest `keep` files and files older than `max_age_days`.
+    """
+
+    def __init__(self, directory: str = SCREENSHOT_DIR, keep: int = SCREENSHOT_KEEP,
+                 max_age_days: float = SCREENSHOT_MAX_AGE_DAYS, max_workers: int = 1):
+        self.directory = directory
+        self.keep = keep
+        self.max_age_days = max_age_days
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="screenshot-writer")
+        self._paths_by_digest: Dict[str, str] = {}
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+        self.written = 0
+        self.deduplicated = 0
+
+    def capture(self, driver, name: str) -> Screenshot:
+        """Grab the current screen as base64 and queue it for writing; returns immediately."""
+        with get_event_recorder().span("screenshot", name) as event:
+            encoded = driver.get_screenshot_as_base64()
+            event["bytes"] = len(encoded) * 3 // 4 - encoded.count("=", -2)
+        future = self._executor.submit(self._store, name, encoded)
+        with self._lock:
+            self._pending = [pending for pending in self._pending if not pending.done()]
+            self._pending.append(future)
+        return Screenshot(name, encoded, future)
+
+    def _store(self, name: str, encoded: str) -> str:
+        data = base64.b64decode(encoded)
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            existing = self._paths_by_digest.get(digest)
+            if existing and os.path.exists(existing):
+                self.deduplicated += 1
+                logger.info(f"Screenshot {name} is identical to {existing}, not writing it again")
+                return existing
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._unique_path(name)
+            temporary_path = f"{path}.part"
+            with open(temporary_path, "wb") as image_file:
+                image_file.write(data)
+            os.replace(temporary_path, path)
+            self._paths_by_digest[digest] = path
+            self.written += 1
+        logger.info(f"Screenshot saved successfully: {path}")
+        self.apply_retention(protect=path)
+        return path
+
+    def _unique_path(self, name: str) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.directory, f"{name}_{timestamp}.png")
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"{name}_{timestamp}_{suffix}.png")
+            suffix += 1
+        return path
+
+    def apply_retention(self, protect: Optional[str] = None) -> List[str]:
+        """Delete screenshots beyond the count and age limits; returns the removed paths."""
+        if not os.path.isdir(self.directory):
+            return []
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith(".png"):
+                    entries.append((entry.stat().st_mtime, entry.path))
+            entries.sort(reverse=True)
+            cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days > 0 else None
+            removed = []
+            for position, (modified, path) in enumerate(entries):
+                if path == protect:
+                    continue
+                if (self.keep > 0 and position >= self.keep) or (cutoff is not None and modified < cutoff):
+                    try:
+                        os.remove(path)
+                        removed.append(path)
+                    except OSError as e:
+                        logger.warning(f"Could not remove old screenshot {path}: {e}")
+            removed_set = set(removed)
+            self._paths_by_digest = {digest: path for digest, path in self._paths_by_digest.items()
+                                     if path not in removed_set}
+        if removed:
+            logger.info(f"Removed {len(removed)} old screenshot(s) from {self.directory}")
+        return removed
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait until every queued screenshot has been written."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                future.result(timeout=timeout)
+            except Exception as e:
+                logger.error(f"Screenshot write failed: {e}")
+
+    def shutdown(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+
+_store: Optional[ScreenshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_screenshot_store() -> ScreenshotStore:
+    """Return the process-wide ScreenshotStore, creating it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ScreenshotStore()
+            atexit.register(_store.shutdown)
+        return _store
@@ -0,0 +1,217 @@
+# src/utilities/timing.py
+import html
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.config.constants import TIMING_REPORT_DIR
+from src.utilities.events import get_event_recorder
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+
+class ActionTiming:
+    """Mutable timing of one action while it runs; wait and retries are filled in by nested calls."""
+
+    __slots__ = ("action", "locator", "strategy", "wait", "retries")
+
+    def __init__(self, action: str, locator: Optional[str], strategy: Optional[str]):
+        self.action = action
+        self.locator = locator
+        self.strategy = strategy
+        self.wait = 0.0
+        self.retries = 0
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _stats(totals: List[float], waits: List[float], retries: int, failures: int) -> Dict[str, float]:
+    totals = sorted(totals)
+    stats = {"count": len(totals), "total_s": round(sum(totals), 4), "max_ms": round(totals[-1] * 1000, 2),
+             "wait_s": round(sum(waits), 4), "command_s": round(sum(totals) - sum(waits), 4),
+             "retries": retries, "failures": failures}
+    for pct in PERCENTILES:
+        stats[f"p{pct}_ms"] = round(percentile(totals, pct) * 1000, 2)
+    return stats
+
+
+class TimingRecorder:
+    """Collects per-action timings and aggregates them per action, locator and test.
+
+    Each record is a tuple appended under a lock to its test's list, so
+    recording costs two perf_counter() calls and an append, and one test's
+    summary never scans the others. Nested actions (click -> find) are folded
+    into the outermost one: its wait time is the find loop, its command time
+    the rest. Past max_records the oldest tests' records are dropped.
+    """
+
+    def __init__(self, enabled: bool = True, max_records: int = 100_000):
+        self.enabled = enabled
+        self.max_records = max_records
+        self.current_test: Optional[str] = None
+        self.dropped = 0
+        self._by_test: Dict[Optional[str], List[Tuple]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def records(self) -> List[Tuple]:
+        with self._lock:
+            return [record for records in self._by_test.values() for record in records]
+
+    def add_records(self, records):
+        """Add records taken elsewhere, e.g. shipped back by an xdist worker."""
+        with self._lock:
+            for record in records:
+                self._append(tuple(record))
+
+    def _append(self, record: Tuple):
+        self._by_test.setdefault(record[0], []).append(record)
+        self._count += 1
+        while self._count > self.max_records and len(self._by_test) > 1:
+            oldest = next(iter(self._by_test))
+            dropped = len(self._by_test.pop(oldest))
+            self._count -= dropped
+            self.dropped += dropped
+
+    @contextmanager
+    def action(self, action: str, locator_type: Optional[str] = None,
+               locator_value: Optional[str] = None) -> Iterator[Optional[ActionTiming]]:
+        """Time an action; yields the outer ActionTiming when already inside one."""
+        current = getattr(self._local, "current", None)
+        events = get_event_recorder()
+        if current is not None or not (self.enabled or events.enabled):
+            yield current
+            return
+        timing = ActionTiming(action, None if locator_value is None else f"{locator_type}:{locator_value}",
+                              locator_type)
+        self._local.current = timing
+        outcome = "passed"
+        started = time.perf_counter()
+        started_monotonic = time.monotonic()
+        try:
+            yield timing
+        except BaseException:
+            outcome = "failed"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._local.current = None
+            if events.enabled:
+                events.emit("driver" if action.startswith("driver.") else "action", action, started_monotonic,
+                            elapsed, locator=timing.locator, outcome=outcome, retries=timing.retries or None)
+            if self.enabled:
+                record = (self.current_test, timing.action, timing.locator, timing.strategy, elapsed,
+                          min(timing.wait, elapsed), timing.retries, outcome)
+                with self._lock:
+                    self._append(record)
+
+    def add_wait(self, seconds: float, attempts: int = 1):
+        """Attribute time spent polling for an element (and extra attempts) to the running action."""
+        timing = getattr(self._local, "current", None)
+        if timing is not None:
+            timing.wait += seconds
+            timing.retries += max(0, attempts - 1)
+            events = get_event_recorder()
+            if events.enabled:
+                events.emit("wait", f"wait {timing.action}", time.monotonic() - seconds, seconds,
+                            locator=timing.locator, attempts=attempts)
+
+    def add_retry(self):
+        timing = getattr(self._local, "current", None)
+        if timing is not None:
+            timing.retries += 1
+
+    def clear(self):
+        with self._lock:
+            self._by_test = {}
+            self._count = 0
+
+    def summary(self, test: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Percentiles grouped by action, locator and test (optionally for one test only)."""
+        if test is None:
+            records = self.records
+        else:
+            with self._lock:
+                records = list(self._by_test.get(test, ()))
+        groups: Dict[str, Dict[str, list]] = {"actions": {}, "locators": {}, "tests": {}}
+        for test_name, action, locator, _, total, wait, retries, outcome in records:
+            keys = (("actions", action), ("locators", locator), ("tests", test_name))
+            for group, key in keys:
+                if key is None:
+                    continue
+                entry = groups[group].setdefault(key, [[], [], 0, 0])
+                entry[0].append(total)
+                entry[1].append(wait)
+                entry[2] += retries
+                entry[3] += outcome == "failed"
+        return {group: {key: _stats(*entry) for key, entry in sorted(entries.items())}
+                for group, entries in groups.items()}
+
+    def text_summary(self, test: Optional[str] = None) -> str:
+        """Plain-text table of per-action percentiles, used for the Allure attachment."""
+        actions = self.summary(test)["actions"]
+        lines = [f"{'action':<24}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'wait s':>9}{'retries':>9}"]
+        for action, stats in actions.items():
+            lines.append(f"{action:<24}{stats['count']:>7}{stats['p50_ms']:>10}{stats['p90_ms']:>10}"
+                         f"{stats['p99_ms']:>10}{stats['wait_s']:>9}{stats['retries']:>9}")
+        return "\n".join(lines)
+
+    def write_report(self, directory: str = TIMING_REPORT_DIR, name: str = "timing") -> Optional[Tuple[str, str]]:
+        """Write <name>.json and <name>.html; returns their paths, or None when nothing was recorded."""
+        if not self._count:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        summary = self.summary()
+        json_path = os.path.join(directory, f"{name}.json")
+        with open(json_path, "w", encoding="utf-8") as report_file:
+            json.dump(summary, report_file, indent=1)
+        html_path = os.path.join(directory, f"{name}.html")
+        with open(html_path, "w", encoding="utf-8") as report_file:
+            report_file.write(_render_html(summary))
+        if self.dropped:
+            logger.warning(f"Timing report leaves out the {self.dropped} oldest records (max_records={self.max_records})")
+        logger.info(f"Timing report written to {json_path} and {html_path}")
+        return json_path, html_path
+
+
+def _render_html(summary: Dict[str, Dict[str, Dict[str, float]]]) -> str:
+    columns = ["count", "p50_ms", "p90_ms", "p99_ms", "max_ms", "total_s", "wait_s", "command_s", "retries",
+               "failures"]
+    parts = ["<!DOCTYPE html><html><head><meta charset='utf-8'><title>Action timings</title>",
+             "<style>body{font-family:sans-serif}table{border-collapse:collapse;margin-bottom:2em}"
+             "td,th{border:1px solid #ccc;padding:2px 8px;text-align:right}td:first-child{text-align:left}</style>",
+             "</head><body>"]
+    for group in ("actions", "locators", "tests"):
+        parts.append(f"<h2>By {group[:-1]}</h2><table><tr><th>{group[:-1]}</th>")
+        parts.extend(f"<th>{column}</th>" for column in columns)
+        parts.append("</tr>")
+        for key, stats in summary[group].items():
+            parts.append(f"<tr><td>{html.escape(str(key))}</td>")
+            parts.extend(f"<td>{stats[column]}</td>" for column in columns)
+            parts.append("</tr>")
+        parts.append("</table>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+_recorder = TimingRecorder(enabled=os.getenv("TIMING", "1") != "0")
+
+
+def get_timing_recorder() -> TimingRecorder:
+    """Return the process-wide recorder shared by BasePage and Driver."""
+    return _recorder
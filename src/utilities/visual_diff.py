@@ -0,0 +1,266 @@
+# src/utilities/visual_diff.py
+import io
+import logging
+import multiprocessing
+import os
+import re
+import struct
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.config.constants import VISUAL_BASELINE_DIR, VISUAL_THRESHOLD, VISUAL_TOLERANCE
+
+logger = logging.getLogger(__name__)
+
+# pixelmatch's YIQ colour distance: weights and the largest possible delta
+_Y = np.array([0.29889531, 0.58662247, 0.11448223], dtype=np.float32)
+_I = np.array([0.59597799, -0.27417610, -0.32180189], dtype=np.float32)
+_Q = np.array([0.21147017, -0.52261711, 0.31114694], dtype=np.float32)
+MAX_YIQ_DELTA = 35215.0
+
+
+class Region(NamedTuple):
+    """A rectangle left out of the comparison; relative regions are fractions of the frame size."""
+
+    left: float
+    top: float
+    right: float
+    bottom: float
+    relative: bool = False
+
+    def box(self, width: int, height: int) -> Tuple[int, int, int, int]:
+        if self.relative:
+            return (round(self.left * width), round(self.top * height),
+                    round(self.right * width), round(self.bottom * height))
+        return int(self.left), int(self.top), int(self.right), int(self.bottom)
+
+
+# Status bar (clock, battery, notifications) at the top of every Android screen
+STATUS_BAR = Region(0, 0, 1, 0.04, relative=True)
+DEFAULT_MASKS = (STATUS_BAR,)
+
+
+class VisualResult(NamedTuple):
+    name: str
+    baseline: str
+    status: str  # "match", "mismatch", "new", "size_mismatch" or "error"
+    changed_pixels: int = 0
+    changed_ratio: float = 0.0
+    diff_png: Optional[bytes] = None
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.status in ("mismatch", "size_mismatch", "error")
+
+    def describe(self) -> str:
+        if self.status == "error":
+            return f"{self.name}: comparison with {self.baseline} failed: {self.error}"
+        if self.status == "size_mismatch":
+            return f"{self.name}: frame size differs from {self.baseline}"
+        return f"{self.name}: {self.changed_ratio:.3%} of pixels differ from {self.baseline}"
+
+
+def png_size(png: bytes) -> Tuple[int, int]:
+    """Width and height from the PNG header, without decoding the image."""
+    if png[:8] != b"\x89PNG\r\n\x1a\n" or png[12:16] != b"IHDR":
+        raise ValueError("Not a PNG image")
+    return struct.unpack(">II", png[16:24])
+
+
+def _decode(data) -> np.ndarray:
+    with Image.open(io.BytesIO(data) if isinstance(data, bytes) else data) as image:
+        if image.mode in ("RGB", "RGBA"):
+            return np.asarray(image)[:, :, :3]  # A view: no conversion copy
+        return np.asarray(image.convert("RGB"))
+
+
+@lru_cache(maxsize=32)
+def _load_baseline(path: str, mtime_ns: int) -> np.ndarray:
+    return _decode(path)
+
+
+def _ignore_mask(height: int, width: int, masks: Sequence[Region]) -> Optional[np.ndarray]:
+    if not masks:
+        return None
+    mask = np.zeros((height, width), dtype=bool)
+    for region in masks:
+        left, top, right, bottom = region.box(width, height)
+        mask[max(0, top):max(0, bottom), max(0, left):max(0, right)] = True
+    return mask
+
+
+def _yiq_delta(actual: np.ndarray, expected: np.ndarray) -> np.ndarray:
+    """Perceptual colour distance of pixel rows (N x 3), 0 .. MAX_YIQ_DELTA."""
+    difference = actual.astype(np.float32) - expected.astype(np.float32)
+    y, i, q = difference @ _Y, difference @ _I, difference @ _Q
+    return 0.5053 * y * y + 0.299 * i * i + 0.1957 * q * q
+
+
+def _diff_image(expected: np.ndarray, changed: np.ndarray, ignored: Optional[np.ndarray]) -> bytes:
+    """The baseline faded to grey, changed pixels red and masked regions yellow."""
+    grey = (expected.astype(np.float32) @ _Y) * 0.25 + 191
+    image = np.repeat(grey.astype(np.uint8)[:, :, None], 3, axis=2)
+    if ignored is not None:
+        image[ignored] = (255, 240, 160)
+    image[changed] = (255, 0, 0)
+    output = io.BytesIO()
+    Image.fromarray(image).save(output, format="PNG", compress_level=1)
+    return output.getvalue()
+
+
+def _write_baseline(path: str, png: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.part"
+    with open(temporary_path, "wb") as baseline_file:
+        baseline_file.write(png)
+    os.replace(temporary_path, path)
+
+
+def compare_frame(png: bytes, baseline: str, name: str = "", masks: Sequence[Region] = DEFAULT_MASKS,
+                  threshold: float = VISUAL_THRESHOLD, tolerance: float = VISUAL_TOLERANCE,
+                  update: bool = False) -> VisualResult:
+    """Compare one PNG frame with its baseline file; a missing baseline (or update) records the frame.
+
+    Only pixels whose bytes differ are converted to YIQ, so near-identical
+    frames cost little more than the decode. A pixel counts as changed when its
+    YIQ distance exceeds threshold (0..1, like pixelmatch); the frame matches
+    while at most `tolerance` of the unmasked pixels changed.
+    """
+    started = time.perf_counter()
+    if update or not os.path.exists(baseline):
+        _write_baseline(baseline, png)
+        return VisualResult(name, baseline, "new", elapsed_ms=(time.perf_counter() - started) * 1000)
+    actual = _decode(png)
+    stat = os.stat(baseline)
+    expected = _load_baseline(baseline, stat.st_mtime_ns)
+    if actual.shape != expected.shape:
+        return VisualResult(name, baseline, "size_mismatch", actual.shape[0] * actual.shape[1], 1.0,
+                            elapsed_ms=(time.perf_counter() - started) * 1000)
+    height, width = actual.shape[:2]
+    ignored = _ignore_mask(height, width, masks)
+    differs = actual != expected
+    # Rows first: reducing whole rows is far cheaper than a per-pixel reduction over the frame
+    candidate_rows = np.flatnonzero(differs.reshape(height, -1).any(axis=1))
+    changed = np.zeros((height, width), dtype=bool)
+    if candidate_rows.size:
+        pixels = differs[candidate_rows].any(axis=2)
+        if ignored is not None:
+            pixels &= ~ignored[candidate_rows]
+        row_positions, columns = np.nonzero(pixels)
+        rows = candidate_rows[row_positions]
+        delta = _yiq_delta(actual[rows, columns], expected[rows, columns])
+        over = delta > MAX_YIQ_DELTA * threshold * threshold
+        changed[rows[over], columns[over]] = True
+    changed_pixels = int(np.count_nonzero(changed))
+    compared = height * width - (int(np.count_nonzero(ignored)) if ignored is not None else 0)
+    ratio = changed_pixels / compared if compared else 0.0
+    if ratio <= tolerance:
+        return VisualResult(name, baseline, "match", changed_pixels, ratio,
+                            elapsed_ms=(time.perf_counter() - started) * 1000)
+    return VisualResult(name, baseline, "mismatch", changed_pixels, ratio, _diff_image(expected, changed, ignored),
+                        (time.perf_counter() - started) * 1000)
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", value).strip("_") or "unnamed"
+
+
+def device_key(driver) -> str:
+    """Baseline folder for the device behind a driver: its model, else its name."""
+    capabilities = getattr(driver, "capabilities", None) or {}
+    return _slug(str(capabilities.get("deviceModel") or capabilities.get("deviceName") or "device"))
+
+
+class VisualComparator:
+    """Compares screenshots with baselines keyed by test, device and resolution, in a process pool.
+
+    `submit` returns at once; the comparison runs in one of `processes`
+    worker processes (0 compares on the calling thread). Results are grouped
+    by the test that was current when the frame was submitted and collected
+    with `results(test)`.
+    """
+
+    def __init__(self, baseline_dir: str = VISUAL_BASELINE_DIR, threshold: float = VISUAL_THRESHOLD,
+                 tolerance: float = VISUAL_TOLERANCE, masks: Sequence[Region] = DEFAULT_MASKS,
+                 processes: Optional[int] = None, update: bool = False):
+        self.baseline_dir = baseline_dir
+        self.threshold = threshold
+        self.tolerance = tolerance
+        self.masks = tuple(masks)
+        self.processes = min(4, os.cpu_count() or 1) if processes is None else processes
+        self.update = update
+        self.current_test: Optional[str] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[Optional[str], List[Tuple[Future, str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def baseline_path(self, test: Optional[str], device: str, size: Tuple[int, int], name: str) -> str:
+        test_parts = [_slug(part) for part in re.split(r"::|/", test or "")
+                      if part and part != "tests"] or ["session"]
+        test_parts[0] = test_parts[0].rsplit(".py", 1)[0]
+        return os.path.join(self.baseline_dir, device, f"{size[0]}x{size[1]}", *test_parts, f"{_slug(name)}.png")
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs WebDriver and logging threads can deadlock the child
+                self._executor = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def submit(self, png: bytes, name: str, device: str = "device", masks: Optional[Sequence[Region]] = None,
+               test: Optional[str] = None) -> Future:
+        """Queue a frame for comparison; masks are Regions or (left, top, right, bottom) pixel boxes."""
+        test = test if test is not None else self.current_test
+        baseline = self.baseline_path(test, device, png_size(png), name)
+        masks = self.masks + tuple(Region(*mask) for mask in masks or ())
+        args = (png, baseline, name, masks, self.threshold, self.tolerance, self.update)
+        if self.processes > 0:
+            future = self._pool().submit(compare_frame, *args)
+        else:
+            future = Future()
+            try:
+                future.set_result(compare_frame(*args))
+            except Exception as e:
+                future.set_exception(e)
+        with self._lock:
+            self._pending.setdefault(test, []).append((future, name, baseline))
+        return future
+
+    def compare(self, png: bytes, name: str, device: str = "device",
+                masks: Optional[Sequence[Region]] = None, test: Optional[str] = None) -> VisualResult:
+        return self.submit(png, name, device, masks, test).result()
+
+    def compare_many(self, frames: Iterable[Tuple[bytes, str, str]], test: Optional[str] = None) -> List[VisualResult]:
+        """Compare (png, name, device) frames in parallel; results come back in input order."""
+        futures = [self.submit(png, name, device, test=test) for png, name, device in frames]
+        return [future.result() for future in futures]
+
+    def results(self, test: Optional[str]) -> List[VisualResult]:
+        """Wait for and return every comparison submitted for a test; one that crashed is a failed "error" result."""
+        with self._lock:
+            pending = self._pending.pop(test, [])
+        results = []
+        for future, name, baseline in pending:
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Visual comparison failed for {test}: {e}")
+                result = VisualResult(name, baseline, "error", error=f"{type(e).__name__}: {e}")
+            if result.status == "new":
+                logger.info(f"Recorded visual baseline {result.baseline}")
+            results.append(result)
+        return results
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -1,15 +1,36 @@
 # AppiumFramework/tests/conftest.py
 
 import os
+import socket
 import threading
+import time
 import pytest
 import pytest_html
 import subprocess
-import time
 from datetime import datetime
 from pathlib import Path
 from src.utilities.custom_logger import CustomLogger
 from src.drivers.driver_class import Driver
+from src.drivers.appium_server_pool import AppiumServerPool, current_worker_id
+from src.drivers.reset_strategies import RESET_STRATEGIES, get_reset_strategy
+from src.utilities.readiness import ReadinessError, wait_for_device
+from src.utilities.device_farm import DeviceFarmPlugin, DurationStore, discover_devices
+from src.utilities.flaky import FlakeStore, RerunPlugin
+from src.utilities.impact import ImpactPlugin
+from src.pages.async_base_page import AsyncBasePage
+from src.pages.base_page import BasePage
+from src.pages.page_registry import PageRegistry
+from src.pages.polling import LatencyHistory
+from src.utilities.screenshots import get_screenshot_store
+from src.utilities.timing import get_timing_recorder
+from src.utilities.port_allocator import get_port_allocator
+from src.utilities.apk_cache import get_apk_installer
+from src.utilities.adb_client import AdbError, get_adb_client
+from src.utilities.visual_diff import VisualComparator
+from src.utilities.events import export_trace, get_event_recorder, prune_runs
+from src.utilities.device_daemon import DAEMON_URL, DeviceDaemonClient
+from src.utilities.device_capture import WINDOW_AFTER, WINDOW_BEFORE, CaptureManager, to_mp4
+from src.config.constants import APP_PACKAGE, EVENT_LOG_DIR
 import allure
 
 logger = CustomLogger.get_logger(__name__)
@@ -17,87 +38,361 @@ logger = CustomLogger.get_logger(__name__)
 # Current directory of conftest.py
 CURDIR = Path(__file__).parent
 APK_PATH = CURDIR / "resources" / "Android_Demo_App.apk"
+UNIT_TESTS_DIR = CURDIR / "unit"
+DEVICE_TESTS_RAN = pytest.StashKey[bool]()
+
+def pytest_configure(config):
+    if config.getoption("--async-logging"):
+        CustomLogger.enable_async()
+    if config.getoption("--event-log"):
+        if not hasattr(config, "workerinput"):
+            prune_runs(keep=int(os.getenv("EVENT_LOG_KEEP", "10")) - 1)
+            # Inherited by xdist workers, which are started after configure: one fresh directory per run
+            os.environ["EVENT_RUN_ID"] = f"{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}"
+        get_event_recorder().configure(os.path.join(EVENT_LOG_DIR, os.environ["EVENT_RUN_ID"]), current_worker_id())
+    if config.getoption("--no-step-recovery"):
+        BasePage.step_recovery = None
+    flake_store = FlakeStore(getattr(config, "cache", None))
+    config.pluginmanager.register(RerunPlugin(config.getoption("--reruns"), config.getoption("--rerun-budget"),
+                                              config.getoption("--rerun-delay"), flake_store), "flaky_reruns")
+    if config.getoption("--impacted-since"):
+        config.pluginmanager.register(ImpactPlugin(config.getoption("--impacted-since"), str(config.rootpath),
+                                                   getattr(config, "cache", None),
+                                                   config.getoption("--impact-scope")), "impact")
+    if config.getoption("--device-farm"):
+        devices = discover_devices()
+        logger.info(f"Device farm mode with devices: {devices}")
+        config.pluginmanager.register(DeviceFarmPlugin(devices, DurationStore(getattr(config, "cache", None)),
+                                                       flake_store), "device_farm")
+
+def pytest_sessionfinish(session):
+    timings = get_timing_recorder()
+    device_tests_ran = session.config.stash.get(DEVICE_TESTS_RAN, False)
+    if hasattr(session.config, "workerinput"):
+        # The controller merges every worker's records into one report
+        session.config.workeroutput["timing_records"] = timings.records if device_tests_ran else []
+    elif device_tests_ran:  # Unit runs against fakes leave no report behind
+        timings.write_report(name="timing")
+    get_screenshot_store().flush()
+    CustomLogger.flush()
+    events = get_event_recorder()
+    if events.enabled:
+        events.disable()
+        if not hasattr(session.config, "workerinput"):  # Workers have finished: merge every file of the run
+            export_trace(os.path.dirname(events.path))
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    records = getattr(node, "workeroutput", {}).get("timing_records")
+    if records:
+        get_timing_recorder().add_records(records)
+        node.config.stash[DEVICE_TESTS_RAN] = True
+
+def _is_unit_test(item):
+    return UNIT_TESTS_DIR in Path(str(item.fspath)).parents
 
 @pytest.fixture(scope="session", autouse=True)
-def emulator_session():
-    result = subprocess.run(['adb', 'devices'], capture_output=True, text=True)
-    devices = [line.split('\t')[0] for line in result.stdout.splitlines() if '\t' in line]
+def emulator_session(pytestconfig):
+    farm = pytestconfig.pluginmanager.get_plugin("device_farm")
+    if farm:
+        # Farm devices are managed outside the run: never boot or kill them here
+        for udid in farm.devices:
+            wait_for_device(udid, timeout=60, adb=get_adb_client())
+        if current_worker_id() == "master" and os.getenv("APK_INSTALL_CACHE", "1") != "0":
+            # One process drives every device: install where needed, all devices at once
+            # (xdist workers each install on their own device when their first driver starts)
+            get_apk_installer().ensure_installed_on(farm.devices, _apk_path(pytestconfig), APP_PACKAGE)
+        yield farm.devices[0]
+        return
+    daemon = _device_daemon(pytestconfig)
+    if daemon is not None:
+        # The daemon owns the emulators: lease one for this worker and hand it back (reset, still booted) at the end
+        lease = daemon.acquire(owner=f"{socket.gethostname()}:{os.getpid()}:{current_worker_id()}",
+                               wait=pytestconfig.getoption("--device-lease-wait")).start_heartbeat()
+        logger.info(f"Leased device {lease.udid} from the device daemon at {daemon.url}")
+        try:
+            yield lease.udid
+        finally:
+            lease.release()
+        return
+    adb = get_adb_client()
+    devices = [serial for serial, state in adb.devices().items() if state == "device"]
+    emulator_port = None
     if devices:
         udid = devices[0]
         logger.info(f"Using existing emulator: {udid}")
-        subprocess.run(['adb', '-s', udid, 'wait-for-device'], check=False)
+        wait_for_device(udid, timeout=60, adb=adb)
     else:
         avd_name = os.getenv("AVD_NAME", "Emulator-5556")
-        emulator_port = Driver.find_free_port(5554)
+        emulator_port = get_port_allocator().allocate("console", owner="emulator_session")
         logger.info(f"Starting emulator {avd_name} on port {emulator_port}")
         process = subprocess.Popen(
             ['emulator', '-avd', avd_name, '-port', str(emulator_port), '-no-snapshot', '-wipe-data'],
             stdout=subprocess.PIPE, stderr=subprocess.PIPE
         )
         udid = f"emulator-{emulator_port}"
-        start_time = time.time()
         timeout = 60
-        while time.time() - start_time < timeout:
-            result = subprocess.run(['adb', '-s', udid, 'shell', 'getprop', 'sys.boot_completed'],
-                                    capture_output=True, text=True)
-            if result.stdout.strip() == "1":
-                logger.info(f"Emulator {udid} booted successfully")
-                break
-            time.sleep(2)
-        else:
+        try:
+            latency = wait_for_device(udid, timeout=timeout, abort=lambda: process.poll() is not None, adb=adb)
+        except ReadinessError:
             process.terminate()
             raise RuntimeError(f"Emulator {udid} failed to start within {timeout} seconds")
+        logger.info(f"Emulator {udid} booted successfully in {latency:.1f}s")
 
     yield udid
-    subprocess.run(['adb', '-s', udid, 'emu', 'kill'], check=False)
-    logger.info(f"Emulator {udid} terminated")
+    if emulator_port is None:
+        return  # Not ours: the next session reuses it instead of cold-booting
+    try:
+        adb.emu(udid, "kill")
+        logger.info(f"Emulator {udid} terminated")
+    except (OSError, AdbError) as e:
+        logger.warning(f"Could not stop emulator {udid}: {e}")
+    get_port_allocator().release(emulator_port)
 
-@pytest.fixture(scope="class")
-def driver(emulator_session, pytestconfig):
-    logger.info(f"Setting up driver for UDID: {emulator_session}")
-    apk_path = pytestconfig.getoption("--apk-path") or os.getenv("APK_PATH", str(APK_PATH))
-    worker_id = os.environ.get('PYTEST_XDIST_WORKER', 'master')
-    port_offset = int(worker_id.replace('gw', '')) if worker_id != 'master' else 0
+def _device_daemon(pytestconfig):
+    """Client of the device daemon to lease from: required with a URL, used when it answers with 'auto'."""
+    setting = pytestconfig.getoption("--device-daemon")
+    if setting == "off":
+        return None
+    client = DeviceDaemonClient(DAEMON_URL if setting == "auto" else setting)
+    if client.is_available():
+        return client
+    if setting != "auto":
+        raise RuntimeError(f"No device daemon answers at {setting}")
+    return None
+
+def _worker_port_offset():
+    worker_id = current_worker_id()
+    return int(worker_id.replace('gw', '')) if worker_id != 'master' else 0
+
+@pytest.fixture(scope="session")
+def appium_server_pool(pytestconfig):
+    # Leases are keyed by worker id and each xdist worker is its own process: one server per worker
+    pool = AppiumServerPool(size=1, base_port=4723 + _worker_port_offset())
+    pool.start()
+    yield pool
+    pool.shutdown()
+    if pool.lease_times:
+        logger.info(f"Appium server pool handed out {len(pool.lease_times)} lease(s), "
+                    f"slowest acquisition {max(pool.lease_times):.3f}s")
+
+def _apk_path(pytestconfig):
+    return pytestconfig.getoption("--apk-path") or os.getenv("APK_PATH", str(APK_PATH))
+
+def _create_driver(udid, server_pool, pytestconfig):
+    apk_path = _apk_path(pytestconfig)
+    port_offset = _worker_port_offset()
     driver_obj = Driver(
         appium_port_base=4723 + port_offset,
         system_port_base=8200 + port_offset,
-        udid=emulator_session
+        udid=udid,
+        server_pool=server_pool
     )
     driver_obj.apk_path = apk_path
+    return driver_obj
+
+@pytest.fixture(scope="session")
+def device_captures(pytestconfig):
+    """Background logcat (and screenrecord) rings per device, flushed to Allure when a test fails."""
+    mode = pytestconfig.getoption("--device-capture")
+    if mode == "none":
+        yield None
+        return
+    captures = CaptureManager(video=mode == "video")
+    yield captures
+    captures.stop()
+
+@pytest.fixture(scope="class")
+def device_udid(request, emulator_session, device_captures):
+    """The device this test class runs on: its farm shard, or the session emulator."""
+    farm = request.config.pluginmanager.get_plugin("device_farm")
+    udid = farm.device_for(request.node) if farm else emulator_session
+    if device_captures is not None:
+        device_captures.capture_for(udid)
+    get_event_recorder().set_context(device=udid)
+    return udid
+
+@pytest.fixture(scope="session")
+def shared_driver():
+    """Holds the one Driver per worker whose WebDriver session is reused across test classes."""
+    holder = {}
+    yield holder
+    if "driver" in holder:
+        holder["driver"].stop()
+        logger.info(f"Shared driver stopped for {holder['udid']}")
+
+@pytest.fixture(scope="class")
+def driver(request, device_udid, appium_server_pool, pytestconfig):
+    logger.info(f"Setting up driver for UDID: {device_udid}")
+    if pytestconfig.getoption("--reuse-session"):
+        shared = request.getfixturevalue("shared_driver")
+        if shared.get("udid") != device_udid:
+            # A worker can be handed classes for another farm device; one session per thread
+            if "driver" in shared:
+                shared["driver"].stop()
+            shared.update(udid=device_udid, driver=_create_driver(device_udid, appium_server_pool, pytestconfig))
+        reset_strategy = get_reset_strategy(pytestconfig.getoption("--reset-strategy"))
+        driver_instance = shared["driver"].reuse_session(reset_strategy)
+        logger.info(f"Reusing driver session for {device_udid} (reset: {reset_strategy.name})")
+        yield driver_instance
+        return
+    driver_obj = _create_driver(device_udid, appium_server_pool, pytestconfig)
     driver_instance = driver_obj.get_driver()  # No try-except here, let it raise directly
-    logger.info(f"Driver initialized successfully for {emulator_session}")
+    logger.info(f"Driver initialized successfully for {device_udid}")
     yield driver_instance
     driver_obj.stop()
-    logger.info(f"Driver stopped for {emulator_session}")
+    logger.info(f"Driver stopped for {device_udid}")
+
+@pytest.fixture
+def pages(driver):
+    """Page objects of the current driver, created on first use and shared by every test on that session."""
+    return PageRegistry.for_driver(driver)
+
+@pytest.fixture(scope="session", autouse=True)
+def locator_latency_history(pytestconfig):
+    """Learn per-locator timeouts from earlier runs when --learn-timeouts is set."""
+    if not pytestconfig.getoption("--learn-timeouts"):
+        yield None
+        return
+    history = LatencyHistory()
+    BasePage.latency_history = AsyncBasePage.latency_history = history  # One history for sync and async pages
+    yield history
+    history.save()
+    BasePage.latency_history = AsyncBasePage.latency_history = None
+
+@pytest.fixture(scope="session", autouse=True)
+def visual_comparator(pytestconfig):
+    """Compare screen_shot frames with their baselines when --visual is set."""
+    if not (pytestconfig.getoption("--visual") or pytestconfig.getoption("--update-baselines")):
+        yield None
+        return
+    BasePage.visual_comparator = VisualComparator(update=pytestconfig.getoption("--update-baselines"))
+    yield BasePage.visual_comparator
+    BasePage.visual_comparator.shutdown()
+    BasePage.visual_comparator = None
 
 @pytest.fixture(autouse=True)
 def method_setup(request):
     test_name = request.node.name
+    timings = get_timing_recorder()
+    timings.current_test = request.node.nodeid
+    request.node.capture_started = time.monotonic()
+    if BasePage.visual_comparator is not None:
+        BasePage.visual_comparator.current_test = request.node.nodeid
+    events = get_event_recorder()
+    events.set_context(test=request.node.nodeid)
     logger.info(f"Thread {threading.current_thread().name}: Starting test: {test_name}")
-    yield
+    with events.span("test", test_name) as event:
+        yield
+        event["outcome"] = getattr(request.node, "call_outcome", None)
+    text_summary = timings.text_summary(request.node.nodeid)
+    if "\n" in text_summary:  # More than the header: this test timed actions
+        allure.attach(text_summary, name="Action timings", attachment_type=allure.attachment_type.TEXT)
+    timings.current_test = None
     logger.info(f"Thread {threading.current_thread().name}: Finished test: {test_name}")
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
+    if report.when == "call":
+        item.call_outcome = report.outcome
+        if not _is_unit_test(item):
+            item.config.stash[DEVICE_TESTS_RAN] = True
+    if report.when == "call" and BasePage.visual_comparator is not None:
+        _report_visual_results(item, report)
+    if report.when == "call" or (report.when == "setup" and report.failed):
+        _flush_device_capture(item, report)
     if report.when == "call" and report.failed and hasattr(item, "instance") and hasattr(item.instance, "driver"):
         try:
-            from src.pages.base_page import BasePage
             page = BasePage(item.instance.driver)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             screenshot_name = f"failure_{item.name}_{timestamp}"
-            screenshot_path = page.screen_shot(screenshot_name)
-            if screenshot_path and os.path.exists(screenshot_path):
-                logger.error(f"Test {item.name} failed. Screenshot saved: {screenshot_path}")
-                with open(screenshot_path, "rb") as image_file:
-                    allure.attach(image_file.read(), name="Screenshot", attachment_type=allure.attachment_type.PNG)
+            screenshot = page.capture_screenshot(screenshot_name)
+            if screenshot:
+                logger.error(f"Test {item.name} failed. Screenshot queued: {screenshot_name}")
+                allure.attach(screenshot.png, name="Screenshot", attachment_type=allure.attachment_type.PNG)
                 if "html" in item.config.pluginmanager.list_name_plugin():
                     if not hasattr(report, 'extra'):
                         report.extra = []
-                    report.extra.append(pytest_html.extras.image(screenshot_path))
+                    report.extra.append(pytest_html.extras.image(screenshot.encoded))
         except Exception as e:
             logger.error(f"Failed to capture screenshot: {e}")
 
+def _flush_device_capture(item, report):
+    """Attach the logcat and video window of a failed test; drop what a passed test no longer needs."""
+    captures = item.funcargs.get("device_captures")
+    capture = captures.get(item.funcargs.get("device_udid")) if captures is not None else None
+    if capture is None:
+        return
+    if report.passed:
+        capture.discard(time.monotonic() - WINDOW_BEFORE)
+        return
+    try:
+        time.sleep(WINDOW_AFTER)  # Let the device's last lines and frames arrive
+        window = capture.window(getattr(item, "capture_started", time.monotonic()) - WINDOW_BEFORE)
+        if window.logcat:
+            allure.attach(window.logcat, name=f"logcat {capture.udid}", attachment_type=allure.attachment_type.TEXT)
+        if window.video:
+            mp4 = to_mp4(window.video)
+            if mp4:
+                allure.attach(mp4, name=f"Screen recording {capture.udid}", attachment_type=allure.attachment_type.MP4)
+            else:
+                allure.attach(window.video, name=f"Screen recording {capture.udid} (raw H.264)", extension="h264")
+        logger.info(f"Attached {len(window.logcat)} bytes of logcat and {len(window.video)} bytes of video "
+                    f"for {item.name}")
+    except Exception as e:
+        logger.error(f"Failed to attach device capture: {e}")
+
+def _report_visual_results(item, report):
+    """Attach diffs of frames that no longer match their baseline and fail the test on them."""
+    mismatches = []
+    for result in BasePage.visual_comparator.results(item.nodeid):
+        if not result.failed:
+            continue
+        mismatches.append(result.describe())
+        if result.diff_png:
+            allure.attach(result.diff_png, name=f"Visual diff: {result.name}", attachment_type=allure.attachment_type.PNG)
+        if os.path.exists(result.baseline):
+            allure.attach.file(result.baseline, name=f"Baseline: {result.name}", attachment_type=allure.attachment_type.PNG)
+    if mismatches and report.passed:
+        report.outcome = "failed"
+        report.longrepr = "Visual regression:\n" + "\n".join(mismatches)
+
 def pytest_addoption(parser):
-    parser.addoption("--apk-path", action="store", default=None, help="Path to the APK file")
\ No newline at end of file
+    parser.addoption("--apk-path", action="store", default=None, help="Path to the APK file")
+    parser.addoption("--reuse-session", action="store_true", default=os.getenv("REUSE_SESSION") == "1",
+                     help="Keep one WebDriver session per worker and reset the app between test classes")
+    parser.addoption("--reset-strategy", action="store", default=os.getenv("RESET_STRATEGY", "restart"),
+                     choices=sorted(RESET_STRATEGIES), help="App reset used between classes with --reuse-session")
+    parser.addoption("--device-farm", action="store_true", default=False,
+                     help="Shard test classes across all connected devices (use with -n N --dist loadgroup)")
+    parser.addoption("--learn-timeouts", action="store_true", default=os.getenv("LEARN_TIMEOUTS") == "1",
+                     help="Use per-locator timeouts learned from find latencies of earlier runs")
+    parser.addoption("--async-logging", action="store_true", default=os.getenv("ASYNC_LOGGING") == "1",
+                     help="Write logs from a background thread through a bounded queue (or set ASYNC_LOGGING=1)")
+    parser.addoption("--reruns", action="store", type=int, default=int(os.getenv("RERUNS", "0")),
+                     help="Rerun a failed test up to N times on the same warm session")
+    parser.addoption("--rerun-budget", action="store", type=int, default=int(os.getenv("RERUN_BUDGET", "10")),
+                     help="Maximum number of reruns per worker")
+    parser.addoption("--rerun-delay", action="store", type=float, default=1.0,
+                     help="Seconds before the first rerun; doubles for every further attempt")
+    parser.addoption("--impacted-since", action="store", default=os.getenv("IMPACT_BASE") or None,
+                     help="Run only the device tests affected by changes since this git ref (or set IMPACT_BASE)")
+    parser.addoption("--impact-scope", action="store", default="class", choices=["class", "test"],
+                     help="Select whole test classes (they share app state) or single tests with --impacted-since")
+    parser.addoption("--no-step-recovery", action="store_true", default=False,
+                     help="Fail element lookups immediately instead of trying re-find, popup dismissal and scrolling")
+    parser.addoption("--visual", action="store_true", default=os.getenv("VISUAL_DIFF") == "1",
+                     help="Compare screen_shot frames with baselines per test, device and resolution")
+    parser.addoption("--update-baselines", action="store_true", default=False,
+                     help="Record screen_shot frames as the new visual baselines")
+    parser.addoption("--device-capture", action="store", default=os.getenv("DEVICE_CAPTURE", "logcat"),
+                     choices=["none", "logcat", "video"],
+                     help="Stream logcat (and screenrecord with 'video') per device into memory; attached on failure")
+    parser.addoption("--event-log", action="store_true", default=os.getenv("EVENT_LOG") == "1",
+                     help="Write the JSONL event log and Chrome trace of the run to logs/events")
+    parser.addoption("--device-daemon", action="store", default=os.getenv("DEVICE_DAEMON", "auto"),
+                     help="Lease devices from the device daemon: 'auto' (when DEVICE_DAEMON_URL answers), 'off' or a URL")
+    parser.addoption("--device-lease-wait", action="store", type=float, default=300,
+                     help="Seconds to wait for a free device from the device daemon")
@@ -11,8 +11,8 @@ from src.pages.base_page import BasePage
 @pytest.mark.usefixtures("driver")  # Ensure driver is available
 class TestContactForm:
     @pytest.fixture(autouse=True)
-    def setup(self, driver):
-        self.cf = ContactForm(driver)
+    def setup(self, pages):
+        self.cf = pages.get(ContactForm)
         self.assertions = Assertions()
 
     @pytest.fixture
@@ -60,13 +60,8 @@ class TestContactForm:
         fake_address = fake.address().replace("\n", ", ")
         fake_phone = fake.phone_number()
 
-        self.cf.enter_name(fake_name)
-        #name_value = self.cf.get_element_attribute(self.cf._enter_name, "id", "text")
-        #assert_that(name_value).is_not_empty().is_equal_to(fake_name)
-        self.cf.enter_email(fake_email)
-        self.cf.enter_address(fake_address)
-        self.cf.enter_mobile_number(fake_phone)
+        self.cf.fill_contact_form(fake_name, fake_email, fake_address, fake_phone)  # Verifies every field
         self.cf.click_submit_button()
-        self.cf.screen_shot("contact_form_submission")
+        self.cf.screen_shot("contact_form_submission", masks=[self.cf.input_fields])  # Faker data differs per run
 
 
@@ -7,9 +7,9 @@ from src.pages.login_page import LoginPage
 
 class TestLogin:
     @pytest.fixture(autouse=True)
-    def setup(self, driver):
-        self.lp = LoginPage(driver)
-        self.bp = BasePage(driver)
+    def setup(self, pages):
+        self.lp = pages.get(LoginPage)
+        self.bp = pages.get(BasePage)
 
     def ensure_login_screen(self):
         if not self.bp.is_displayed("Btn6", "accessibility_id", timeout=5):
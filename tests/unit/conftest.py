@@ -0,0 +1,28 @@
+# AppiumFramework/tests/unit/conftest.py
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def emulator_session():
+    """Unit tests run against fakes, so no emulator is booted for them."""
+    yield None
+
+
+class FakeCache:
+    """The get/set part of pytest's config.cache, kept in a dict."""
+
+    def __init__(self, data=None):
+        self.data = data or {}
+
+    def get(self, key, default):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+
+@pytest.fixture
+def fake_cache():
+    """Factory for FakeCache; pass a dict to start from existing cache entries."""
+    return FakeCache
@@ -0,0 +1,231 @@
+# AppiumFramework/tests/unit/test_adb_client.py
+
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+import pytest
+
+from src.utilities import adb_client
+from src.utilities.adb_client import AdbClient, AdbError
+from src.utilities.readiness import BOOT_WATCH, wait_for_device
+
+
+class FakeAdbServer(socketserver.ThreadingTCPServer):
+    """Speaks enough of the adb server protocol for host queries, device tracking and shell."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, devices=None, properties=None, shell_v2=True):
+        super().__init__(("127.0.0.1", 0), FakeAdbHandler)
+        self.devices = dict(devices or {})
+        self.properties = properties or {}
+        self.shell_v2 = shell_v2
+        self.booted = set()
+        self.requests = []
+        self.changed = threading.Condition()
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def set_state(self, serial, state):
+        with self.changed:
+            if state is None:
+                self.devices.pop(serial, None)
+            else:
+                self.devices[serial] = state
+            self.changed.notify_all()
+
+    def device_list(self):
+        return "".join(f"{serial}\t{state}\n" for serial, state in sorted(self.devices.items()))
+
+    def run_shell(self, serial, command):
+        if command == BOOT_WATCH:
+            return ("", "", 0) if serial in self.booted else ("", "", 1)
+        if command.startswith("getprop"):
+            name = command[len("getprop"):].strip()
+            if name:
+                return self.properties.get(name, "") + "\n", "", 0
+            return "".join(f"[{key}]: [{value}]\n" for key, value in self.properties.items()), "", 0
+        if command.startswith("exit "):
+            return "", "bye\n", int(command.split()[1])
+        return f"ran {command}\n", "", 0
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class FakeAdbHandler(socketserver.BaseRequestHandler):
+    def _read_request(self):
+        length = int(self._recv(4), 16)
+        return self._recv(length).decode()
+
+    def _recv(self, size):
+        data = b""
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("client went away")
+            data += chunk
+        return data
+
+    def _message(self, text):
+        data = text.encode()
+        self.request.sendall(b"%04x" % len(data) + data)
+
+    def _fail(self, text):
+        self.request.sendall(b"FAIL")
+        self._message(text)
+
+    def handle(self):
+        server = self.server
+        try:
+            request = self._read_request()
+        except ConnectionError:
+            return
+        server.requests.append(request)
+        if request == "host:version":
+            self.request.sendall(b"OKAY")
+            self._message("0029")
+        elif request == "host:devices":
+            self.request.sendall(b"OKAY")
+            self._message(server.device_list())
+        elif request == "host:track-devices":
+            self.request.sendall(b"OKAY")
+            with server.changed:
+                while True:
+                    try:
+                        self._message(server.device_list())
+                    except OSError:
+                        return
+                    server.changed.wait()
+        elif request.startswith("host:transport:"):
+            serial = request.split(":", 2)[2]
+            if server.devices.get(serial) != "device":
+                self._fail(f"device '{serial}' not found")
+                return
+            self.request.sendall(b"OKAY")
+            service = self._read_request()
+            server.requests.append(service)
+            if service.startswith("shell,v2,raw:"):
+                if not server.shell_v2:
+                    self._fail("closed")
+                    return
+                self.request.sendall(b"OKAY")
+                stdout, stderr, code = server.run_shell(serial, service.split(":", 1)[1])
+                for packet_id, data in ((1, stdout.encode()), (2, stderr.encode()), (3, bytes([code]))):
+                    if data:
+                        self.request.sendall(struct.pack("<BI", packet_id, len(data)) + data)
+            elif service.startswith("shell:"):
+                self.request.sendall(b"OKAY")
+                command, _, _ = service[len("shell:"):].rpartition("; echo ")
+                stdout, stderr, code = server.run_shell(serial, command)
+                self.request.sendall(f"{stdout}{stderr}{adb_client.LEGACY_EXIT_MARKER}{code}\r\n".encode())
+        else:
+            self._fail(f"unknown host service {request}")
+
+
+@pytest.fixture
+def server():
+    server = FakeAdbServer({"emulator-5554": "device", "emulator-5556": "offline"},
+                           {"sys.boot_completed": "1", "ro.build.version.sdk": "34"})
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(server):
+    client = AdbClient(port=server.port, timeout=2)
+    yield client
+    if client._tracker is not None:
+        client._tracker.stop()
+
+
+def test_host_queries(client, server):
+    assert client.version() == 41
+    assert client.devices() == {"emulator-5554": "device", "emulator-5556": "offline"}
+
+
+def test_shell_v2_separates_streams_and_exit_code(client):
+    assert client.shell("emulator-5554", "echo hi") == ("ran echo hi\n", "", 0)
+    assert client.shell("emulator-5554", "exit 3") == ("", "bye\n", 3)
+
+
+def test_shell_stream_yields_stdout_until_exit(client):
+    stream = client.shell_stream("emulator-5554", "logcat -v threadtime")
+    assert list(stream) == [b"ran logcat -v threadtime\n"]
+    assert stream.exit_code == 0
+    stream.close()
+
+
+def test_legacy_shell_fallback(server):
+    server.shell_v2 = False
+    result = AdbClient(port=server.port, timeout=2).shell("emulator-5554", "exit 2")
+    assert result.exit_code == 2
+    assert "bye" in result.stdout
+
+
+def test_properties(client):
+    assert client.getprop("emulator-5554", "ro.build.version.sdk") == "34"
+    assert client.properties("emulator-5554") == {"sys.boot_completed": "1", "ro.build.version.sdk": "34"}
+
+
+def test_unknown_device_is_an_adb_error(client):
+    with pytest.raises(AdbError, match="not found"):
+        client.shell("emulator-9999", "true")
+
+
+def test_tracker_follows_device_changes_on_one_connection(client, server):
+    threading.Timer(0.1, server.set_state, ("emulator-5556", "device")).start()
+    assert client.wait_for_state("emulator-5556", "device", timeout=2) >= 0.05
+    server.set_state("emulator-5554", None)
+    deadline = time.monotonic() + 2
+    while "emulator-5554" in client.tracker().states and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert "emulator-5554" not in client.tracker().states
+    assert server.requests.count("host:track-devices") == 1
+
+
+def test_wait_for_state_times_out(client):
+    with pytest.raises(TimeoutError, match="offline"):
+        client.wait_for_state("emulator-5556", "device", timeout=0.1)
+
+
+def test_wait_for_device_boots_through_the_client(client, server):
+    server.set_state("emulator-5558", "offline")
+    threading.Timer(0.1, server.set_state, ("emulator-5558", "device")).start()
+    threading.Timer(0.2, server.booted.add, ("emulator-5558",)).start()
+    assert wait_for_device("emulator-5558", timeout=5, adb=client, attempt_timeout=1) >= 0.2
+
+
+def test_emulator_console_kill_with_auth(tmp_path, monkeypatch):
+    token_file = tmp_path / "token"
+    token_file.write_text("secret\n")
+    monkeypatch.setattr(adb_client, "CONSOLE_TOKEN_FILE", token_file)
+    received = []
+    listener = socket.create_server(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+
+    def console():
+        connection, _ = listener.accept()
+        with connection, connection.makefile("r", newline="\n") as reader:
+            connection.sendall(b"Android Console: Authentication required\r\nOK\r\n")
+            for line in reader:
+                received.append(line.strip())
+                if line.startswith("auth"):
+                    connection.sendall(b"OK\r\n")
+                elif line.startswith("kill"):
+                    connection.sendall(b"OK: killing emulator, bye bye\r\n")
+                    return
+
+    threading.Thread(target=console, daemon=True).start()
+    reply = AdbClient().emu(f"emulator-{port}", "kill")
+    listener.close()
+    assert received == ["auth secret", "kill"]
+    assert "killing emulator" in reply
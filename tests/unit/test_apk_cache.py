@@ -0,0 +1,137 @@
+# AppiumFramework/tests/unit/test_apk_cache.py
+
+import hashlib
+import subprocess
+import threading
+import time
+
+import pytest
+
+from src.config.constants import APP_ACTIVITY, APP_PACKAGE
+from src.drivers.driver_class import Driver
+from src.utilities import apk_cache
+from src.utilities.adb_client import ShellResult
+from src.utilities.apk_cache import INSTALLED_DIGEST, ApkInstaller
+from src.utilities.command_runner import CommandRunner
+
+
+class FakeAdb(CommandRunner):
+    """Devices keyed by serial, each holding {package: apk bytes}; install copies the host file.
+
+    Doubles as the runner (adb install) and the adb client (the installed base.apk digest).
+    """
+
+    def __init__(self, devices, install_delay=0.0):
+        self.devices = devices
+        self.install_delay = install_delay
+        self.calls = []
+        self.active_installs = 0
+        self.max_parallel_installs = 0
+        self._lock = threading.Lock()
+
+    # AdbClient interface
+    def shell(self, serial, command, timeout=None):
+        serial = serial or next(iter(self.devices))
+        self.calls.append((serial, "shell"))
+        package = command.split("pm path ")[1].split()[0]
+        packages = self.devices[serial]
+        if package not in packages:
+            return ShellResult("", "", 1)
+        return ShellResult(f"{hashlib.sha256(packages[package]).hexdigest()}  /data/app/{package}/base.apk\n", "", 0)
+
+    def run(self, cmd, **kwargs):
+        udid = cmd[cmd.index("-s") + 1] if "-s" in cmd else next(iter(self.devices))
+        args = cmd[3:] if "-s" in cmd else cmd[1:]
+        self.calls.append((udid, args[0]))
+        packages = self.devices[udid]
+        if args[0] == "install":
+            with self._lock:
+                self.active_installs += 1
+                self.max_parallel_installs = max(self.max_parallel_installs, self.active_installs)
+            time.sleep(self.install_delay)
+            with open(args[-1], "rb") as apk:
+                packages[APP_PACKAGE] = apk.read()
+            with self._lock:
+                self.active_installs -= 1
+            return subprocess.CompletedProcess(cmd, 0, stdout="Performing Streamed Install\nSuccess\n", stderr="")
+        raise AssertionError(f"unexpected adb call {cmd}")
+
+    def count(self, kind):
+        return sum(1 for _, call in self.calls if call == kind)
+
+
+@pytest.fixture
+def apk(tmp_path):
+    path = tmp_path / "app.apk"
+    path.write_bytes(b"apk build 2")
+    return str(path)
+
+
+def test_matching_build_is_not_reinstalled(apk):
+    adb = FakeAdb({"emulator-5554": {APP_PACKAGE: b"apk build 2"}})
+    installer = ApkInstaller(adb, adb=adb)
+    assert installer.ensure_installed("emulator-5554", apk, APP_PACKAGE) is False
+    assert installer.ensure_installed("emulator-5554", apk, APP_PACKAGE) is False
+    assert adb.count("install") == 0
+    assert adb.count("shell") == 1  # The second call is answered from memory
+
+
+def test_missing_or_stale_build_is_installed(apk):
+    adb = FakeAdb({"emulator-5554": {}, "emulator-5556": {APP_PACKAGE: b"apk build 1"}})
+    installer = ApkInstaller(adb, adb=adb)
+    assert installer.ensure_installed("emulator-5554", apk, APP_PACKAGE) is True
+    assert installer.ensure_installed("emulator-5556", apk, APP_PACKAGE) is True
+    assert adb.devices["emulator-5556"][APP_PACKAGE] == b"apk build 2"
+    assert installer.installs == 2
+
+
+def test_only_base_apk_of_a_split_install_is_hashed():
+    fake_tools = ('pm() { printf "package:/data/app/p/base.apk\\npackage:/data/app/p/split_config.xxhdpi.apk\\n"; }; '
+                  'sha256sum() { echo "hash-of $1"; }; ')
+    result = subprocess.run(["sh", "-c", fake_tools + INSTALLED_DIGEST.format(package=APP_PACKAGE)],
+                            capture_output=True, text=True)
+    assert result.stdout == "hash-of /data/app/p/base.apk\n"
+
+
+def test_apk_is_hashed_once(apk, monkeypatch):
+    hashed = []
+    original = apk_cache._sha256_file
+    monkeypatch.setattr(apk_cache, "_sha256_file", lambda path: hashed.append(path) or original(path))
+    adb = FakeAdb({"a": {}, "b": {}, "c": {}})
+    installer = ApkInstaller(adb, adb=adb)
+    installer.ensure_installed_on(["a", "b", "c"], apk, APP_PACKAGE)
+    assert hashed == [apk]
+
+
+def test_installs_run_in_parallel_across_devices(apk):
+    adb = FakeAdb({"a": {}, "b": {}, "c": {APP_PACKAGE: b"apk build 2"}}, install_delay=0.2)
+    results = ApkInstaller(adb, max_workers=4, adb=adb).ensure_installed_on(["a", "b", "c"], apk, APP_PACKAGE)
+    assert results == {"a": True, "b": True, "c": False}
+    assert adb.max_parallel_installs == 2
+
+
+def test_failed_install_raises(apk):
+    class FailingAdb(FakeAdb):
+        def run(self, cmd, **kwargs):
+            if "install" in cmd:
+                return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="INSTALL_FAILED_INSUFFICIENT_STORAGE")
+            return super().run(cmd, **kwargs)
+
+    with pytest.raises(RuntimeError, match="INSUFFICIENT_STORAGE"):
+        adb = FailingAdb({"a": {}})
+        ApkInstaller(adb, adb=adb).ensure_installed("a", apk, APP_PACKAGE)
+
+
+def test_driver_launches_installed_app_by_package(apk, monkeypatch):
+    adb = FakeAdb({"emulator-5554": {}})
+    monkeypatch.setattr(apk_cache, "_installer", ApkInstaller(adb, adb=adb))
+    driver_obj = Driver(udid="emulator-5554")
+    driver_obj.apk_path = apk
+    try:
+        driver_obj._prepare_app()
+    finally:
+        driver_obj.release_ports()
+    assert "app" not in driver_obj.capabilities
+    assert driver_obj.capabilities["appPackage"] == APP_PACKAGE
+    assert driver_obj.capabilities["appActivity"] == APP_ACTIVITY
+    assert adb.count("install") == 1
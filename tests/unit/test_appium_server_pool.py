@@ -0,0 +1,109 @@
+# AppiumFramework/tests/unit/test_appium_server_pool.py
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.drivers.appium_server_pool import AppiumServerPool
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/status" and self.server.healthy:
+            body = b'{"value": {"ready": true}}'
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeAppiumServer:
+    """Stand-in for AppiumService that only answers /status."""
+
+    def __init__(self, host, port):
+        self.httpd = ThreadingHTTPServer((host, port), _StatusHandler)
+        self.httpd.healthy = True
+        self.is_running = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.is_running = False
+
+
+class FakeLauncher:
+    def __init__(self):
+        self.launched = []
+
+    def __call__(self, host, port):
+        server = FakeAppiumServer(host, port)
+        self.launched.append(server)
+        return server
+
+
+@pytest.fixture
+def launcher():
+    return FakeLauncher()
+
+
+@pytest.fixture
+def pool(launcher):
+    pool = AppiumServerPool(size=2, host="127.0.0.1", base_port=47230, launcher=launcher, start_timeout=5)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_start_prewarms_every_server(pool, launcher):
+    assert len(launcher.launched) == 2
+    assert all(server.is_running for server in launcher.launched)
+
+
+def test_leases_are_keyed_by_worker(pool):
+    first = pool.acquire("gw0")
+    again = pool.acquire("gw0")
+    other = pool.acquire("gw1")
+    assert first is again
+    assert first.port != other.port
+    assert len(pool.lease_times) == 2
+    assert all(seconds >= 0 for seconds in pool.lease_times)
+
+
+def test_release_keeps_server_running_for_next_lease(pool, launcher):
+    lease = pool.acquire("gw0")
+    pool.release(lease)
+    assert all(server.is_running for server in launcher.launched)
+    assert pool.acquire("gw1").port in {server.port for server in pool._servers}
+    assert len(launcher.launched) == 2
+
+
+def test_unhealthy_server_is_replaced_on_acquire(pool, launcher):
+    for server in launcher.launched:
+        server.httpd.healthy = False
+    lease = pool.acquire("gw0")
+    assert len(launcher.launched) == 3
+    assert lease.server.handle is launcher.launched[-1]
+    assert lease.server.is_healthy()
+
+
+def test_acquire_times_out_when_pool_is_exhausted(pool):
+    pool.acquire("gw0")
+    pool.acquire("gw1")
+    with pytest.raises(RuntimeError):
+        pool.acquire("gw2", timeout=0.1)
+
+
+def test_shutdown_stops_all_servers(launcher):
+    pool = AppiumServerPool(size=1, host="127.0.0.1", base_port=47240, launcher=launcher, start_timeout=5)
+    pool.acquire("gw0")
+    pool.shutdown()
+    assert not any(server.is_running for server in launcher.launched)
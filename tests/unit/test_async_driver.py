@@ -0,0 +1,83 @@
+# AppiumFramework/tests/unit/test_async_driver.py
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from benchmarks.fake_appium import FakeAppiumServer
+from src.drivers.async_driver import AsyncW3CClient, w3c_capabilities
+from src.pages.async_base_page import AsyncBasePage
+from src.pages.async_login_page import AsyncLoginPage
+
+CAPABILITIES = {"platformName": "Android", "automationName": "UiAutomator2", "udid": None}
+
+
+def test_capabilities_get_the_appium_prefix():
+    assert w3c_capabilities({"platformName": "Android", "automationName": "UiAutomator2", "udid": None,
+                             "appium:systemPort": 8200}) == \
+        {"platformName": "Android", "appium:automationName": "UiAutomator2", "appium:systemPort": 8200}
+
+
+def test_login_flow_runs_on_ten_devices_concurrently():
+    devices = 10
+
+    async def sweep(server):
+        async with AsyncW3CClient(pool_size=devices) as client:
+            drivers = await client.new_sessions(
+                [(server.url, dict(CAPABILITIES, udid=f"emulator-{5554 + 2 * index}")) for index in range(devices)])
+            try:
+                started = time.monotonic()
+                await asyncio.gather(*(AsyncLoginPage(driver).login("admin@gmail.com", "admin123")
+                                       for driver in drivers))
+                return time.monotonic() - started, drivers
+            finally:
+                await asyncio.gather(*(driver.quit() for driver in drivers))
+
+    with FakeAppiumServer(latency=0.02) as server:
+        elapsed, drivers = asyncio.run(sweep(server))
+        assert server.sessions == {}
+    assert len({driver.session_id for driver in drivers}) == devices
+    assert drivers[3].capabilities["appium:udid"] == "emulator-5560"
+    # One flow is ~9 commands of 20 ms; run one device after another it would take ten times as long
+    assert elapsed < 9 * 0.02 * devices / 2
+
+
+def test_page_actions_share_locators_and_cache_with_the_sync_pages():
+    async def scenario(server):
+        async with AsyncW3CClient() as client:
+            driver = await client.new_session(server.url, CAPABILITIES)
+            page = AsyncBasePage(driver)
+            assert await page.get_element_text("com.code2lead.kwad:id/Tv1", "id") == "KWAD"
+            assert await page.get_element_text("com.code2lead.kwad:id/Tv1", "id") == "KWAD"
+            assert page.element_cache.stats()["hits"] == 1
+            assert await page.is_present("Btn6", "accessibility_id")
+            login = AsyncLoginPage(driver)
+            await login.click_login_button()
+            await login.enter_email("user@example.com")
+            assert await login.get_element_attribute(login._email_input) == "user@example.com"
+            await page.keyCode(4)
+            assert await page.is_displayed("KWAD", "text")
+            assert not await page.is_displayed("Enter Admin", "text", fail_fast=True)
+            with pytest.raises(TimeoutException):
+                await page.wait_for_element("Missing", "accessibility_id", timeout=0.1)
+            with pytest.raises(NoSuchElementException):
+                await driver.find_element("accessibility id", "Missing")
+            await driver.quit()
+
+    with FakeAppiumServer() as server:
+        asyncio.run(scenario(server))
+        assert server.commands["find_element"] >= 5
+
+
+def test_failed_session_start_quits_the_sessions_that_did_start():
+    async def scenario(server):
+        async with AsyncW3CClient() as client:
+            with pytest.raises(aiohttp.ClientError):
+                await client.new_sessions([(server.url, CAPABILITIES), ("http://127.0.0.1:9", CAPABILITIES)])
+
+    with FakeAppiumServer() as server:
+        asyncio.run(scenario(server))
+        assert server.sessions == {}
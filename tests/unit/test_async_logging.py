@@ -0,0 +1,48 @@
+# AppiumFramework/tests/unit/test_async_logging.py
+
+import logging
+import queue
+from pathlib import Path
+
+import pytest
+
+from src.utilities.custom_logger import BoundedQueueHandler, CustomLogger
+
+
+def _record(message):
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+@pytest.mark.parametrize("overflow, kept", [("drop_oldest", ["b", "c"]), ("drop_new", ["a", "b"])])
+def test_overflow_policy_when_buffer_is_full(overflow, kept):
+    handler = BoundedQueueHandler(queue.Queue(2), overflow)
+    for message in ("a", "b", "c"):
+        handler.emit(_record(message))
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == kept
+    assert handler.dropped == 1
+
+
+def test_records_are_formatted_lazily_on_the_writer_thread():
+    handler = BoundedQueueHandler(queue.Queue(), "drop_new")
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "Sent text '%s' to %s", ("x", "Et4"), None)
+    handler.emit(record)
+    queued = handler.queue.get_nowait()
+    assert queued.args == ("x", "Et4")
+    assert queued.getMessage() == "Sent text 'x' to Et4"
+
+
+def test_enable_async_rewires_existing_loggers_and_flushes(tmp_path, monkeypatch):
+    monkeypatch.setattr(CustomLogger, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(CustomLogger, "DEFAULT_LOG_FILE", tmp_path / "framework.log")
+    logger = CustomLogger.get_logger("tests.unit.async_logging")
+    try:
+        queue_handler = CustomLogger.enable_async()
+        assert logger.handlers == [queue_handler]
+        assert CustomLogger.get_logger("tests.unit.async_logging.late").handlers == [queue_handler]
+        logger.info("Element found with %s: %s", "id", "com.code2lead.kwad:id/Et4")
+        CustomLogger.flush()
+        assert "Element found with id: com.code2lead.kwad:id/Et4" in Path(tmp_path / "framework.log").read_text()
+    finally:
+        CustomLogger.disable_async()
+    assert CustomLogger._queue_handler is None
+    assert not any(isinstance(handler, BoundedQueueHandler) for handler in logger.handlers)
@@ -0,0 +1,127 @@
+# AppiumFramework/tests/unit/test_device_capture.py
+
+import threading
+import time
+
+from src.utilities.device_capture import LOGCAT_COMMAND, DeviceCapture, H264Ring, RingBuffer
+
+SPS, PPS = b"\x00\x00\x00\x01\x67sps", b"\x00\x00\x00\x01\x68pps"
+
+
+def idr(n):
+    return b"\x00\x00\x00\x01\x65" + b"I%d" % n * 20
+
+
+def p_frame(n):
+    return b"\x00\x00\x01\x41" + b"P%d" % n * 10
+
+
+class FakeStream:
+    """Yields scripted chunks, then blocks like a live logcat until closed."""
+
+    def __init__(self, chunks, block=True):
+        self.chunks = chunks
+        self.block = block
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        yield from self.chunks
+        if self.block:
+            self.closed.wait(5)
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeAdb:
+    def __init__(self, *scripts):
+        self.scripts = list(scripts)
+        self.commands = []
+        self.streams = []
+
+    def shell_stream(self, serial, command):
+        self.commands.append((serial, command))
+        chunks, block = self.scripts.pop(0) if self.scripts else ([], True)
+        stream = FakeStream(chunks, block)
+        self.streams.append(stream)
+        return stream
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_ring_buffer_keeps_the_newest_bytes():
+    ring = RingBuffer(max_bytes=10)
+    for second, data in enumerate([b"aaaa", b"bbbb", b"cccc"]):
+        ring.append(data, timestamp=second)
+    assert ring.since(0) == b"bbbbcccc"
+    assert ring.since(2) == b"cccc"
+    assert ring.dropped == 4
+    ring.discard(before=2)
+    assert ring.size == 4
+
+
+def test_video_windows_start_with_the_header_and_a_keyframe():
+    stream = SPS + PPS + idr(1) + p_frame(1) + p_frame(2) + idr(2) + p_frame(3) + idr(3) + p_frame(4)
+    gop_starts = {stream.index(idr(2)): 20.0, stream.index(idr(3)): 30.0}
+    ring = H264Ring(max_bytes=1 << 20)
+    clock = 10.0
+    for offset in range(0, len(stream), 7):  # Start codes and NAL headers split across chunks
+        clock = max([clock] + [time for start, time in gop_starts.items() if start < offset + 7])
+        ring.feed(stream[offset:offset + 7], timestamp=clock)
+    assert ring.header == SPS + PPS
+    assert ring.since(0) == SPS + PPS + stream[len(SPS + PPS):]
+    assert ring.since(25) == SPS + PPS + idr(2) + p_frame(3) + idr(3) + p_frame(4)
+    assert ring.since(35) == SPS + PPS + idr(3) + p_frame(4)
+
+
+def test_video_ring_drops_whole_gops():
+    ring = H264Ring(max_bytes=len(idr(0) + p_frame(0)) * 2)
+    ring.feed(SPS + PPS, timestamp=0)
+    for n in range(6):
+        ring.feed(idr(n) + p_frame(n), timestamp=n)
+    window = ring.since(0)
+    assert window.startswith(SPS + PPS + idr(3))
+    assert idr(2) not in window
+
+
+def test_logcat_is_buffered_in_whole_lines():
+    adb = FakeAdb(([b"10-17 12:00:00.000  123  123 I Act", b"ivityManager: start\n10-17 12:00:0",
+                    b"1.000  123  123 E App: crash\npartial"], True))
+    capture = DeviceCapture("emulator-5554", adb=adb).start()
+    try:
+        wait_for(lambda: b"crash" in capture.window(0).logcat)
+        assert capture.window(0).logcat.splitlines() == [b"10-17 12:00:00.000  123  123 I ActivityManager: start",
+                                                         b"10-17 12:00:01.000  123  123 E App: crash"]
+        assert capture.window(0).video == b""
+        assert adb.commands == [("emulator-5554", LOGCAT_COMMAND)]
+    finally:
+        capture.stop()
+    assert adb.streams[0].closed.is_set()
+
+
+def test_streams_are_restarted_when_they_end():
+    adb = FakeAdb(([b"first\n"], False), ([b"second\n"], True))
+    capture = DeviceCapture("emulator-5554", adb=adb)
+    capture._readers[0].retry_delay = 0.01
+    capture.start()
+    try:
+        wait_for(lambda: b"second" in capture.window(0).logcat)
+        assert capture.window(0).logcat == b"first\nsecond\n"
+    finally:
+        capture.stop()
+
+
+def test_video_capture_runs_screenrecord():
+    adb = FakeAdb(([b""], True), ([SPS + PPS + idr(1) + p_frame(1)], True))
+    capture = DeviceCapture("emulator-5554", adb=adb, video=True).start()
+    try:
+        wait_for(lambda: capture.window(0).video)
+        assert capture.window(0).video == SPS + PPS + idr(1) + p_frame(1)
+        assert any(command.startswith("screenrecord --output-format=h264") for _, command in adb.commands)
+    finally:
+        capture.stop()
@@ -0,0 +1,148 @@
+# AppiumFramework/tests/unit/test_device_daemon.py
+
+import threading
+import time
+
+import pytest
+
+from src.utilities.adb_client import AdbError, ShellResult
+from src.utilities.device_daemon import DeviceDaemon, DeviceDaemonClient, DevicePool
+
+
+class FakeAdb:
+    """Attached devices that answer pm clear, the snapshot console command and the boot watch."""
+
+    def __init__(self, serials=("emulator-5554", "emulator-5556"), snapshots=True):
+        self.serials = serials
+        self.snapshots = snapshots
+        self.avd_names = {}
+        self.commands = []
+        self._lock = threading.Lock()
+
+    def devices(self):
+        return {serial: "device" for serial in self.serials}
+
+    def shell(self, serial, command, timeout=None):
+        with self._lock:
+            self.commands.append((serial, command))
+        return ShellResult("Success\n", "", 0)
+
+    def emu(self, serial, command, timeout=10.0):
+        if command == "avd name":
+            return f"{self.avd_names.get(serial, 'Pixel_8')}\nOK"
+        if not self.snapshots:
+            raise AdbError("Emulator console: snapshot 'golden' does not exist")
+        with self._lock:
+            self.commands.append((serial, command))
+        return "OK"
+
+    def wait_for_state(self, serial, state="device", timeout=60):
+        return 0.0
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def adb():
+    return FakeAdb()
+
+
+@pytest.fixture
+def daemon(adb):
+    daemon = DeviceDaemon(port=0, pool=DevicePool(adb, app_package="com.code2lead.kwad")).start()
+    yield daemon
+    daemon.stop()
+
+
+def test_leases_hand_out_each_device_once_and_clear_it_on_release(daemon, adb):
+    client = DeviceDaemonClient(daemon.url)
+    assert client.is_available()
+    first, second = client.acquire("gw0", wait=0), client.acquire("gw1", wait=0)
+    assert {first.udid, second.udid} == {"emulator-5554", "emulator-5556"}
+    with pytest.raises(RuntimeError, match="No idle device"):
+        client.acquire("gw2", wait=0)
+    waiting = {}
+    waiter = threading.Thread(target=lambda: waiting.setdefault("lease", client.acquire("gw2", wait=5)))
+    waiter.start()
+    first.release()
+    waiter.join(timeout=5)
+    assert waiting["lease"].udid == first.udid
+    assert (first.udid, "pm clear com.code2lead.kwad") in adb.commands
+    states = {device["udid"]: (device["state"], device["owner"]) for device in client.devices()}
+    assert states == {first.udid: ("leased", "gw2"), second.udid: ("leased", "gw1")}
+
+
+def test_lease_of_a_vanished_holder_is_reclaimed():
+    pool = DevicePool(FakeAdb(serials=("emulator-5554",)), lease_ttl=0.05)
+    pool.add("emulator-5554")
+    lease = pool.acquire("killed run")
+    assert pool.acquire("next run", wait=0) is None
+    time.sleep(0.1)
+    assert pool.acquire("next run", wait=2)["udid"] == "emulator-5554"
+    assert not pool.renew(lease["lease"])
+    pool.close()
+
+
+def test_heartbeat_keeps_the_lease_alive(adb):
+    pool = DevicePool(adb, lease_ttl=0.3)
+    daemon = DeviceDaemon(port=0, pool=pool).start()
+    try:
+        client = DeviceDaemonClient(daemon.url)
+        lease = client.acquire("gw0", wait=0, ttl=0.3).start_heartbeat()
+        time.sleep(0.8)
+        assert [device["owner"] for device in client.devices() if device["udid"] == lease.udid] == ["gw0"]
+        lease.release()
+        wait_until(lambda: all(device["state"] == "idle" for device in client.devices()))
+    finally:
+        daemon.stop()
+
+
+def test_snapshot_reset_restores_the_golden_snapshot_or_falls_back_to_clear():
+    adb = FakeAdb(serials=("emulator-5554",))
+    pool = DevicePool(adb, reset="snapshot", app_package="com.code2lead.kwad")
+    pool.add("emulator-5554")
+    pool.release(pool.acquire("gw0")["lease"])
+    wait_until(lambda: pool.status()[0]["state"] == "idle")
+    assert adb.commands[0] == ("emulator-5554", "avd snapshot load golden")
+    adb.snapshots = False
+    adb.commands.clear()
+    pool.release(pool.acquire("gw0")["lease"])
+    wait_until(lambda: pool.status()[0]["state"] == "idle")
+    assert adb.commands == [("emulator-5554", "pm clear com.code2lead.kwad")]
+    pool.close()
+
+
+def test_client_reports_a_missing_daemon():
+    assert not DeviceDaemonClient("http://127.0.0.1:9", connect_timeout=0.2).is_available()
+    with pytest.raises(ValueError):
+        DevicePool(FakeAdb(), reset="reboot")
+
+
+def test_devices_are_labelled_with_their_own_avd():
+    class OutOfOrderManager:
+        """Yields devices as they finish booting: the second AVD first."""
+
+        def start_many(self, avd_names, count, snapshot, timeout):
+            yield "emulator-5560", 5560, "Tablet"
+            yield "emulator-5558", 5558, "Pixel_8"
+
+        def stop_all_emulators(self):
+            pass
+
+    adb = FakeAdb(serials=("emulator-5554", "R58M123"))
+    adb.avd_names["emulator-5554"] = "Pixel_6"
+    daemon = DeviceDaemon(["Pixel_8", "Tablet"], count=4, port=0, pool=DevicePool(adb),
+                          manager=OutOfOrderManager()).start()
+    try:
+        wait_until(lambda: len(daemon.pool.devices) == 4)
+        assert {device["udid"]: device["avd"] for device in daemon.pool.status()} == {
+            "emulator-5554": "Pixel_6", "R58M123": None, "emulator-5560": "Tablet", "emulator-5558": "Pixel_8"}
+        assert daemon.pool.acquire("gw0", avd="Tablet")["udid"] == "emulator-5560"
+        assert daemon.pool.acquire("gw1", avd="Pixel_6")["udid"] == "emulator-5554"
+    finally:
+        daemon.stop()
@@ -0,0 +1,42 @@
+# AppiumFramework/tests/unit/test_device_farm.py
+
+from src.utilities.device_farm import DURATIONS_CACHE_KEY, DurationStore, discover_devices, lpt_schedule
+
+
+class FakeAdb:
+    """AdbClient.devices() as the adb server's host:devices answer maps it."""
+
+    def devices(self):
+        return {"emulator-5556": "device", "emulator-5554": "device", "emulator-5558": "offline"}
+
+
+def test_discover_devices_skips_offline_devices():
+    assert discover_devices(FakeAdb()) == ["emulator-5554", "emulator-5556"]
+
+
+def test_lpt_schedule_balances_load():
+    weights = {"A": 7, "B": 5, "C": 4, "D": 3, "E": 1}
+    assignment = lpt_schedule(weights, 2)
+    loads = [sum(w for unit, w in weights.items() if assignment[unit] == shard) for shard in range(2)]
+    assert sorted(loads) == [10, 10]
+
+
+def test_lpt_schedule_is_deterministic_for_ties():
+    weights = {"TestB": 1.0, "TestA": 1.0, "TestC": 1.0}
+    assert lpt_schedule(weights, 3) == lpt_schedule(dict(reversed(list(weights.items()))), 3)
+
+
+def test_duration_store_estimates_unknown_tests_from_median(fake_cache):
+    store = DurationStore(fake_cache({DURATIONS_CACHE_KEY: {"a": 1.0, "b": 3.0, "c": 10.0}}))
+    assert store.estimate("a") == 1.0
+    assert store.estimate("new") == 3.0
+    assert DurationStore(fake_cache()).estimate("new") == store.default
+
+
+def test_duration_store_sums_phases_and_persists(fake_cache):
+    cache = fake_cache()
+    store = DurationStore(cache)
+    for seconds in (0.5, 2.0, 0.25):
+        store.record("tests/test_login.py::TestLogin::test_failed_login", seconds)
+    store.save()
+    assert cache.data[DURATIONS_CACHE_KEY] == {"tests/test_login.py::TestLogin::test_failed_login": 2.75}
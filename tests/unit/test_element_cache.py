@@ -0,0 +1,85 @@
+# AppiumFramework/tests/unit/test_element_cache.py
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from src.pages.base_page import BasePage
+from src.pages.contact_us_form_page import ContactForm
+
+
+class FakeElement:
+    def __init__(self, locator):
+        self.locator = locator
+        self.stale = False
+        self.typed = []
+
+    def _check(self):
+        if self.stale:
+            raise StaleElementReferenceException("element is stale")
+
+    def click(self):
+        self._check()
+
+    def clear(self):
+        self._check()
+
+    def send_keys(self, text):
+        self._check()
+        self.typed.append(text)
+
+    def is_displayed(self):
+        self._check()
+        return True
+
+
+class FakeDriver:
+    def __init__(self):
+        self.finds = []
+        self.keycodes = []
+
+    def find_element(self, by, value):
+        self.finds.append(value)
+        return FakeElement(value)
+
+    def press_keycode(self, value):
+        self.keycodes.append(value)
+
+
+def test_repeated_interactions_reuse_the_resolved_element():
+    driver = FakeDriver()
+    form = ContactForm(driver)
+    for attempt in range(3):
+        form.enter_name("Code2Lead")
+        form.enter_email("user@example.com")
+    assert len(driver.finds) == 2
+    assert form.element_cache.stats() == {"hits": 4, "misses": 2, "size": 2}
+
+
+def test_keycode_and_click_invalidate_cached_elements():
+    driver = FakeDriver()
+    page = BasePage(driver)
+    page.is_displayed("Btn2", "accessibility_id")
+    page.keyCode(4)
+    page.is_displayed("Btn2", "accessibility_id")
+    page.click_element("Btn2", "accessibility_id")
+    page.is_displayed("Btn2", "accessibility_id")
+    assert len(driver.finds) == 3
+
+
+def test_navigation_on_one_page_invalidates_other_pages_on_the_same_driver():
+    driver = FakeDriver()
+    form, base = ContactForm(driver), BasePage(driver)
+    form.enter_name("first")
+    base.keyCode(4)
+    form.enter_name("second")
+    assert len(driver.finds) == 2
+
+
+def test_stale_element_is_re_resolved_transparently():
+    driver = FakeDriver()
+    page = BasePage(driver)
+    page.send_text("com.code2lead.kwad:id/Et4", "id", "first")
+    page.element_cache._elements[("id", "com.code2lead.kwad:id/Et4")].stale = True
+    page.send_text("com.code2lead.kwad:id/Et4", "id", "second")
+    fresh = page.element_cache._elements[("id", "com.code2lead.kwad:id/Et4")]
+    assert fresh.typed == ["second"]
+    assert len(driver.finds) == 2
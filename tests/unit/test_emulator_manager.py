@@ -0,0 +1,145 @@
+# AppiumFramework/tests/unit/test_emulator_manager.py
+
+import subprocess
+import threading
+import time
+
+import pytest
+
+from src.utilities.adb_client import ShellResult
+from src.utilities.emulator_manager import GOLDEN_SNAPSHOT, CommandRunner, EmulatorManager
+
+
+class FakeProcess:
+    _next_pid = 1000
+
+    def __init__(self, cmd):
+        FakeProcess._next_pid += 1
+        self.pid = FakeProcess._next_pid
+        self.cmd = cmd
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = -15
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+class FakeAndroidTools(CommandRunner):
+    """Fake `emulator` and adb client: each AVD finishes booting after its configured delay."""
+
+    def __init__(self, boot_delays, avd_home=None):
+        self.boot_delays = boot_delays
+        self.avd_home = avd_home
+        self.booted_at = {}
+        self.avd_by_udid = {}
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def popen(self, cmd, **kwargs):
+        with self.lock:
+            self.commands.append(cmd)
+            avd = cmd[cmd.index("-avd") + 1]
+            port = cmd[cmd.index("-port") + 1]
+            self.booted_at[f"emulator-{port}"] = time.monotonic() + self.boot_delays[avd]
+            self.avd_by_udid[f"emulator-{port}"] = avd
+        return FakeProcess(cmd)
+
+    def run(self, cmd, **kwargs):
+        with self.lock:
+            self.commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    # AdbClient interface
+    def wait_for_state(self, serial, state="device", timeout=60):
+        return 0.0
+
+    def shell(self, serial, command, timeout=None):
+        with self.lock:
+            self.commands.append(["adb", "-s", serial, "shell", command])
+        remaining = self.booted_at[serial] - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"{serial} still booting")
+        time.sleep(max(remaining, 0))
+        return ShellResult("", "", 0)
+
+    def emu(self, serial, command, timeout=10.0):
+        with self.lock:
+            self.commands.append(["adb", "-s", serial, "emu", *command.split()])
+        if command.startswith("avd snapshot save"):
+            avd = self.avd_by_udid[serial]
+            (self.avd_home / f"{avd}.avd" / "snapshots" / command.split()[-1]).mkdir(parents=True)
+        return "OK"
+
+
+def test_start_many_yields_devices_as_they_become_ready():
+    tools = FakeAndroidTools({"slow": 0.6, "fast": 0.05})
+    manager = EmulatorManager(runner=tools, adb=tools)
+    started = time.monotonic()
+    arrivals = []
+    for udid, port, avd in manager.start_many(["slow", "fast"]):
+        arrivals.append((udid, time.monotonic() - started))
+        assert avd == tools.avd_by_udid[udid]
+    assert len(arrivals) == 2
+    first_udid = arrivals[0][0]
+    fast_cmd = next(cmd for cmd in tools.commands if cmd[0] == "emulator" and "fast" in cmd)
+    assert first_udid == f"emulator-{fast_cmd[fast_cmd.index('-port') + 1]}"
+    assert arrivals[0][1] < 0.5
+    assert set(manager.emulators) == {udid for udid, _ in arrivals}
+
+
+def test_start_many_allocates_distinct_ports_and_shares_avds_read_only():
+    tools = FakeAndroidTools({"pixel": 0.01})
+    manager = EmulatorManager(runner=tools, adb=tools)
+    devices = list(manager.start_many(["pixel"], count=4))
+    ports = [port for _, port, _ in devices]
+    assert len(set(ports)) == 4
+    assert all(port % 2 == 0 for port in ports)
+    assert all("-read-only" in cmd for cmd in tools.commands if cmd[0] == "emulator")
+
+
+def test_snapshot_mode_saves_golden_once_then_restores_it(tmp_path):
+    tools = FakeAndroidTools({"pixel": 0.01}, avd_home=tmp_path)
+    manager = EmulatorManager(runner=tools, avd_home=tmp_path, adb=tools)
+    list(manager.start_many(["pixel"], snapshot=True))
+    first_boot = next(cmd for cmd in tools.commands if cmd[0] == "emulator")
+    assert "-no-snapshot-load" in first_boot
+    assert manager.has_snapshot("pixel")
+
+    manager.stop_all_emulators()
+    tools.commands.clear()
+    list(manager.start_many(["pixel"], snapshot=True))
+    second_boot = next(cmd for cmd in tools.commands if cmd[0] == "emulator")
+    assert second_boot[second_boot.index("-snapshot") + 1] == GOLDEN_SNAPSHOT
+    assert not any("save" in cmd for cmd in tools.commands)
+
+
+def test_shared_avd_saves_golden_from_a_writable_seed_before_read_only_instances(tmp_path):
+    tools = FakeAndroidTools({"pixel": 0.01}, avd_home=tmp_path)
+    manager = EmulatorManager(runner=tools, avd_home=tmp_path, adb=tools)
+    devices = list(manager.start_many(["pixel"], count=3, snapshot=True))
+    boots = [cmd for cmd in tools.commands if cmd[0] == "emulator"]
+    seed, instances = boots[0], boots[1:]
+    assert "-read-only" not in seed and "-no-snapshot-load" in seed
+    assert manager.has_snapshot("pixel")
+    seed_udid = f"emulator-{seed[seed.index('-port') + 1]}"
+    assert ["adb", "-s", seed_udid, "emu", "kill"] in tools.commands
+    assert len(instances) == 3
+    assert all("-read-only" in cmd and cmd[cmd.index("-snapshot") + 1] == GOLDEN_SNAPSHOT for cmd in instances)
+    assert sorted(manager.emulators) == sorted(udid for udid, _, _ in devices)
+    assert len(manager.processes) == 3
+
+
+def test_start_many_reports_boot_timeouts():
+    tools = FakeAndroidTools({"ok": 0.01, "stuck": 60})
+    manager = EmulatorManager(runner=tools, adb=tools)
+    ready = []
+    with pytest.raises(RuntimeError, match="1 of 2 emulators failed"):
+        for device in manager.start_many(["ok", "stuck"], timeout=0.2):
+            ready.append(device)
+    assert len(ready) == 1
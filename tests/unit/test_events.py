@@ -0,0 +1,100 @@
+# AppiumFramework/tests/unit/test_events.py
+
+import base64
+import json
+import time
+
+import pytest
+
+from src.utilities import events as events_module
+from src.utilities.events import EventRecorder, export_trace, read_events, to_chrome_trace
+from src.utilities.screenshots import ScreenshotStore
+from src.utilities.timing import TimingRecorder
+
+
+@pytest.fixture
+def recorder(tmp_path, monkeypatch):
+    recorder = EventRecorder()
+    recorder.configure(str(tmp_path / "run"), "gw0")
+    recorder.set_context(device="emulator-5554", test="tests/test_login.py::TestLogin::test_valid_login")
+    monkeypatch.setattr(events_module, "_recorder", recorder)
+    yield recorder
+    recorder.disable()
+
+
+def lines(recorder):
+    with open(recorder.path, encoding="utf-8") as event_file:
+        return [json.loads(line) for line in event_file]
+
+
+def test_events_carry_worker_device_and_test(recorder):
+    with recorder.span("test", "test_valid_login") as event:
+        event["outcome"] = "passed"
+    recorder.emit("driver", "driver.session_create", time.monotonic() - 1.5, 1.5)
+    span, driver = lines(recorder)
+    assert span["kind"] == "test" and span["args"] == {"outcome": "passed"}
+    assert span["worker"] == "gw0" and span["device"] == "emulator-5554"
+    assert span["test"] == "tests/test_login.py::TestLogin::test_valid_login"
+    assert driver["dur"] == 1.5 and driver["ts"] <= span["ts"] + span["dur"]
+
+
+def test_timed_actions_and_waits_are_emitted_even_without_a_timing_report(recorder):
+    timings = TimingRecorder()
+    timings.enabled = False
+    with timings.action("click", "id", "login_button"):
+        timings.add_wait(0.2, attempts=3)
+    with pytest.raises(RuntimeError):
+        with timings.action("driver.session_create"):
+            raise RuntimeError("boom")
+    wait, click, session = lines(recorder)
+    assert wait["kind"] == "wait" and wait["args"] == {"locator": "id:login_button", "attempts": 3}
+    assert click["kind"] == "action" and click["args"] == {"locator": "id:login_button", "outcome": "passed",
+                                                           "retries": 2}
+    assert session["kind"] == "driver" and session["args"]["outcome"] == "failed"
+    assert timings.records == []
+
+
+def test_screenshots_are_spans(recorder, tmp_path):
+    class FakeDriver:
+        def get_screenshot_as_base64(self):
+            return base64.b64encode(b"\x89PNG" * 25).decode("ascii")
+
+    store = ScreenshotStore(directory=str(tmp_path / "shots"), keep=0, max_age_days=0)
+    try:
+        store.capture(FakeDriver(), "login_page")
+    finally:
+        store.shutdown()
+    [screenshot] = lines(recorder)
+    assert screenshot["kind"] == "screenshot" and screenshot["name"] == "login_page"
+    assert screenshot["args"] == {"bytes": 100}
+
+
+def test_disabled_recorder_writes_nothing(tmp_path):
+    recorder = EventRecorder()
+    with recorder.span("test", "t") as event:
+        event["outcome"] = "passed"
+    recorder.emit("action", "click", time.monotonic())
+    assert not recorder.enabled and recorder.path is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_worker_files_merge_into_a_chrome_trace(tmp_path):
+    run = tmp_path / "run"
+    run.mkdir()
+    # Two workers with unrelated monotonic clocks; wall clocks put gw1's click after gw0's
+    workers = {"gw0": (100.0, 1000.0, "emulator-5554"), "gw1": (5000.0, 1000.5, "emulator-5556")}
+    for worker, (ts, wall, device) in workers.items():
+        event = {"ts": ts, "wall": wall, "kind": "action", "name": "click", "worker": worker, "device": device,
+                 "test": f"t_{worker}", "pid": 1, "thread": "MainThread", "dur": 0.25}
+        (run / f"{worker}.jsonl").write_text(json.dumps(event) + "\n")
+    merged = read_events(str(run))
+    assert [event["worker"] for event in merged] == ["gw0", "gw1"]
+    trace = to_chrome_trace(merged)["traceEvents"]
+    spans = [event for event in trace if event["ph"] == "X"]
+    assert [(span["ts"], span["dur"]) for span in spans] == [(0.0, 250000.0), (500000.0, 250000.0)]
+    assert spans[0]["pid"] != spans[1]["pid"] and spans[1]["args"]["test"] == "t_gw1"
+    names = {event["args"]["name"] for event in trace if event["ph"] == "M"}
+    assert names == {"emulator-5554", "emulator-5556", "gw0 MainThread", "gw1 MainThread"}
+    output = export_trace(str(run))
+    assert output == str(run / "trace.json")
+    assert json.loads((run / "trace.json").read_text())["traceEvents"] == trace
@@ -0,0 +1,80 @@
+# AppiumFramework/tests/unit/test_fake_appium.py
+
+import time
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from benchmarks.bench_framework import compare, new_session, run
+from benchmarks.fake_appium import FakeAppiumServer
+from src.pages.contact_us_form_page import ContactForm
+from src.pages.login_page import LoginPage
+
+
+@pytest.fixture
+def fake_server():
+    with FakeAppiumServer() as server:
+        yield server
+
+
+@pytest.fixture
+def driver(fake_server):
+    session = new_session(fake_server)
+    yield session
+    session.quit()
+
+
+def test_login_flow_runs_against_the_scripted_ui(driver, fake_server):
+    page = LoginPage(driver)
+    page.click_login_button()
+    page.enter_email("admin@gmail.com")
+    page.enter_password("admin123")
+    page.click_login_submit()
+    page.verify_admin_screen_displayed()
+    assert fake_server.commands["find_element"] >= 4
+    assert fake_server.commands["value"] == 2
+
+
+def test_typed_text_is_visible_until_the_screen_is_reopened(driver):
+    form = ContactForm(driver)
+    form.click_contact_from_button()
+    form.enter_name("Code2Lead")
+    assert form.get_element_text("com.code2lead.kwad:id/Et2", "id") == "Code2Lead"
+    form.keyCode(4)
+    form.click_contact_from_button()
+    assert form.get_element_text("com.code2lead.kwad:id/Et2", "id") == "Enter Name"
+
+
+def test_missing_elements_raise_no_such_element(driver):
+    with pytest.raises(NoSuchElementException):
+        driver.find_element("accessibility id", "NotThere")
+
+
+def test_command_latency_is_applied_per_command():
+    with FakeAppiumServer(command_latency={"find_element": 0.05}) as server:
+        session = new_session(server)
+        try:
+            started = time.perf_counter()
+            session.find_element("accessibility id", "Btn1")
+            assert time.perf_counter() - started >= 0.05
+        finally:
+            session.quit()
+
+
+def test_benchmark_run_and_baseline_comparison():
+    results = run(iterations=5, only=["base_page.click", "base_page.is_present_snapshot"])
+    assert set(results) == {"base_page.click", "base_page.is_present_snapshot"}
+    assert results["base_page.click"]["p50_ms"] > 0
+    baseline = {"base_page.click": dict(results["base_page.click"], p50_ms=results["base_page.click"]["p50_ms"] / 2)}
+    assert compare(results, baseline, tolerance=0.25)[0].startswith("base_page.click p50_ms")
+    assert compare(results, {}, tolerance=0.25) == []
+    assert results["base_page.click"]["latency_ms"] == 0.0
+    assert compare(results, {name: dict(stats, latency_ms=5.0) for name, stats in baseline.items()}) == []
+
+
+def test_p99_is_only_compared_with_enough_iterations():
+    stats = {"iterations": 50, "latency_ms": 0.0, "p50_ms": 1.0, "p99_ms": 9.0}
+    baseline = {"base_page.click": dict(stats, p99_ms=2.0)}
+    assert compare({"base_page.click": stats}, baseline) == []
+    baseline["base_page.click"]["iterations"] = stats["iterations"] = 200
+    assert compare({"base_page.click": stats}, baseline) == ["base_page.click p99_ms: 9.0 ms vs baseline 2.0 ms"]
@@ -0,0 +1,83 @@
+# AppiumFramework/tests/unit/test_fill_form.py
+
+import time
+
+import pytest
+
+from benchmarks.bench_framework import new_session
+from benchmarks.fake_appium import FakeAppiumServer, _error
+from src.pages.base_page import BasePage
+from src.pages.contact_us_form_page import ContactForm
+
+VALUES = ("Code2Lead", "user@example.com", "1 Main Street", "5551234567")
+FIELD_IDS = ("Et2", "Et3", "Et6", "Et7")
+
+
+class NoMobileCommandsServer(FakeAppiumServer):
+    """A backend without `mobile: replaceElementValue`."""
+
+    def _execute(self, session, body):
+        if body.get("script") == "mobile: replaceElementValue":
+            return _error(404, "unknown method", "Unsupported execute method 'mobile: replaceElementValue'")
+        return super()._execute(session, body)
+
+
+def fill(server):
+    driver = new_session(server)
+    try:
+        form = ContactForm(driver)
+        form.click_contact_from_button()
+        server.commands.clear()
+        form.fill_contact_form(*VALUES)
+        texts = [form.get_snapshot_text(f"com.code2lead.kwad:id/{field}", "id") for field in FIELD_IDS]
+        return texts, dict(server.commands)
+    finally:
+        driver.quit()
+
+
+def test_fill_form_sets_every_field_in_one_command_each():
+    with FakeAppiumServer() as server:
+        texts, commands = fill(server)
+    assert texts == list(VALUES)
+    assert commands == {"find_element": 4, "execute": 4, "source": 1}
+
+
+def test_fill_form_falls_back_to_clear_and_send_keys():
+    with NoMobileCommandsServer() as server:
+        texts, commands = fill(server)
+    assert texts == list(VALUES)
+    assert commands["execute"] == 1  # Only the first field tries the mobile command
+    assert commands["clear"] == commands["value"] == 4
+
+
+def test_fill_form_finds_fields_concurrently():
+    with FakeAppiumServer(command_latency={"find_element": 0.2}) as server:
+        driver = new_session(server)
+        try:
+            form = ContactForm(driver)
+            form.click_contact_from_button()
+            started = time.perf_counter()
+            form.fill_contact_form(*VALUES)
+            assert time.perf_counter() - started < 0.6
+        finally:
+            driver.quit()
+
+
+def test_fill_form_reports_fields_that_did_not_take_the_value():
+    class DroppingServer(FakeAppiumServer):
+        def _execute(self, session, body):
+            if body.get("script") == "mobile: replaceElementValue" and body["args"][0]["text"] == "lost":
+                return 200, None
+            return super()._execute(session, body)
+
+    with DroppingServer() as server:
+        driver = new_session(server)
+        try:
+            form = ContactForm(driver)
+            form.click_contact_from_button()
+            with pytest.raises(AssertionError, match="Enter Email"):
+                form.fill_form({form._enter_name: "Code2Lead", form._enter_email: "lost",
+                                ("com.code2lead.kwad:id/Et6", "id"): "1 Main Street"})
+            BasePage(driver).fill_form({("com.code2lead.kwad:id/Et6", "id"): "2 Main Street"})
+        finally:
+            driver.quit()
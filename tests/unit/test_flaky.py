@@ -0,0 +1,117 @@
+# AppiumFramework/tests/unit/test_flaky.py
+
+from types import SimpleNamespace
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from src.pages.base_page import BasePage
+from src.pages.recovery import KNOWN_POPUPS, DismissPopup, Refind, StepRecovery
+from src.utilities.flaky import FLAKE_CACHE_KEY, FlakeStore, RerunPlugin
+
+pytest_plugins = ["pytester"]
+
+FLAKY_TESTS = """
+import pytest
+
+calls = {"setup": 0, "attempts": 0}
+
+@pytest.fixture(scope="class")
+def warm_session():
+    calls["setup"] += 1
+    yield calls
+
+class TestFlaky:
+    def test_passes_on_second_attempt(self, warm_session):
+        warm_session["attempts"] += 1
+        assert warm_session["attempts"] > 1
+
+    def test_session_was_built_once(self, warm_session):
+        assert warm_session["setup"] == 1
+
+def test_always_fails():
+    assert False
+"""
+
+
+def _run(pytester, plugin):
+    pytester.makepyfile(test_flaky_suite=FLAKY_TESTS)
+    result = pytester.inline_run("-p", "no:cacheprovider", plugins=[plugin])
+    outcomes = {}
+    for report in result.getreports("pytest_runtest_logreport"):
+        if report.when == "call" or report.outcome != "passed":
+            outcomes.setdefault(report.nodeid.split("::")[-1], []).append(report.outcome)
+    return outcomes
+
+
+def test_failed_test_is_rerun_on_the_same_class_session(pytester, fake_cache):
+    store = FlakeStore(fake_cache())
+    outcomes = _run(pytester, RerunPlugin(reruns=2, budget=10, delay=0, store=store))
+    assert outcomes == {"test_passes_on_second_attempt": ["rerun", "passed"],
+                        "test_session_was_built_once": ["passed"],
+                        "test_always_fails": ["rerun", "rerun", "failed"]}
+    assert store.score("test_flaky_suite.py::TestFlaky::test_passes_on_second_attempt") > 0
+    assert store.score("test_flaky_suite.py::TestFlaky::test_session_was_built_once") == 0
+    store.save()
+    assert FLAKE_CACHE_KEY in store.cache.data
+
+
+def test_flake_scores_drop_the_device_farm_suffix(fake_cache):
+    store = FlakeStore(fake_cache())
+    plugin = RerunPlugin(reruns=1, budget=10, delay=0, store=store)
+    nodeid = "tests/test_login.py::TestLogin::test_failed_login@device-1"
+    plugin.pytest_runtest_logreport(SimpleNamespace(nodeid=nodeid, outcome="rerun", when="call", passed=False))
+    plugin.pytest_runtest_logreport(SimpleNamespace(nodeid=nodeid, outcome="passed", when="call", passed=True))
+    assert store.score("tests/test_login.py::TestLogin::test_failed_login") > 0
+
+
+def test_rerun_budget_is_shared_by_the_worker(pytester):
+    plugin = RerunPlugin(reruns=3, budget=1, delay=0)
+    outcomes = _run(pytester, plugin)
+    assert plugin.reruns_used == 1
+    assert outcomes["test_always_fails"] == ["failed"]  # Budget was spent on the first flaky test
+
+
+class FakeButton:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def click(self):
+        self.driver.popup_open = False
+
+
+class PopupDriver:
+    """The target element is hidden behind a system dialog until it is dismissed."""
+
+    def __init__(self):
+        self.popup_open = True
+
+    def find_element(self, by, value):
+        if self.popup_open or value != "Btn2":
+            raise NoSuchElementException(value)
+        return object()
+
+    def find_elements(self, by, value):
+        return [FakeButton(self)] if self.popup_open and value == "android:id/aerr_wait" else []
+
+
+def test_lookup_recovers_by_dismissing_a_popup():
+    recovery = StepRecovery([Refind(), DismissPopup()], step_timeout=0.05)
+    page = BasePage(PopupDriver())
+    page.step_recovery = recovery
+    assert page.get_element("Btn2", "accessibility_id", timeout=0.05) is not None
+    assert recovery.recovered == {"refind": 0, "dismiss_popup": 1}
+
+
+def test_negative_checks_skip_recovery():
+    recovery = StepRecovery([Refind(), DismissPopup()], step_timeout=0.05)
+    page = BasePage(PopupDriver())
+    page.step_recovery = recovery
+    assert page.is_displayed("Btn2", "accessibility_id", fail_fast=True) is False
+    assert page.is_displayed("Btn2", "accessibility_id", timeout=0.05) is False
+    assert page.driver.popup_open
+    assert recovery.recovered == {"refind": 0, "dismiss_popup": 0}
+
+
+def test_app_dialogs_are_not_dismissed():
+    assert ("android:id/button1", "id") not in KNOWN_POPUPS
@@ -0,0 +1,188 @@
+# AppiumFramework/tests/unit/test_impact.py
+
+import subprocess
+import textwrap
+
+import pytest
+
+from src.utilities.impact import IMPACT_CACHE_KEY, ImpactAnalyzer, changed_lines
+
+pytest_plugins = ["pytester"]
+
+TREE = {
+    "src/pages/base_page.py": """
+        class BasePage:
+            def __init__(self, driver):
+                self.driver = driver
+
+            def click_element(self, locator):
+                pass
+        """,
+    "src/drivers/driver_class.py": "class Driver:\n    pass\n",
+    "tests/conftest.py": "import pytest\n",
+    "src/locators/cart_locators.py": """
+        class CartLocators:
+            ADD = "add"
+            CHECKOUT = "checkout"
+        """,
+    "src/pages/cart_page.py": """
+        from src.pages.base_page import BasePage
+        from src.locators.cart_locators import CartLocators
+
+
+        class CartPage(BasePage):
+            def __init__(self, driver):
+                super().__init__(driver)
+                self._add = CartLocators.ADD
+                self._checkout = CartLocators.CHECKOUT
+
+            def add(self):
+                self.click_element(self._add)
+
+            def checkout(self):
+                self.click_element(self._checkout)
+        """,
+    "src/pages/menu_page.py": """
+        from src.pages.base_page import BasePage
+
+
+        class MenuPage(BasePage):
+            _menu = "Menu"
+
+            def open(self):
+                self.click_element(self._menu)
+        """,
+    "tests/test_cart.py": """
+        import pytest
+        from src.pages.cart_page import CartPage
+
+
+        class TestCart:
+            @pytest.fixture(autouse=True)
+            def setup(self, driver):
+                self.cart = CartPage(driver)
+
+            def test_add(self):
+                self.cart.add()
+
+            def test_checkout(self):
+                self.cart.add()
+                self.cart.checkout()
+        """,
+    "tests/test_menu.py": """
+        from src.pages.menu_page import MenuPage
+
+
+        def test_open_menu(driver):
+            menu = MenuPage(driver)
+            menu.open()
+        """,
+}
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    for path, source in TREE.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(textwrap.dedent(source).lstrip())
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "base")
+    return tmp_path
+
+
+def _edit(root, path, old, new):
+    file = root / path
+    file.write_text(file.read_text().replace(old, new))
+
+
+def _select(root, cache=None):
+    return ImpactAnalyzer(str(root), cache).select(changed_lines("HEAD", str(root)))
+
+
+def test_dependency_map_follows_page_methods_to_locators(repo):
+    tests = ImpactAnalyzer(str(repo)).dependency_map()
+    checkout = tests["tests/test_cart.py::TestCart::test_checkout"]
+    assert "src/pages/cart_page.py::CartPage.checkout" in checkout
+    assert "src/locators/cart_locators.py::CartLocators.CHECKOUT" in checkout
+    assert "src/locators/cart_locators.py::CartLocators.CHECKOUT" not in tests["tests/test_cart.py::TestCart::test_add"]
+    assert "src/pages/menu_page.py::MenuPage._menu" in tests["tests/test_menu.py::test_open_menu"]
+
+
+def test_changed_locator_selects_only_tests_that_read_it(repo):
+    _edit(repo, "src/locators/cart_locators.py", '"checkout"', '"pay"')
+    selection = _select(repo)
+    assert not selection.full
+    assert selection.tests == {"tests/test_cart.py::TestCart::test_checkout"}
+
+
+def test_changed_page_method_and_test_body(repo):
+    _edit(repo, "src/pages/menu_page.py", "self.click_element(self._menu)",
+          "self.click_element(self._menu)\n        return self")
+    assert _select(repo).tests == {"tests/test_menu.py::test_open_menu"}
+    _git(repo, "checkout", "--", ".")
+    _edit(repo, "tests/test_cart.py", "self.cart = CartPage(driver)", "self.cart = CartPage(driver)  # fresh page")
+    assert _select(repo).tests == {"tests/test_cart.py::TestCart::test_add",
+                                   "tests/test_cart.py::TestCart::test_checkout"}
+
+
+@pytest.mark.parametrize("path", ["src/pages/base_page.py", "src/drivers/driver_class.py", "tests/conftest.py"])
+def test_core_change_runs_full_suite(repo, path):
+    (repo / path).write_text((repo / path).read_text() + "\n# changed\n")
+    selection = _select(repo)
+    assert selection.full
+    assert path in selection.reason
+
+
+def test_unrelated_changes_select_nothing(repo):
+    (repo / "README.md").write_text("notes\n")
+    selection = _select(repo)
+    assert not selection.full
+    assert selection.tests == set()
+
+
+def test_analyses_are_reused_from_the_cache(repo, fake_cache):
+    cache = fake_cache()
+    first = ImpactAnalyzer(str(repo), cache)
+    first.dependency_map()
+    first.save()
+    assert "tests/test_cart.py::TestCart::test_add" in cache.data[IMPACT_CACHE_KEY]["tests"]
+    _edit(repo, "src/pages/menu_page.py", '"Menu"', '"Main menu"')
+    second = ImpactAnalyzer(str(repo), cache)
+    assert second.dependency_map() == first.dependency_map()
+    assert second.parsed == 1
+
+
+def test_plugin_keeps_whole_classes_and_unit_tests(pytester):
+    pytester.makepyfile(**{
+        "tests/test_pages": """
+            class TestOne:
+                def test_tap(self):
+                    assert 1 == 1
+
+                def test_next(self):
+                    pass
+
+
+            class TestOther:
+                def test_other(self):
+                    pass
+            """,
+        "tests/unit/test_offline": "def test_offline():\n    pass\n",
+    })
+    pytester.makeconftest("""
+        from src.utilities.impact import ImpactPlugin
+
+        def pytest_configure(config):
+            config.pluginmanager.register(ImpactPlugin("HEAD", str(config.rootpath)), "impact")
+        """)
+    for args in (["init", "-q"], ["add", "."],
+                 ["-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "base"]):
+        _git(pytester.path, *args)
+    _edit(pytester.path, "tests/test_pages.py", "assert 1 == 1", "assert 2 - 1 == 1")
+    result = pytester.runpytest("tests")
+    result.assert_outcomes(passed=3, deselected=1)
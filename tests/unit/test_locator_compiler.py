@@ -0,0 +1,74 @@
+# AppiumFramework/tests/unit/test_locator_compiler.py
+
+import asyncio
+
+import pytest
+
+from src.locators.locator_compiler import Locator, compile_locator, uiselector_for
+from src.locators.login_locators import LoginPageLocators
+from src.pages.async_base_page import AsyncBasePage
+from src.pages.base_page import BasePage
+from src.pages.login_page import LoginPage
+
+
+def test_single_id_and_desc_use_native_strategies():
+    assert compile_locator(LoginPageLocators.EMAIL_INPUT) == ("id", "com.code2lead.kwad:id/Et4")
+    assert compile_locator(LoginPageLocators.LOGIN_BUTTON) == ("accessibility_id", "Btn6")
+
+
+def test_combined_predicates_compile_to_one_uiselector():
+    locator = Locator(class_name="android.widget.Button", text="SUBMIT", instance=0)
+    assert compile_locator(locator) == (
+        "android_uiautomator",
+        'new UiSelector().className("android.widget.Button").text("SUBMIT").instance(0)')
+
+
+def test_child_and_sibling_chains():
+    row = Locator(class_name="android.widget.LinearLayout", child=Locator(text="Enter Name"))
+    assert row.compile()[1] == ('new UiSelector().className("android.widget.LinearLayout")'
+                                '.childSelector(new UiSelector().text("Enter Name"))')
+    label = Locator(id="com.code2lead.kwad:id/Et2", sibling=Locator(index=0))
+    assert label.compile()[1] == ('new UiSelector().resourceId("com.code2lead.kwad:id/Et2")'
+                                  '.fromParent(new UiSelector().index(0))')
+
+
+def test_quotes_and_backslashes_are_escaped():
+    assert uiselector_for("text", 'Say "hi" \\ bye') == 'new UiSelector().text("Say \\"hi\\" \\\\ bye")'
+
+
+def test_xpath_is_only_used_when_asked_for_and_cannot_be_combined():
+    assert compile_locator(Locator(xpath="//android.widget.Button")) == ("xpath", "//android.widget.Button")
+    with pytest.raises(ValueError):
+        Locator(xpath="//android.widget.Button", index=0)
+    with pytest.raises(ValueError):
+        Locator()
+
+
+def test_compiled_selectors_are_memoized():
+    compile_locator.cache_clear()
+    for _ in range(3):
+        compile_locator(Locator(text="Enter Admin"))
+    assert compile_locator.cache_info().hits == 2
+
+
+def test_base_page_accepts_locator_specs_and_plain_pairs():
+    assert BasePage._resolve_locator(LoginPageLocators.ADMIN_PAGE_TITLE, None) == (
+        'new UiSelector().text("Enter Admin")', "android_uiautomator")
+    assert BasePage._resolve_locator("Btn6", "accessibility_id") == ("Btn6", "accessibility_id")
+    with pytest.raises(ValueError):
+        BasePage._resolve_locator("Btn6", None)
+
+
+def test_locator_type_is_rejected_next_to_a_locator_spec():
+    # send_text(locator, "hello") would otherwise bind "hello" to locator_type and type nothing
+    for locator in (LoginPageLocators.EMAIL_INPUT, LoginPage._email_input):
+        with pytest.raises(ValueError, match="by keyword"):
+            BasePage(driver=None).send_text(locator, "hello")
+        with pytest.raises(ValueError, match="by keyword"):
+            asyncio.run(AsyncBasePage(driver=None).send_text(locator, "hello"))
+
+
+def test_plain_login_values_still_work_as_pairs():
+    pair = BasePage(driver=None)._resolve_locator(LoginPageLocators.EMAIL_INPUT_VALUE, "id")
+    assert pair == ("com.code2lead.kwad:id/Et4", "id")
+    assert pair[::-1] == compile_locator(LoginPageLocators.EMAIL_INPUT)
@@ -0,0 +1,74 @@
+# AppiumFramework/tests/unit/test_page_registry.py
+
+import pytest
+
+from src.locators.locator_compiler import CompiledLocator, Locator, PageLocator
+from src.pages.base_page import BasePage
+from src.pages.contact_us_form_page import ContactForm
+from src.pages.login_page import LoginPage
+from src.pages.page_registry import PageRegistry
+from src.utilities.custom_logger import CustomLogger
+
+
+class FakeElement:
+    def __init__(self, locator):
+        self.locator = locator
+
+    def click(self):
+        pass
+
+
+class FakeDriver:
+    def __init__(self):
+        self.finds = []
+
+    def find_element(self, by, value):
+        self.finds.append((by, value))
+        return FakeElement(value)
+
+
+def test_pages_are_created_lazily_and_shared_per_driver():
+    driver = FakeDriver()
+    registry = PageRegistry.for_driver(driver)
+    assert PageRegistry.for_driver(driver) is registry
+    assert LoginPage not in registry
+    login = registry.get(LoginPage)
+    assert registry.get(LoginPage) is login
+    assert login.driver is driver
+    assert registry.created == 1
+    other = PageRegistry.for_driver(FakeDriver())
+    assert other.get(LoginPage) is not login
+
+
+def test_page_construction_does_not_build_loggers_or_locators(monkeypatch):
+    calls = []
+    monkeypatch.setattr(CustomLogger, "get_logger", staticmethod(lambda *args, **kwargs: calls.append(args)))
+    pages = [LoginPage(FakeDriver()) for _ in range(50)]
+    assert calls == []
+    assert len({id(page._email_input) for page in pages}) == 1
+
+
+def test_page_locator_compiles_once_to_the_cheapest_strategy():
+    class Page(BasePage):
+        title = PageLocator(text="Enter Admin")
+        field = PageLocator(Locator(id="com.code2lead.kwad:id/Et4"))
+
+    assert Page.field == CompiledLocator("com.code2lead.kwad:id/Et4", "id")
+    assert Page.title.type == "android_uiautomator"
+    assert Page.__dict__["title"].name == "Page.title"
+    driver = FakeDriver()
+    Page(driver).click_element(Page.field)
+    assert driver.finds == [("id", "com.code2lead.kwad:id/Et4")]
+
+
+def test_page_locator_takes_a_locator_or_predicates():
+    with pytest.raises(ValueError):
+        PageLocator()
+    with pytest.raises(ValueError):
+        PageLocator(Locator(id="a"), text="b")
+
+
+def test_contact_form_uses_class_level_locators():
+    driver = FakeDriver()
+    ContactForm(driver).click_contact_from_button()
+    assert driver.finds == [("accessibility id", "Btn2")]
@@ -0,0 +1,82 @@
+# AppiumFramework/tests/unit/test_page_snapshot.py
+
+from pathlib import Path
+
+import pytest
+
+from src.pages.base_page import BasePage
+from src.pages.page_snapshot import PageSnapshot
+
+PAGE_SOURCES = Path(__file__).parent.parent / "resources" / "page_sources"
+
+
+def load(name):
+    return (PAGE_SOURCES / name).read_text(encoding="utf-8")
+
+
+class FakeDriver:
+    def __init__(self, *sources):
+        self.sources = list(sources)
+        self.source_reads = 0
+        self.keycodes = []
+
+    @property
+    def page_source(self):
+        self.source_reads += 1
+        return self.sources[min(self.source_reads, len(self.sources)) - 1]
+
+    def press_keycode(self, value):
+        self.keycodes.append(value)
+
+
+@pytest.fixture
+def main_screen():
+    return PageSnapshot(load("main_screen.xml"))
+
+
+@pytest.fixture
+def contact_form():
+    return PageSnapshot(load("contact_form_dump.xml"))
+
+
+def test_appium_source_is_indexed_by_every_locator_type(main_screen):
+    assert main_screen.exists("Btn6", "accessibility_id")
+    assert main_screen.exists("com.code2lead.kwad:id/ContactUs", "id")
+    assert main_screen.exists("LOGIN", "text")
+    assert len(main_screen.find_all("android.widget.Button", "class_name")) == 6
+    assert main_screen.text("Btn2", "accessibility_id") == "CONTACT US FORM"
+    assert main_screen.attribute("Btn6", "accessibility_id", "clickable") == "true"
+
+
+def test_hidden_and_missing_elements_do_not_exist(main_screen):
+    assert not main_screen.exists("BtnHidden", "accessibility_id")
+    assert not main_screen.exists("Enter Admin", "text")
+    assert main_screen.text("Wrong Credentials", "text") is None
+
+
+def test_raw_uiautomator_dump_and_uiselector_queries(contact_form):
+    assert contact_form.exists("Contact Us form", "text")
+    assert contact_form.exists('new UiSelector().text("Enter Mobile No")', "android_uiautomator")
+    assert contact_form.attribute("Enter Email", "uiautomator_text", "resource-id") == "com.code2lead.kwad:id/Et3"
+    with pytest.raises(ValueError):
+        contact_form.find_all('new UiScrollable(new UiSelector().scrollable(true))', "android_uiautomator")
+
+
+def test_simple_xpath_is_answered_locally(main_screen):
+    buttons = main_screen.find_all("//android.widget.Button[@text='LOGIN']", "xpath")
+    assert [button.get("content-desc") for button in buttons] == ["Btn6"]
+
+
+def test_base_page_fetches_source_once_until_an_action_invalidates_it():
+    driver = FakeDriver(load("main_screen.xml"), load("contact_form_dump.xml"))
+    page = BasePage(driver)
+    other_page = BasePage(driver)
+    assert page.is_present("Btn2", "accessibility_id")
+    assert page.is_present("Btn6", "accessibility_id")
+    assert other_page.get_snapshot_text("Btn1", "accessibility_id") == "ENTER SOME VALUE"
+    assert driver.source_reads == 1
+
+    other_page.keyCode(4)
+    assert not page.is_present("Btn2", "accessibility_id")
+    assert page.is_present("Enter Name", "text")
+    assert driver.source_reads == 2
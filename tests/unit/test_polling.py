@@ -0,0 +1,76 @@
+# AppiumFramework/tests/unit/test_polling.py
+
+import time
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from src.pages.base_page import BasePage
+from src.pages.polling import ExponentialPolling, LatencyHistory
+
+
+class SlowDriver:
+    """find_element succeeds only `appears_after` seconds after the first lookup."""
+
+    def __init__(self, appears_after=None):
+        self.appears_after = appears_after
+        self.first_find = None
+        self.finds = 0
+
+    def find_element(self, by, value):
+        self.finds += 1
+        self.first_find = self.first_find or time.monotonic()
+        if self.appears_after is None or time.monotonic() - self.first_find < self.appears_after:
+            raise NoSuchElementException(value)
+        return object()
+
+
+def test_exponential_polling_starts_fast_and_caps():
+    intervals = ExponentialPolling(initial=0.05, factor=2, maximum=0.3).intervals()
+    assert [next(intervals) for _ in range(5)] == [0.05, 0.1, 0.2, 0.3, 0.3]
+
+
+def test_fast_element_is_found_without_fixed_poll_dead_time():
+    page = BasePage(SlowDriver(appears_after=0.06))
+    started = time.monotonic()
+    page.wait_for_element("Btn6", "accessibility_id")
+    assert time.monotonic() - started < 0.3
+
+
+def test_fail_fast_negative_check_does_one_lookup():
+    driver = SlowDriver()
+    started = time.monotonic()
+    assert BasePage(driver).is_displayed("Btn6", "accessibility_id", fail_fast=True) is False
+    assert driver.finds == 1
+    assert time.monotonic() - started < 0.1
+
+
+def test_learned_timeout_is_clamped_between_minimum_and_default(tmp_path):
+    history = LatencyHistory(path=str(tmp_path / "latencies.json"), min_samples=3, safety_factor=3, min_timeout=2)
+    key = LatencyHistory.key("id", "com.code2lead.kwad:id/Et4")
+    for seconds in (0.2, 0.4, 1.0):
+        history.record(key, seconds)
+    assert history.timeout_for(key, 10) == 3.0
+    assert history.timeout_for("id:unknown", 10) == 10
+    history.record(key, 0.01)
+    assert history.timeout_for(key, 2.5) == 2.5
+
+
+def test_history_is_merged_into_the_file_across_instances(tmp_path):
+    path = str(tmp_path / "latencies.json")
+    first, second = LatencyHistory(path=path), LatencyHistory(path=path)
+    first.record("id:a", 0.1)
+    second.record("id:a", 0.2)
+    first.save()
+    second.save()
+    assert LatencyHistory(path=path)._samples == {"id:a": [0.1, 0.2]}
+
+
+def test_learned_timeout_is_used_when_none_is_passed(tmp_path, monkeypatch):
+    history = LatencyHistory(path=str(tmp_path / "latencies.json"), min_samples=1, min_timeout=0.2, safety_factor=1)
+    history.record(LatencyHistory.key("accessibility_id", "Btn6"), 0.1)
+    monkeypatch.setattr(BasePage, "latency_history", history)
+    started = time.monotonic()
+    with pytest.raises(Exception):
+        BasePage(SlowDriver()).wait_for_element("Btn6", "accessibility_id")
+    assert time.monotonic() - started < 1
@@ -0,0 +1,66 @@
+# AppiumFramework/tests/unit/test_port_allocator.py
+
+import json
+import multiprocessing
+import socket
+
+import pytest
+
+from src.utilities.port_allocator import PortAllocator
+
+RANGES = {"appium": range(45100, 45200), "system": range(45200, 45300), "console": range(45300, 45400, 2)}
+
+
+def _allocate_many(registry_dir, count, queue):
+    allocator = PortAllocator(registry_dir, RANGES)
+    queue.put([allocator.allocate("appium") for _ in range(count)])
+
+
+@pytest.fixture
+def allocator(tmp_path):
+    return PortAllocator(str(tmp_path), RANGES)
+
+
+def test_processes_never_share_a_port(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    workers = [context.Process(target=_allocate_many, args=(str(tmp_path), 10, queue)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    ports = [port for _ in workers for port in queue.get(timeout=60)]
+    for worker in workers:
+        worker.join(timeout=60)
+    assert len(ports) == 40
+    assert len(set(ports)) == 40
+
+
+def test_ports_of_exited_processes_are_reclaimed(allocator, tmp_path):
+    (tmp_path / "ports.json").write_text(json.dumps({"45100": {"kind": "appium", "pid": 2 ** 22 + 1, "owner": ""}}))
+    assert allocator.allocate("appium") == 45100
+
+
+def test_preferred_port_and_release(allocator):
+    first = allocator.allocate("system", preferred=45250)
+    second = allocator.allocate("system", preferred=45250)
+    assert (first, second) == (45250, 45251)
+    allocator.release(first)
+    assert allocator.allocate("system", preferred=45250) == 45250
+    allocator.release_all()
+    assert allocator.reserved() == {}
+
+
+def test_ports_bound_by_other_programs_are_skipped(allocator):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as listener:
+        listener.bind(("127.0.0.1", 45301))  # adb port of console 45300
+        assert allocator.allocate("console") == 45302
+
+
+def test_worker_stripes_start_at_different_ports(allocator, monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "4")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw2")
+    assert allocator.allocate("appium") == 45150
+
+
+def test_unknown_kind_is_rejected(allocator):
+    with pytest.raises(ValueError):
+        allocator.allocate("vnc")
@@ -0,0 +1,124 @@
+# AppiumFramework/tests/unit/test_readiness.py
+
+import socket
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utilities.adb_client import ShellResult
+from src.utilities.command_runner import CommandRunner
+from src.utilities.readiness import AppiumStatusClient, Backoff, ReadinessError, wait_all, wait_for_device
+
+
+class _ReadyHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'{"value": {"ready": true}}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def status_server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ReadyHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def wedged_server():
+    """Accepts connections but never answers, like a hung Appium node process."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(8)
+    yield f"http://127.0.0.1:{listener.getsockname()[1]}"
+    listener.close()
+
+
+class FakeAdb(CommandRunner):
+    def __init__(self, ready_after, failures=0):
+        self.ready_at = time.monotonic() + ready_after
+        self.failures = failures
+        self.calls = 0
+
+    def run(self, cmd, **kwargs):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="error: device offline")
+        remaining = self.ready_at - time.monotonic()
+        if remaining > kwargs["timeout"]:
+            time.sleep(kwargs["timeout"])
+            raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+        time.sleep(max(remaining, 0))
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+
+def test_backoff_grows_to_maximum_with_jitter():
+    delays = Backoff(initial=0.1, factor=2, maximum=0.4, jitter=0.5, rng=lambda: 1.0).delays()
+    assert [round(next(delays), 3) for _ in range(4)] == [0.05, 0.1, 0.2, 0.2]
+
+
+def test_wait_for_device_retries_failed_watch_with_backoff():
+    adb = FakeAdb(ready_after=0.05, failures=2)
+    latency = wait_for_device("emulator-5554", timeout=5, runner=adb, backoff=Backoff(initial=0.01))
+    assert adb.calls == 3
+    assert latency < 1
+
+
+def test_wait_for_device_stops_when_aborted():
+    with pytest.raises(ReadinessError, match="stopped"):
+        wait_for_device("emulator-5554", timeout=5, runner=FakeAdb(ready_after=60), attempt_timeout=0.05,
+                        abort=lambda: True)
+
+
+def test_status_client_times_out_on_wedged_server(wedged_server):
+    client = AppiumStatusClient(connect_timeout=0.2, read_timeout=0.2)
+    started = time.monotonic()
+    assert client.is_ready(wedged_server) is False
+    assert time.monotonic() - started < 2
+
+
+def test_wait_all_reports_latency_per_target(status_server):
+    latencies = wait_all(devices=["emulator-5554", "emulator-5556"], servers=[status_server], timeout=5,
+                         runner=FakeAdb(ready_after=0.1))
+    assert set(latencies) == {"emulator-5554", "emulator-5556", status_server}
+    assert latencies[status_server] < latencies["emulator-5554"]
+
+
+def test_wait_all_names_targets_that_are_not_ready(status_server, wedged_server):
+    client = AppiumStatusClient(connect_timeout=0.1, read_timeout=0.1)
+    with pytest.raises(ReadinessError) as excinfo:
+        wait_all(servers=[status_server, wedged_server], timeout=0.5, client=client)
+    assert wedged_server in str(excinfo.value)
+    assert set(excinfo.value.latencies) == {status_server}
+
+
+def test_wait_all_watches_devices_over_the_adb_client(status_server):
+    class FakeAdbClient:
+        def __init__(self):
+            self.watched = []
+
+        def wait_for_state(self, serial, state="device", timeout=60):
+            return 0.0
+
+        def shell(self, serial, command, timeout=None):
+            self.watched.append(serial)
+            time.sleep(0.05)
+            return ShellResult("", "", 0)
+
+    adb = FakeAdbClient()
+    runner = FakeAdb(ready_after=60)  # Would time out if the runner were used instead
+    latencies = wait_all(devices=["emulator-5554", "emulator-5556"], servers=[status_server], timeout=5,
+                         runner=runner, adb=adb)
+    assert sorted(adb.watched) == ["emulator-5554", "emulator-5556"]
+    assert all(latency >= 0.05 for target, latency in latencies.items() if target != status_server)
@@ -0,0 +1,85 @@
+# AppiumFramework/tests/unit/test_screenshots.py
+
+import base64
+import os
+import threading
+import time
+
+from src.pages import base_page
+from src.pages.base_page import BasePage
+from src.utilities.screenshots import ScreenshotStore
+
+FRAME_A = b"\x89PNG\r\n\x1a\nframe-a"
+FRAME_B = b"\x89PNG\r\n\x1a\nframe-b"
+
+
+class FakeDriver:
+    def __init__(self, *frames):
+        self.frames = list(frames)
+        self.calls = 0
+
+    def get_screenshot_as_base64(self):
+        frame = self.frames[min(self.calls, len(self.frames) - 1)]
+        self.calls += 1
+        return base64.b64encode(frame).decode("ascii")
+
+
+def test_capture_keeps_frame_in_memory_and_writes_it(tmp_path):
+    store = ScreenshotStore(directory=str(tmp_path), keep=0, max_age_days=0)
+    screenshot = store.capture(FakeDriver(FRAME_A), "failure_test_login")
+    assert screenshot.png == FRAME_A
+    assert base64.b64decode(screenshot.encoded) == FRAME_A
+    with open(screenshot.path, "rb") as image_file:
+        assert image_file.read() == FRAME_A
+    store.shutdown()
+
+
+def test_identical_frames_are_written_once(tmp_path):
+    store = ScreenshotStore(directory=str(tmp_path), keep=0, max_age_days=0)
+    driver = FakeDriver(FRAME_A, FRAME_A, FRAME_B)
+    first, second, third = (store.capture(driver, f"shot{i}") for i in range(3))
+    assert first.path == second.path
+    assert third.path != first.path
+    assert store.written == 2 and store.deduplicated == 1
+    assert len(os.listdir(tmp_path)) == 2
+    store.shutdown()
+
+
+def test_retention_keeps_newest_files_and_drops_old_ones(tmp_path):
+    now = time.time()
+    for index in range(5):
+        path = tmp_path / f"old_{index}.png"
+        path.write_bytes(b"x")
+        os.utime(path, (now - index * 60, now - index * 60))
+    stale = tmp_path / "stale.png"
+    stale.write_bytes(b"x")
+    os.utime(stale, (now - 30 * 86400, now - 30 * 86400))
+    store = ScreenshotStore(directory=str(tmp_path), keep=3, max_age_days=14)
+    removed = store.apply_retention()
+    assert sorted(os.path.basename(path) for path in removed) == ["old_3.png", "old_4.png", "stale.png"]
+    assert sorted(os.listdir(tmp_path)) == ["old_0.png", "old_1.png", "old_2.png"]
+    store.shutdown()
+
+
+def test_screen_shot_returns_none_when_capture_fails():
+    class BrokenDriver:
+        def get_screenshot_as_base64(self):
+            raise RuntimeError("session gone")
+
+    assert BasePage(BrokenDriver()).screen_shot("broken") is None
+
+
+def test_screen_shot_returns_before_the_file_is_written(tmp_path, monkeypatch):
+    store = ScreenshotStore(directory=str(tmp_path), keep=0, max_age_days=0)
+    writing = threading.Event()
+    store_frame = store._store
+    monkeypatch.setattr(store, "_store", lambda name, encoded: writing.wait(5) and store_frame(name, encoded))
+    monkeypatch.setattr(base_page, "get_screenshot_store", lambda: store)
+    screenshot = BasePage(FakeDriver(FRAME_A)).screen_shot("contact_form_submission")
+    assert not screenshot.done()
+    writing.set()
+    assert os.path.dirname(screenshot.path) == str(tmp_path)
+    assert os.path.exists(screenshot) and str(screenshot) == os.fspath(screenshot) == screenshot.path
+    with open(screenshot, "rb") as image_file:
+        assert image_file.read() == FRAME_A
+    store.shutdown()
@@ -0,0 +1,106 @@
+# AppiumFramework/tests/unit/test_session_reuse.py
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from src.config.constants import APP_PACKAGE
+from src.drivers.driver_class import Driver
+from src.drivers.reset_strategies import ClearDataReset, ResetStrategy, RestartAppReset, get_reset_strategy
+from src.utilities.adb_client import AdbError, ShellResult
+
+
+class FakeWebDriver:
+    def __init__(self, alive=True, clear_supported=True):
+        self.session_id = "session-1"
+        self.capabilities = {"udid": "emulator-5554"}
+        self.alive = alive
+        self.clear_supported = clear_supported
+        self.calls = []
+
+    @property
+    def current_package(self):
+        if not self.alive:
+            raise WebDriverException("session deleted")
+        return APP_PACKAGE
+
+    def terminate_app(self, package):
+        self.calls.append(("terminate", package))
+
+    def activate_app(self, package):
+        self.calls.append(("activate", package))
+
+    def execute_script(self, script, args):
+        if not self.clear_supported:
+            raise WebDriverException("Unknown mobile command")
+        self.calls.append((script, args["appId"]))
+
+    def quit(self):
+        self.calls.append(("quit",))
+
+
+@pytest.fixture
+def driver_obj(monkeypatch):
+    driver_obj = Driver(udid="emulator-5554")
+    created = []
+
+    def fake_get_driver():
+        if getattr(Driver._thread_local, "driver", None) is None:
+            Driver._thread_local.driver = FakeWebDriver()
+            created.append(Driver._thread_local.driver)
+        return Driver._thread_local.driver
+
+    monkeypatch.setattr(driver_obj, "get_driver", fake_get_driver)
+    driver_obj.created = created
+    yield driver_obj
+    Driver._thread_local.driver = None
+
+
+def test_reuse_session_resets_live_session(driver_obj):
+    first = driver_obj.reuse_session(RestartAppReset())
+    second = driver_obj.reuse_session(RestartAppReset())
+    assert first is second
+    assert len(driver_obj.created) == 1
+    assert second.calls == [("terminate", APP_PACKAGE), ("activate", APP_PACKAGE)]
+
+
+def test_reuse_session_recreates_dead_session(driver_obj):
+    dead = driver_obj.reuse_session(RestartAppReset())
+    dead.alive = False
+    fresh = driver_obj.reuse_session(RestartAppReset())
+    assert fresh is not dead
+    assert dead.calls == [("quit",)]
+    assert fresh.calls == []
+
+
+def test_clear_data_reset_uses_mobile_clear_app():
+    fake = FakeWebDriver()
+    ClearDataReset().reset(fake, APP_PACKAGE, None)
+    assert fake.calls == [("mobile: clearApp", APP_PACKAGE), ("activate", APP_PACKAGE)]
+
+
+def test_clear_data_reset_falls_back_to_pm_clear_over_adb():
+    class FakeAdb:
+        def __init__(self, result):
+            self.result = result
+            self.commands = []
+
+        def shell(self, serial, command, timeout=None):
+            self.commands.append((serial, command))
+            return self.result
+
+    fake, adb = FakeWebDriver(clear_supported=False), FakeAdb(ShellResult("Success\n", "", 0))
+    ClearDataReset(adb).reset(fake, APP_PACKAGE, None)
+    assert adb.commands == [("emulator-5554", f"pm clear {APP_PACKAGE}")]
+    assert fake.calls == [("activate", APP_PACKAGE)]
+    with pytest.raises(AdbError, match="Failed"):
+        ClearDataReset(FakeAdb(ShellResult("Failed\n", "", 1))).reset(fake, APP_PACKAGE, None)
+
+
+def test_reset_strategy_requires_reset():
+    with pytest.raises(TypeError):
+        type("Incomplete", (ResetStrategy,), {})()
+
+
+def test_unknown_reset_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        get_reset_strategy("reinstall")
@@ -0,0 +1,98 @@
+# AppiumFramework/tests/unit/test_timing.py
+
+import json
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from src.pages.base_page import BasePage
+from src.utilities.timing import TimingRecorder, percentile
+
+
+class FakeElement:
+    def click(self):
+        pass
+
+
+class SlowToAppearDriver:
+    """find_element fails `misses` times before the element shows up."""
+
+    def __init__(self, misses=0):
+        self.misses = misses
+
+    def find_element(self, by, value):
+        if self.misses:
+            self.misses -= 1
+            raise NoSuchElementException(value)
+        return FakeElement()
+
+
+@pytest.fixture
+def timings(monkeypatch):
+    recorder = TimingRecorder()
+    recorder.current_test = "tests/test_login.py::TestLogin::test_valid_login"
+    monkeypatch.setattr(BasePage, "timings", recorder)
+    return recorder
+
+
+def test_nearest_rank_percentile():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_nested_find_is_folded_into_the_click(timings):
+    page = BasePage(SlowToAppearDriver(misses=2))
+    page.click_element("Btn2", "accessibility_id", poll_frequency=0.01)
+    assert len(timings.records) == 1
+    test, action, locator, strategy, total, wait, retries, outcome = timings.records[0]
+    assert (action, locator, strategy, retries, outcome) == ("click", "accessibility_id:Btn2", "accessibility_id",
+                                                             2, "passed")
+    assert 0.02 <= wait <= total
+
+
+def test_failed_actions_are_recorded_and_grouped_per_test_and_locator(timings):
+    page = BasePage(SlowToAppearDriver(misses=100))
+    with pytest.raises(Exception):
+        page.click_element("Btn9", "accessibility_id", timeout=0)
+    page = BasePage(SlowToAppearDriver())
+    page.click_element("Btn2", "accessibility_id")
+    summary = timings.summary()
+    assert summary["actions"]["click"]["count"] == 2
+    assert summary["actions"]["click"]["failures"] == 1
+    assert set(summary["locators"]) == {"accessibility_id:Btn2", "accessibility_id:Btn9"}
+    assert summary["tests"][timings.current_test]["count"] == 2
+    assert "click" in timings.text_summary(timings.current_test)
+
+
+def test_report_files_are_written(timings, tmp_path):
+    assert timings.write_report(str(tmp_path)) is None
+    BasePage(SlowToAppearDriver()).wait_for_element("Btn2", "accessibility_id")
+    json_path, html_path = timings.write_report(str(tmp_path))
+    with open(json_path, encoding="utf-8") as report_file:
+        assert json.load(report_file)["actions"]["find"]["count"] == 1
+    with open(html_path, encoding="utf-8") as report_file:
+        assert "accessibility_id:Btn2" in report_file.read()
+
+
+def test_disabled_recorder_records_nothing(timings):
+    timings.enabled = False
+    BasePage(SlowToAppearDriver()).click_element("Btn2", "accessibility_id")
+    assert timings.records == []
+
+
+def test_records_are_kept_per_test_bounded_and_mergeable():
+    recorder = TimingRecorder(max_records=3)
+    for test in ("t1", "t2", "t3"):
+        recorder.current_test = test
+        with recorder.action("click"):
+            pass
+        with recorder.action("click"):
+            pass
+    assert [record[0] for record in recorder.records] == ["t3", "t3"]  # Whole tests go, oldest first
+    assert recorder.dropped == 4
+    assert recorder.summary("t3")["actions"]["click"]["count"] == 2
+    merged = TimingRecorder()
+    merged.add_records([list(record) for record in recorder.records])
+    assert merged.summary()["tests"]["t3"]["count"] == 2
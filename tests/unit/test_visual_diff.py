@@ -0,0 +1,137 @@
+# AppiumFramework/tests/unit/test_visual_diff.py
+
+import base64
+import io
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.pages.base_page import BasePage
+from src.utilities import screenshots
+from src.utilities.screenshots import ScreenshotStore
+from src.utilities.visual_diff import STATUS_BAR, Region, VisualComparator, compare_frame, png_size
+
+WIDTH, HEIGHT = 1080, 2400
+
+
+def frame(changes=(), size=(WIDTH, HEIGHT)):
+    """A light screen with a dark button; changes are (left, top, right, bottom, colour) boxes."""
+    image = np.full((size[1], size[0], 3), 245, dtype=np.uint8)
+    image[1000:1150, 100:980] = (30, 90, 200)
+    for left, top, right, bottom, colour in changes:
+        image[top:bottom, left:right] = colour
+    output = io.BytesIO()
+    Image.fromarray(image).save(output, format="PNG", compress_level=1)
+    return output.getvalue()
+
+
+@pytest.fixture
+def comparator(tmp_path):
+    comparator = VisualComparator(baseline_dir=str(tmp_path), processes=0)
+    yield comparator
+    comparator.shutdown()
+
+
+def test_first_frame_becomes_the_baseline_and_then_matches(comparator, tmp_path):
+    first = comparator.compare(frame(), "home", device="Pixel_8", test="tests/test_login.py::TestLogin::test_a")
+    assert first.status == "new"
+    assert first.baseline == str(tmp_path / "Pixel_8" / "1080x2400" / "test_login" / "TestLogin" / "test_a" / "home.png")
+    second = comparator.compare(frame(), "home", device="Pixel_8", test="tests/test_login.py::TestLogin::test_a")
+    assert second.status == "match" and second.changed_pixels == 0
+
+
+def test_changed_region_is_a_mismatch_with_a_diff_image(tmp_path):
+    baseline = str(tmp_path / "home.png")
+    compare_frame(frame(), baseline)
+    result = compare_frame(frame([(100, 1300, 980, 1450, (200, 30, 30))]), baseline, "home")
+    assert result.status == "mismatch"
+    assert result.changed_pixels == 880 * 150
+    assert png_size(result.diff_png) == (WIDTH, HEIGHT)
+    assert "home" in result.describe()
+
+
+def test_masked_regions_and_the_status_bar_are_ignored(tmp_path):
+    baseline = str(tmp_path / "home.png")
+    compare_frame(frame(), baseline)
+    clock = (900, 10, 1060, 80, (0, 0, 0))  # Inside the default status bar mask
+    banner = (0, 2000, 1080, 2200, (0, 0, 0))
+    assert compare_frame(frame([clock]), baseline).status == "match"
+    assert compare_frame(frame([clock, banner]), baseline).status == "mismatch"
+    masks = [STATUS_BAR, Region(0, 2000, 1080, 2200)]
+    assert compare_frame(frame([clock, banner]), baseline, masks=masks).status == "match"
+
+
+def test_imperceptible_and_tolerated_changes_match(tmp_path):
+    baseline = str(tmp_path / "home.png")
+    compare_frame(frame(), baseline)
+    noise = (0, 500, 1080, 900, (243, 244, 246))  # Rendering noise far below the YIQ threshold
+    assert compare_frame(frame([noise]), baseline).status == "match"
+    speck = (500, 1600, 540, 1640, (0, 0, 0))  # 1600 pixels, under 0.1% of the frame
+    assert compare_frame(frame([speck]), baseline).status == "match"
+    assert compare_frame(frame([speck]), baseline, tolerance=0).status == "mismatch"
+
+
+def test_resolution_change_is_a_size_mismatch(tmp_path):
+    baseline = str(tmp_path / "home.png")
+    compare_frame(frame(), baseline)
+    assert compare_frame(frame(size=(720, 1600)), baseline).status == "size_mismatch"
+
+
+def test_comparison_takes_milliseconds_per_frame(tmp_path):
+    baseline = str(tmp_path / "home.png")
+    compare_frame(frame(), baseline)
+    changed = frame([(900, 10, 1060, 80, (0, 0, 0)), (500, 1600, 540, 1640, (0, 0, 0))])
+    compare_frame(changed, baseline)
+    started = time.perf_counter()
+    for _ in range(5):
+        compare_frame(changed, baseline)
+    assert (time.perf_counter() - started) / 5 < 0.1
+
+
+def test_frames_are_compared_in_worker_processes(tmp_path):
+    comparator = VisualComparator(baseline_dir=str(tmp_path), processes=2)
+    try:
+        frames = [(frame(), f"screen{index}", "emulator") for index in range(3)]
+        assert [result.status for result in comparator.compare_many(frames, test="t")] == ["new"] * 3
+        frames[1] = (frame([(0, 2000, 1080, 2200, (0, 0, 0))]), "screen1", "emulator")
+        assert [result.status for result in comparator.compare_many(frames, test="t")] == \
+            ["match", "mismatch", "match"]
+    finally:
+        comparator.shutdown()
+
+
+def test_screen_shot_submits_frames_for_the_current_test(comparator, tmp_path, monkeypatch):
+    class FakeDriver:
+        capabilities = {"deviceModel": "sdk gphone64"}
+
+        def get_screenshot_as_base64(self):
+            return base64.b64encode(frame()).decode("ascii")
+
+        page_source = ('<hierarchy><android.widget.EditText class="android.widget.EditText" '
+                       'bounds="[40,300][1040,420]" text="Jane"/></hierarchy>')
+
+    monkeypatch.setattr(screenshots, "_store", ScreenshotStore(directory=str(tmp_path / "shots"), keep=0,
+                                                               max_age_days=0))
+    monkeypatch.setattr(BasePage, "visual_comparator", comparator)
+    comparator.current_test = "tests/test_contact_form.py::TestContactForm::test_enter_contact_form_data"
+    page = BasePage(FakeDriver())
+    page.screen_shot("contact_form_submission", masks=[("android.widget.EditText", "class_name"), (0, 0, 10, 10)])
+    [result] = comparator.results(comparator.current_test)
+    assert result.status == "new"
+    assert "sdk_gphone64" in result.baseline and "TestContactForm" in result.baseline
+    assert page._mask_bounds([("android.widget.EditText", "class_name")]) == [(40, 300, 1040, 420)]
+    screenshots._store.shutdown()
+
+
+def test_a_comparison_that_crashes_is_a_failed_result(comparator, tmp_path):
+    test = "tests/test_login.py::TestLogin::test_a"
+    baseline = comparator.compare(frame(), "home", device="Pixel_8", test=test).baseline
+    comparator.results(test)
+    with open(baseline, "wb") as baseline_file:
+        baseline_file.write(b"not a png")
+    comparator.submit(frame(), "home", device="Pixel_8", test=test)
+    [result] = comparator.results(test)
+    assert result.failed and result.status == "error"
+    assert "home" in result.describe() and result.error